@@ -1,14 +1,40 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash, check_password_hash
 import os
 from dotenv import load_dotenv
 import requests
+import atexit
+import base64
+import hashlib
 import json
-from datetime import datetime, timedelta
-import re
-from api_providers import get_all_providers, get_api_provider, search_providers, get_provider_categories
+import math
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import datetime
+from urllib.parse import urlencode
+from api_providers import get_all_providers
+from provider_search import search_providers
+from catalog_payloads import get_catalog_payloads
+from query_processor import AIQueryProcessor
+from llm_interpreter import TieredInterpreter
+from http_client import HTTPClientPool
+from response_cache import ResponseCache
+from connection_probe import run_connection_test
+from health_monitor import HealthMonitor
+from history_writer import HistoryWriter
+from request_templates import TemplateCache
+from rate_limiter import RateLimiter, retry_after_for_error
+from resilience import CircuitOpenError, UpstreamCaller
+from single_flight import SingleFlight
+from response_store import body_digest, encode_body, decode_body, resolve_encoding
 from config import config
 
 # Load environment variables
@@ -24,11 +50,27 @@ app.config.from_object(config[env])
 # Initialize extensions
 db = SQLAlchemy(app)
 
+# Shared outbound HTTP connection pool
+http_client = HTTPClientPool.from_config(app.config)
+
+# Upstream response cache
+response_cache = ResponseCache.from_config(app.config)
+
+# Client-side rate limiting of upstream calls, shared across workers with the redis backend
+rate_limiter = RateLimiter.from_config(app.config)
+
+# Retries with backoff, optional hedged GETs and per-host circuit breaking
+upstream_caller = UpstreamCaller.from_config(app.config)
+
+# Identical concurrent upstream GETs wait on one in-flight call
+single_flight = SingleFlight.from_config(app.config)
+
 # Configure CORS based on environment
+EXPOSED_HEADERS = ['X-Cache', 'X-Query-Id', 'X-Interpretation', 'X-Next-Cursor', 'Link', 'Retry-After']
 if env == 'production':
-    CORS(app, origins=app.config['CORS_ORIGINS'])
+    CORS(app, origins=app.config['CORS_ORIGINS'], expose_headers=EXPOSED_HEADERS)
 else:
-    CORS(app, origins=app.config['CORS_ORIGINS'])
+    CORS(app, origins=app.config['CORS_ORIGINS'], expose_headers=EXPOSED_HEADERS)
 
 # Database Models
 class APIConnection(db.Model):
@@ -41,233 +83,58 @@ class APIConnection(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
 
+class ConnectionHealth(db.Model):
+    """Latest background health check result for a connection"""
+    api_connection_id = db.Column(db.Integer, db.ForeignKey('api_connection.id'), primary_key=True)
+    status = db.Column(db.String(20), nullable=False)  # 'healthy', 'auth_failed', 'down' or 'unreachable'
+    status_code = db.Column(db.Integer)
+    latency_ms = db.Column(db.Float)
+    test_endpoint = db.Column(db.String(500))
+    error = db.Column(db.Text)
+    consecutive_failures = db.Column(db.Integer, default=0)
+    checked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ResponseBody(db.Model):
+    """Compressed, content-addressed upstream response body shared by history rows"""
+    hash = db.Column(db.String(64), primary_key=True)  # SHA-256 of the full body text
+    encoding = db.Column(db.String(10), nullable=False)  # 'zlib', 'zstd' or 'identity'
+    data = db.Column(db.LargeBinary, nullable=False)
+    size = db.Column(db.Integer, nullable=False)  # Uncompressed bytes stored
+    truncated = db.Column(db.Boolean, default=False)  # Body exceeded RESPONSE_STORE_MAX_BYTES
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class QueryHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     api_connection_id = db.Column(db.Integer, db.ForeignKey('api_connection.id'), nullable=False)
     user_query = db.Column(db.Text, nullable=False)
     interpreted_query = db.Column(db.Text)
     api_endpoint = db.Column(db.String(500))
-    response_data = db.Column(db.Text)
+    response_data = db.deferred(db.Column(db.Text))  # Error text, stream summaries and legacy bodies
+    response_hash = db.Column(db.String(64), db.ForeignKey('response_body.hash'))
     status = db.Column(db.String(20), default='success')  # 'success', 'error', 'pending'
+    cached = db.Column(db.Boolean, default=False)  # Served from the response cache
+    public_id = db.Column(db.String(36))  # UUID returned to clients as query_id
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-# AI Query Processor
-class AIQueryProcessor:
-    def __init__(self):
-        self.openai_api_key = os.environ.get('OPENAI_API_KEY')
-        self.providers = get_all_providers()
     
-    def detect_api_provider(self, base_url):
-        """Detect API provider based on base URL"""
-        base_url_lower = base_url.lower()
-        
-        for provider_key, provider_config in self.providers.items():
-            provider_url = provider_config['base_url'].lower()
-            # Remove template variables for comparison
-            provider_url_clean = re.sub(r'\{[^}]+\}', '', provider_url)
-            
-            if any(domain in base_url_lower for domain in [
-                provider_url_clean.replace('https://', '').replace('http://', '').split('/')[0],
-                provider_key
-            ]):
-                return provider_key, provider_config
-        
-        return None, None
-    
-    def extract_numbers(self, query):
-        """Extract numbers from query text"""
-        numbers = re.findall(r'\b\d+\b', query)
-        return [int(n) for n in numbers]
-    
-    def extract_quoted_text(self, query):
-        """Extract text within quotes"""
-        matches = re.findall(r"'([^']*)'|\"([^\"]*)\"", query)
-        return [match[0] or match[1] for match in matches]
-    
-    def extract_location(self, query):
-        """Extract location from query"""
-        # Common location patterns
-        location_patterns = [
-            r'(?:for|in|at|near)\s+([A-Za-z\s,]+?)(?:\s|$|,)',
-            r'weather\s+(?:for|in|at|near)?\s*([A-Za-z\s,]+?)(?:\s|$)',
-            r'temperature\s+(?:for|in|at|near)?\s*([A-Za-z\s,]+?)(?:\s|$)'
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return None
+    response_body = db.relationship('ResponseBody', lazy='select')
     
-    def interpret_query(self, user_query, api_config):
-        """
-        Enhanced query interpretation using provider configurations
-        """
-        interpretation = {
-            'endpoint': '',
-            'method': 'GET',
-            'params': {},
-            'filters': {}
-        }
-        
-        query_lower = user_query.lower()
-        
-        # Detect API provider
-        provider_key, provider_config = self.detect_api_provider(api_config.base_url)
-        
-        if provider_config and 'endpoints' in provider_config:
-            # Use provider-specific patterns
-            endpoints = provider_config['endpoints']
-            query_patterns = provider_config.get('query_patterns', {})
-            
-            # Match query patterns to endpoints
-            best_match = None
-            best_score = 0
-            
-            for endpoint_key, endpoint_path in endpoints.items():
-                if endpoint_key in query_patterns:
-                    patterns = query_patterns[endpoint_key]
-                    score = sum(1 for pattern in patterns if pattern in query_lower)
-                    if score > best_score:
-                        best_score = score
-                        best_match = (endpoint_key, endpoint_path)
-            
-            if best_match:
-                endpoint_key, endpoint_path = best_match
-                interpretation['endpoint'] = endpoint_path
-                
-                # Add provider-specific parameters
-                self._add_provider_specific_params(
-                    interpretation, query_lower, provider_key, endpoint_key
-                )
-        
-        else:
-            # Fallback to generic patterns
-            self._interpret_generic_query(interpretation, query_lower, api_config)
-        
-        # Extract common parameters
-        numbers = self.extract_numbers(user_query)
-        if numbers:
-            if 'limit' not in interpretation['params'] and 'per_page' not in interpretation['params']:
-                interpretation['params']['per_page'] = numbers[0]
-                interpretation['params']['limit'] = numbers[0]
-        
-        return interpretation
+    __table_args__ = (
+        db.Index('ix_query_history_created_at', 'created_at'),
+        db.Index('ix_query_history_connection_created', 'api_connection_id', 'created_at'),
+        db.Index('ix_query_history_status_created', 'status', 'created_at'),
+        db.Index('ix_query_history_public_id', 'public_id', unique=True),
+    )
     
-    def _add_provider_specific_params(self, interpretation, query_lower, provider_key, endpoint_key):
-        """Add provider-specific parameters based on the API type"""
-        
-        if provider_key == 'github':
-            if endpoint_key == 'commits':
-                # GitHub commits parameters
-                if 'since' in query_lower:
-                    interpretation['params']['since'] = self._extract_date(query_lower)
-                if 'author' in query_lower:
-                    author = self._extract_after_keyword(query_lower, 'author')
-                    if author:
-                        interpretation['params']['author'] = author
-                        
-        elif provider_key == 'wordpress':
-            if endpoint_key == 'posts':
-                if 'search' in query_lower:
-                    search_terms = self.extract_quoted_text(query_lower)
-                    if search_terms:
-                        interpretation['params']['search'] = search_terms[0]
-                if 'category' in query_lower:
-                    interpretation['params']['categories'] = self._extract_after_keyword(query_lower, 'category')
-                if 'published' in query_lower:
-                    interpretation['params']['status'] = 'publish'
-                    
-        elif provider_key in ['openweather', 'weatherapi']:
-            location = self.extract_location(query_lower)
-            if location:
-                interpretation['params']['q'] = location
-            if 'forecast' in query_lower:
-                interpretation['endpoint'] = interpretation['endpoint'].replace('current', 'forecast')
-                
-        elif provider_key == 'twitter':
-            if 'search' in query_lower:
-                search_terms = self.extract_quoted_text(query_lower)
-                if search_terms:
-                    interpretation['params']['query'] = search_terms[0]
-                    
-        elif provider_key == 'spotify':
-            if 'search' in query_lower:
-                search_terms = self.extract_quoted_text(query_lower)
-                if search_terms:
-                    interpretation['params']['q'] = search_terms[0]
-                if 'artist' in query_lower:
-                    interpretation['params']['type'] = 'artist'
-                elif 'album' in query_lower:
-                    interpretation['params']['type'] = 'album'
-                elif 'track' in query_lower:
-                    interpretation['params']['type'] = 'track'
-                    
-        elif provider_key == 'youtube':
-            if 'search' in query_lower:
-                search_terms = self.extract_quoted_text(query_lower)
-                if search_terms:
-                    interpretation['params']['q'] = search_terms[0]
-                interpretation['params']['part'] = 'snippet'
-                
-        elif provider_key == 'reddit':
-            if 'subreddit' in query_lower:
-                subreddit = self._extract_after_keyword(query_lower, 'subreddit')
-                if subreddit:
-                    interpretation['endpoint'] = f'/r/{subreddit}'
-                    
-        elif provider_key == 'newsapi':
-            if 'search' in query_lower:
-                search_terms = self.extract_quoted_text(query_lower)
-                if search_terms:
-                    interpretation['params']['q'] = search_terms[0]
-            if 'country' in query_lower:
-                country = self._extract_after_keyword(query_lower, 'country')
-                if country:
-                    interpretation['params']['country'] = country[:2].lower()
-                    
-    def _interpret_generic_query(self, interpretation, query_lower, api_config):
-        """Fallback generic query interpretation"""
-        
-        # Generic REST patterns
-        if any(word in query_lower for word in ['get', 'fetch', 'retrieve', 'show', 'list']):
-            interpretation['method'] = 'GET'
-        elif any(word in query_lower for word in ['create', 'add', 'post', 'new']):
-            interpretation['method'] = 'POST'
-        elif any(word in query_lower for word in ['update', 'edit', 'modify']):
-            interpretation['method'] = 'PUT'
-        elif any(word in query_lower for word in ['delete', 'remove']):
-            interpretation['method'] = 'DELETE'
-            
-        # Generic endpoint patterns
-        if any(word in query_lower for word in ['user', 'users', 'profile', 'account']):
-            interpretation['endpoint'] = '/users'
-        elif any(word in query_lower for word in ['post', 'posts', 'article', 'blog']):
-            interpretation['endpoint'] = '/posts'
-        elif any(word in query_lower for word in ['comment', 'comments']):
-            interpretation['endpoint'] = '/comments'
-        elif any(word in query_lower for word in ['data', 'all', 'list']):
-            interpretation['endpoint'] = '/data'
-        else:
-            interpretation['endpoint'] = '/'
-            
-    def _extract_date(self, query):
-        """Extract date from query"""
-        # Simple date extraction - can be enhanced
-        if 'today' in query:
-            return datetime.now().isoformat()
-        elif 'yesterday' in query:
-            return (datetime.now() - timedelta(days=1)).isoformat()
-        return None
-        
-    def _extract_after_keyword(self, query, keyword):
-        """Extract text after a specific keyword"""
-        pattern = f'{keyword}\\s+([\\w\\s]+?)(?:\\s|$)'
-        match = re.search(pattern, query, re.IGNORECASE)
-        return match.group(1).strip() if match else None
+    def get_response_data(self):
+        """Get the stored response text, decompressing it on first access"""
+        if self.response_hash:
+            body = self.response_body
+            return decode_body(body.data, body.encoding) if body else None
+        return self.response_data
 
 # Initialize AI processor
-ai_processor = AIQueryProcessor()
+ai_processor = AIQueryProcessor(memo_size=app.config['INTERPRETATION_CACHE_SIZE'])
+interpreter = TieredInterpreter.from_config(app.config, ai_processor, http_client)
 
 # Routes
 @app.route('/')
@@ -320,6 +187,326 @@ def delete_connection(connection_id):
     db.session.commit()
     return jsonify({'message': 'Connection deleted successfully'})
 
+def build_auth_headers(connection):
+    """Merge the connection's stored headers with its authentication headers"""
+    auth_data = json.loads(connection.auth_data) if connection.auth_data else {}
+    headers = json.loads(connection.headers) if connection.headers else {}
+    
+    if connection.auth_type == 'api_key':
+        if 'api_key' in auth_data and 'api_key_header' in auth_data:
+            headers[auth_data['api_key_header']] = auth_data['api_key']
+    elif connection.auth_type == 'bearer':
+        if 'token' in auth_data:
+            headers['Authorization'] = f"Bearer {auth_data['token']}"
+    elif connection.auth_type == 'basic':
+        # Basic auth would be handled by requests.auth
+        pass
+    
+    return headers
+
+# Compiled per-connection request templates; invalidated by the model events below
+request_templates = TemplateCache(build_auth_headers, app.config['REQUEST_TEMPLATE_CACHE_SIZE'])
+
+@event.listens_for(APIConnection, 'after_insert')
+@event.listens_for(APIConnection, 'after_update')
+@event.listens_for(APIConnection, 'after_delete')
+def invalidate_request_template(mapper, db_connection, connection):
+    request_templates.invalidate(connection.id)
+
+def prepare_query(connection, user_query):
+    """Interpret a query and fill the connection's request template; headers are read-only"""
+    template = request_templates.get(connection)
+    interpretation = interpreter.interpret_query(user_query, connection)
+    return interpretation, template.url_for(interpretation['endpoint']), template.headers
+
+def lookup_cached_response(connection, interpretation, url, headers):
+    """
+    Check the response cache for a prepared query.
+    Returns (cache_key, ttl, cached_body); cache_key is None when the cache is bypassed.
+    """
+    if interpretation['method'] != 'GET' or not get_api_settings().get('caching', True):
+        return None, 0, None
+    
+    template = request_templates.get(connection)
+    ttl = response_cache.ttl_for(template.provider_config)
+    if not ttl:
+        return None, 0, None
+    
+    cache_key = ResponseCache.make_key(
+        connection.id, interpretation['method'], url, interpretation['params'], headers,
+        auth_identity=template.auth_identity
+    )
+    return cache_key, ttl, response_cache.get(cache_key)
+
+def upstream_policy():
+    """Retry count and timeouts from the 'api' settings; read on the request thread"""
+    settings = get_api_settings()
+    try:
+        read_timeout = float(settings.get('timeout') or DEFAULT_API_SETTINGS['timeout'])
+    except (TypeError, ValueError):
+        read_timeout = DEFAULT_API_SETTINGS['timeout']
+    try:
+        retries = int(settings.get('retries', DEFAULT_API_SETTINGS['retries']))
+    except (TypeError, ValueError):
+        retries = DEFAULT_API_SETTINGS['retries']
+    return {'retries': retries, 'timeout': (app.config['HTTP_CONNECT_TIMEOUT'], read_timeout)}
+
+def wire_method(interpretation):
+    """HTTP verb sent upstream: GETs as interpreted, every other method as a POST with a JSON body"""
+    return 'GET' if interpretation['method'] == 'GET' else 'POST'
+
+def send_upstream(interpretation, url, headers, rate_limits=(), policy=None, **request_kwargs):
+    """
+    Send a prepared query through the rate limiter and the retry/hedging/circuit
+    breaker policy. Every attempt, hedge included, takes its own rate limit token.
+    """
+    policy = policy or upstream_policy()
+    method = wire_method(interpretation)
+    if method == 'GET':
+        request_kwargs['params'] = interpretation['params']
+    else:
+        request_kwargs['json'] = interpretation['params']
+    
+    def send(timeout):
+        with rate_limiter.limit(rate_limits):
+            response = http_client.request(method, url, headers=headers, timeout=timeout, **request_kwargs)
+        rate_limiter.observe(rate_limits, response.status_code, response.headers)
+        return response
+    
+    return upstream_caller.call(
+        send, method, url, retries=policy['retries'], timeout=policy['timeout'],
+        hedge=not request_kwargs.get('stream')
+    )
+
+def execute_upstream(interpretation, url, headers, rate_limits=(), policy=None):
+    """Send a prepared query upstream and return the decoded JSON body"""
+    response = send_upstream(interpretation, url, headers, rate_limits, policy)
+    response.raise_for_status()
+    return response.json()
+
+def upstream_request_key(connection_id, interpretation, url):
+    """Identity of an upstream request, shared by batch dedup and single-flight coalescing"""
+    return json.dumps([
+        connection_id, interpretation['method'], url, interpretation['params']
+    ], sort_keys=True, default=str)
+
+def execute_coalesced(request_key, interpretation, url, headers, rate_limits=(), policy=None):
+    """
+    execute_upstream(), but concurrent identical GETs share one call.
+    Returns (response_data, shared); only reads are coalesced, writes always go out.
+    """
+    if interpretation['method'] != 'GET':
+        return execute_upstream(interpretation, url, headers, rate_limits, policy), False
+    return single_flight.do(
+        request_key, lambda: execute_upstream(interpretation, url, headers, rate_limits, policy)
+    )
+
+def stores_body(record):
+    """Whether a history record's response goes to the compressed body store"""
+    return record['store_body'] and record['status'] == 'success' and record['response_data'] is not None
+
+def insert_ignoring_duplicates(table):
+    """INSERT that skips rows whose primary key already exists, where the database supports it"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        return insert(table).on_conflict_do_nothing(index_elements=list(table.primary_key.columns.keys()))
+    if dialect in ('mysql', 'mariadb'):
+        return table.insert().prefix_with('IGNORE')
+    return table.insert()
+
+def store_response_bodies(bodies):
+    """
+    Store compressed copies of bodies ({digest: text}) not in the body store yet.
+    A body another worker stores concurrently is skipped by the database instead
+    of failing the batch on the hash.
+    """
+    if not bodies:
+        return
+    existing = set(db.session.scalars(
+        db.select(ResponseBody.hash).where(ResponseBody.hash.in_(list(bodies)))
+    ))
+    encoding = resolve_encoding(app.config['RESPONSE_STORE_ENCODING'])
+    rows = []
+    for digest, body in bodies.items():
+        if digest in existing:
+            continue
+        blob, size, truncated = encode_body(
+            body, encoding, app.config['RESPONSE_STORE_MAX_BYTES'], app.config['RESPONSE_STORE_LEVEL']
+        )
+        rows.append({'hash': digest, 'encoding': encoding, 'data': blob, 'size': size,
+                     'truncated': truncated})
+    if rows:
+        db.session.execute(insert_ignoring_duplicates(ResponseBody.__table__), rows)
+
+def new_history_record(connection_id, user_query, interpretation, url, response_data, status,
+                       cached=False, store_body=True):
+    """Build a history record with a pre-allocated public query id, ready to enqueue"""
+    return {
+        'public_id': str(uuid.uuid4()),
+        'api_connection_id': connection_id,
+        'user_query': user_query,
+        'interpreted_query': json.dumps(interpretation),
+        'api_endpoint': url,
+        'response_data': response_data,
+        'status': status,
+        'cached': cached,
+        'store_body': store_body,
+        'created_at': datetime.utcnow()
+    }
+
+def build_history(record, digest=None):
+    """Build an unsaved history row; successful bodies are referenced by their digest in the body store"""
+    history = QueryHistory(
+        public_id=record['public_id'],
+        api_connection_id=record['api_connection_id'],
+        user_query=record['user_query'],
+        interpreted_query=record['interpreted_query'],
+        api_endpoint=record['api_endpoint'],
+        status=record['status'],
+        cached=record['cached'],
+        created_at=record['created_at']
+    )
+    if digest is not None:
+        history.response_hash = digest
+    else:
+        history.response_data = record['response_data']
+    return history
+
+def write_history(records):
+    """Store the batch's distinct bodies, then add and commit its history rows"""
+    digests = [body_digest(record['response_data']) if stores_body(record) else None for record in records]
+    with db.session.no_autoflush:
+        store_response_bodies({
+            digest: record['response_data'] for record, digest in zip(records, digests) if digest is not None
+        })
+        db.session.add_all([build_history(record, digest) for record, digest in zip(records, digests)])
+    db.session.commit()
+
+def save_history(records):
+    """
+    Write history records in a single transaction, rebuilding and retrying the
+    batch once if it still conflicts with a concurrent writer (databases
+    without conflict-free inserts)
+    """
+    try:
+        write_history(records)
+    except IntegrityError:
+        db.session.rollback()
+        write_history(records)
+
+def _flush_history(records):
+    """History writer callback (runs on the writer thread)"""
+    with app.app_context():
+        try:
+            save_history(records)
+        except Exception:
+            db.session.rollback()
+            raise
+
+# Write-behind history pipeline; flushed on interpreter shutdown
+history_writer = HistoryWriter.from_config(_flush_history, app.config)
+atexit.register(history_writer.stop)
+
+def record_queries(records):
+    """Hand history records to the write-behind queue (or write them now when it is disabled)"""
+    if app.config['HISTORY_WRITE_BEHIND']:
+        history_writer.submit_many(records)
+    else:
+        save_history(records)
+
+def record_query(connection_id, user_query, interpretation, url, response_data, status,
+                 cached=False, store_body=True):
+    """Save a query and its outcome to the history table; returns the public query id"""
+    record = new_history_record(
+        connection_id, user_query, interpretation, url, response_data, status,
+        cached=cached, store_body=store_body
+    )
+    record_queries([record])
+    return record['public_id']
+
+def stream_query(connection, user_query, interpretation, url, headers):
+    """
+    Pass the upstream body through to the client chunk by chunk.
+    History keeps a bounded preview and a SHA-256 of the body, so memory use
+    does not grow with the response size.
+    """
+    try:
+        upstream = send_upstream(
+            interpretation, url, headers, request_templates.get(connection).rate_limits, stream=True
+        )
+        upstream.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        record_query(connection.id, user_query, interpretation, url, str(e), 'error')
+        return upstream_error_response(e, interpretation)
+    
+    chunk_size = app.config['STREAM_CHUNK_SIZE']
+    preview_limit = app.config['STREAM_PREVIEW_BYTES']
+    record = new_history_record(
+        connection.id, user_query, interpretation, url, None, 'error', store_body=False
+    )
+    
+    def generate():
+        digest = hashlib.sha256()
+        preview = bytearray()
+        size = 0
+        try:
+            for chunk in upstream.iter_content(chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                if len(preview) < preview_limit:
+                    preview += chunk[:preview_limit - len(preview)]
+                yield chunk
+            record['status'] = 'success'
+        finally:
+            upstream.close()
+            record['response_data'] = json.dumps({
+                'streamed': True,
+                'size': size,
+                'sha256': digest.hexdigest(),
+                'preview': preview.decode('utf-8', errors='replace'),
+                'truncated': size > len(preview)
+            })
+            record_queries([record])
+    
+    response = Response(
+        stream_with_context(generate()),
+        status=upstream.status_code,
+        content_type=upstream.headers.get('Content-Type', 'application/json')
+    )
+    response.headers['X-Query-Id'] = record['public_id']
+    response.headers['X-Interpretation'] = json.dumps(interpretation)
+    response.headers['X-Cache'] = 'BYPASS'
+    return response
+
+def upstream_error_status(error):
+    """
+    HTTP status and Retry-After seconds for a failed upstream call:
+    503 while the host's circuit is open, 429 for rate limits, otherwise 500.
+    """
+    if isinstance(error, CircuitOpenError):
+        return 503, error.retry_after
+    retry_after = retry_after_for_error(error)
+    if retry_after is not None:
+        return 429, retry_after
+    return 500, None
+
+def upstream_error_response(error, interpretation):
+    """Error response for a failed upstream call, with Retry-After when the client should back off"""
+    payload = {
+        'success': False,
+        'error': str(error),
+        'interpretation': interpretation
+    }
+    status, retry_after = upstream_error_status(error)
+    if retry_after is None:
+        return jsonify(payload), status
+    payload['retry_after'] = retry_after
+    response = jsonify(payload)
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(int(math.ceil(retry_after)), 1))
+    return response
+
 @app.route('/api/query', methods=['POST'])
 def process_query():
     data = request.get_json()
@@ -330,85 +517,304 @@ def process_query():
     # Get API connection
     connection = APIConnection.query.get_or_404(data['connection_id'])
     
-    # Interpret the query
+    # Interpret the query and build the API request
     user_query = data['query']
-    interpretation = ai_processor.interpret_query(user_query, connection)
+    interpretation, url, headers = prepare_query(connection, user_query)
     
-    # Build the API request
-    url = connection.base_url.rstrip('/') + interpretation['endpoint']
+    if data.get('stream'):
+        return stream_query(connection, user_query, interpretation, url, headers)
     
-    # Prepare authentication
-    auth_data = json.loads(connection.auth_data) if connection.auth_data else {}
-    headers = json.loads(connection.headers) if connection.headers else {}
-    
-    if connection.auth_type == 'api_key':
-        if 'api_key' in auth_data and 'api_key_header' in auth_data:
-            headers[auth_data['api_key_header']] = auth_data['api_key']
-    elif connection.auth_type == 'bearer':
-        if 'token' in auth_data:
-            headers['Authorization'] = f"Bearer {auth_data['token']}"
-    elif connection.auth_type == 'basic':
-        # Basic auth would be handled by requests.auth
-        pass
+    # Serve repeated queries from the response cache
+    cache_key, cache_ttl, cached_body = lookup_cached_response(connection, interpretation, url, headers)
+    if cached_body is not None:
+        query_id = record_query(
+            connection.id, user_query, interpretation, url, cached_body, 'success', cached=True
+        )
+        response = jsonify({
+            'success': True,
+            'data': json.loads(cached_body),
+            'interpretation': interpretation,
+            'query_id': query_id,
+            'cache': 'hit'
+        })
+        response.headers['X-Cache'] = 'HIT'
+        return response
     
     try:
         # Make the API request
-        if interpretation['method'] == 'GET':
-            response = requests.get(url, headers=headers, params=interpretation['params'])
-        else:
-            response = requests.post(url, headers=headers, json=interpretation['params'])
+        response_data, shared = execute_coalesced(
+            upstream_request_key(connection.id, interpretation, url),
+            interpretation, url, headers, request_templates.get(connection).rate_limits
+        )
+        response_body = json.dumps(response_data)
         
-        response.raise_for_status()
-        response_data = response.json()
+        # The leader of a coalesced call populates the cache for everyone
+        if cache_key and not shared:
+            response_cache.set(cache_key, response_body, cache_ttl)
         
         # Save query history
-        history = QueryHistory(
-            api_connection_id=connection.id,
-            user_query=user_query,
-            interpreted_query=json.dumps(interpretation),
-            api_endpoint=url,
-            response_data=json.dumps(response_data),
-            status='success'
+        query_id = record_query(
+            connection.id, user_query, interpretation, url, response_body, 'success'
         )
-        db.session.add(history)
-        db.session.commit()
         
-        return jsonify({
+        cache_status = 'miss' if cache_key else 'bypass'
+        response = jsonify({
             'success': True,
             'data': response_data,
             'interpretation': interpretation,
-            'query_id': history.id
+            'query_id': query_id,
+            'cache': cache_status
         })
+        response.headers['X-Cache'] = cache_status.upper()
+        return response
     
     except requests.exceptions.RequestException as e:
         # Save failed query
-        history = QueryHistory(
-            api_connection_id=connection.id,
-            user_query=user_query,
-            interpreted_query=json.dumps(interpretation),
-            api_endpoint=url,
-            response_data=str(e),
-            status='error'
-        )
-        db.session.add(history)
-        db.session.commit()
+        record_query(connection.id, user_query, interpretation, url, str(e), 'error')
+        return upstream_error_response(e, interpretation)
+
+def batch_connection_id(value):
+    """
+    A batch item's connection id as an int, or None. Accepts what /api/query's
+    get_or_404 lookup matches: integers and numeric strings such as "1".
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+@app.route('/api/query/batch', methods=['POST'])
+def process_query_batch():
+    """
+    Run many queries in one request.
+    Identical upstream requests are sent once and all items run concurrently;
+    results come back in request order with a per-item status.
+    """
+    data = request.get_json(silent=True)
+    items = data.get('queries') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Expected a non-empty list of {query, connection_id} items'}), 400
+    if len(items) > app.config['BATCH_MAX_ITEMS']:
+        return jsonify({'error': f"Batch too large (max {app.config['BATCH_MAX_ITEMS']} items)"}), 400
+    
+    # Load every referenced connection with a single query
+    item_connection_ids = [
+        batch_connection_id(item.get('connection_id')) if isinstance(item, dict) else None for item in items
+    ]
+    connection_ids = {connection_id for connection_id in item_connection_ids if connection_id is not None}
+    connections = {
+        connection.id: connection
+        for connection in APIConnection.query.filter(APIConnection.id.in_(connection_ids)).all()
+    } if connection_ids else {}
+    
+    results = [None] * len(items)
+    prepared = []
+    upstream_requests = {}
+    policy = upstream_policy()  # worker threads have no app context for the settings lookup
+    
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or 'query' not in item or 'connection_id' not in item:
+            results[index] = {
+                'index': index,
+                'success': False,
+                'status': 400,
+                'error': 'Missing required fields: query and connection_id'
+            }
+            continue
         
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'interpretation': interpretation
-        }), 500
+        connection = connections.get(item_connection_ids[index])
+        if connection is None:
+            results[index] = {'index': index, 'success': False, 'status': 404, 'error': 'Connection not found'}
+            continue
+        
+        interpretation, url, headers = prepare_query(connection, item['query'])
+        cache_key, cache_ttl, cached_body = lookup_cached_response(connection, interpretation, url, headers)
+        
+        request_key = None
+        if cached_body is None:
+            request_key = upstream_request_key(connection.id, interpretation, url)
+            upstream_requests.setdefault(
+                request_key,
+                (request_key, interpretation, url, headers, request_templates.get(connection).rate_limits, policy)
+            )
+        
+        prepared.append((index, connection, item['query'], interpretation, url,
+                         cache_key, cache_ttl, cached_body, request_key))
+    
+    # Send each distinct upstream request once, concurrently
+    outcomes = {}
+    if upstream_requests:
+        max_workers = min(app.config['BATCH_MAX_WORKERS'], len(upstream_requests))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                request_key: executor.submit(execute_coalesced, *upstream_request)
+                for request_key, upstream_request in upstream_requests.items()
+            }
+            for request_key, future in futures.items():
+                try:
+                    response_data, _ = future.result()
+                    outcomes[request_key] = (True, response_data, json.dumps(response_data), None)
+                except requests.exceptions.RequestException as e:
+                    outcomes[request_key] = (False, None, str(e), upstream_error_status(e))
+    
+    histories = []
+    seen_requests = set()
+    cached_keys = set()
+    for (index, connection, user_query, interpretation, url,
+         cache_key, cache_ttl, cached_body, request_key) in prepared:
+        if cached_body is not None:
+            history = new_history_record(
+                connection.id, user_query, interpretation, url, cached_body, 'success', cached=True
+            )
+            result = {'success': True, 'status': 200, 'data': json.loads(cached_body), 'cache': 'hit'}
+        else:
+            ok, response_data, body, error_status = outcomes[request_key]
+            if ok:
+                if cache_key and cache_key not in cached_keys:
+                    # Deduplicated items share one upstream result; cache it once
+                    response_cache.set(cache_key, body, cache_ttl)
+                    cached_keys.add(cache_key)
+                history = new_history_record(connection.id, user_query, interpretation, url, body, 'success')
+                result = {
+                    'success': True,
+                    'status': 200,
+                    'data': response_data,
+                    'cache': 'miss' if cache_key else 'bypass'
+                }
+            else:
+                history = new_history_record(connection.id, user_query, interpretation, url, body, 'error')
+                status, retry_after = error_status
+                result = {'success': False, 'status': status, 'error': body}
+                if retry_after is not None:
+                    result['retry_after'] = retry_after
+            result['deduplicated'] = request_key in seen_requests
+            seen_requests.add(request_key)
+        
+        result.update(index=index, interpretation=interpretation)
+        results[index] = result
+        histories.append((result, history))
+    
+    # Hand every history row to the writer together so they land in one transaction
+    if histories:
+        record_queries([history for _, history in histories])
+        for result, history in histories:
+            result['query_id'] = history['public_id']
+    
+    return jsonify({
+        'success': all(result['success'] for result in results),
+        'results': results,
+        'stats': {
+            'total': len(items),
+            'upstream_requests': len(upstream_requests),
+            'cache_hits': sum(1 for result in results if result.get('cache') == 'hit')
+        }
+    })
+
+HISTORY_DEFAULT_LIMIT = 50
+HISTORY_MAX_LIMIT = 200
+
+def encode_history_cursor(history):
+    """Opaque keyset cursor pointing just after a history row"""
+    raw = f'{history.created_at.isoformat()}|{history.id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_history_cursor(cursor):
+    """Decode a keyset cursor into (created_at, id)"""
+    created_at, history_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+    return datetime.fromisoformat(created_at), int(history_id)
 
 @app.route('/api/history', methods=['GET'])
 def get_query_history():
-    history = QueryHistory.query.order_by(QueryHistory.created_at.desc()).limit(50).all()
-    return jsonify([{
+    """
+    Get query history, newest first, with keyset pagination.
+    Filters: connection_id, status, since, until (ISO dates), endpoint (substring).
+    The cursor for the next page is returned in the X-Next-Cursor and Link headers.
+    """
+    args = request.args
+    try:
+        limit = min(max(int(args.get('limit', HISTORY_DEFAULT_LIMIT)), 1), HISTORY_MAX_LIMIT)
+        query = QueryHistory.query
+        if args.get('connection_id'):
+            query = query.filter(QueryHistory.api_connection_id == int(args['connection_id']))
+        if args.get('status'):
+            query = query.filter(QueryHistory.status == args['status'])
+        if args.get('since'):
+            query = query.filter(QueryHistory.created_at >= datetime.fromisoformat(args['since']))
+        if args.get('until'):
+            query = query.filter(QueryHistory.created_at < datetime.fromisoformat(args['until']))
+        if args.get('endpoint'):
+            query = query.filter(QueryHistory.api_endpoint.contains(args['endpoint']))
+        if args.get('cursor'):
+            cursor_created_at, cursor_id = decode_history_cursor(args['cursor'])
+            query = query.filter(
+                db.tuple_(QueryHistory.created_at, QueryHistory.id) < (cursor_created_at, cursor_id)
+            )
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f'Invalid history filter: {e}'}), 400
+    
+    history = query.order_by(
+        QueryHistory.created_at.desc(), QueryHistory.id.desc()
+    ).limit(limit + 1).all()
+    has_more = len(history) > limit
+    history = history[:limit]
+    
+    response = jsonify([{
         'id': h.id,
+        'query_id': h.public_id,
         'user_query': h.user_query,
         'api_endpoint': h.api_endpoint,
         'status': h.status,
+        'cached': bool(h.cached),
         'created_at': h.created_at.isoformat()
     } for h in history])
+    
+    if has_more:
+        next_cursor = encode_history_cursor(history[-1])
+        next_args = args.to_dict()
+        next_args.update(cursor=next_cursor, limit=limit)
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(next_args)}>; rel="next"'
+    return response
+
+def get_history_or_404(history_id):
+    """Look up a history entry by numeric id or public query id"""
+    if history_id.isdigit():
+        return QueryHistory.query.get_or_404(int(history_id))
+    return QueryHistory.query.filter_by(public_id=history_id).first_or_404()
+
+@app.route('/api/history/<history_id>', methods=['GET'])
+def get_query_history_entry(history_id):
+    """Get a history entry's details without loading its response body"""
+    h = get_history_or_404(history_id)
+    body = h.response_body if h.response_hash else None
+    return jsonify({
+        'id': h.id,
+        'query_id': h.public_id,
+        'api_connection_id': h.api_connection_id,
+        'user_query': h.user_query,
+        'interpreted_query': json.loads(h.interpreted_query) if h.interpreted_query else None,
+        'api_endpoint': h.api_endpoint,
+        'status': h.status,
+        'cached': bool(h.cached),
+        'response_size': body.size if body else None,
+        'response_truncated': bool(body.truncated) if body else False,
+        'created_at': h.created_at.isoformat()
+    })
+
+@app.route('/api/history/<history_id>/response', methods=['GET'])
+def get_query_history_response(history_id):
+    """Get a history entry's response body, decompressed on demand"""
+    h = get_history_or_404(history_id)
+    response_data = h.get_response_data()
+    if response_data is None:
+        return jsonify({'error': 'No response stored for this query'}), 404
+    
+    mimetype = 'application/json' if h.status == 'success' else 'text/plain'
+    return Response(response_data, mimetype=mimetype)
 
 @app.route('/api/test-connection', methods=['POST'])
 def test_connection():
@@ -426,77 +832,53 @@ def test_connection():
         elif data['auth_type'] == 'bearer' and 'token' in auth_data:
             headers['Authorization'] = f"Bearer {auth_data['token']}"
         
-        # Detect API provider and use appropriate test endpoints
-        provider_key = ai_processor.detect_api_provider(base_url)
-        test_endpoints = []
+        # Known providers get their single catalog probe; other hosts try the endpoint
+        # that answered last time, then every generic candidate at once
+        provider_key, _ = ai_processor.detect_api_provider(base_url)
+        deadline = app.config['TEST_CONNECTION_DEADLINE']
+        winner, results, test_endpoints, unreachable = run_connection_test(
+            http_client, base_url, headers, provider_key, deadline=deadline,
+            probe_timeout=app.config['TEST_CONNECTION_PROBE_TIMEOUT'],
+            precheck_timeout=app.config['TEST_CONNECTION_PRECHECK_TIMEOUT']
+        )
+        if unreachable:
+            return jsonify({
+                'success': False,
+                'error': f'Connection test failed: {unreachable}',
+                'tested_endpoints': [],
+                'suggestion': 'Please verify the base URL and authentication credentials'
+            }), 400
         
-        if provider_key == 'openweathermap':
-            test_endpoints = ['/weather?q=London', '/data/2.5/weather?q=London']
-        elif provider_key == 'github':
-            test_endpoints = ['/user', '/repos', '/']
-        elif provider_key == 'openai':
-            test_endpoints = ['/models', '/v1/models']
-        elif provider_key == 'stripe':
-            test_endpoints = ['/charges', '/v1/charges']
-        elif provider_key == 'newsapi':
-            test_endpoints = ['/everything?q=test', '/v2/everything?q=test']
-        elif provider_key == 'twitter':
-            test_endpoints = ['/2/tweets/search/recent?query=test', '/1.1/statuses/user_timeline.json']
-        elif provider_key == 'youtube':
-            test_endpoints = ['/search?part=snippet&q=test', '/v3/search?part=snippet&q=test']
-        elif provider_key == 'spotify':
-            test_endpoints = ['/v1/search?q=test&type=track', '/search?q=test&type=track']
-        else:
-            # Generic test endpoints for unknown APIs
-            test_endpoints = ['/', '/api', '/v1', '/health', '/status', '/ping']
+        if winner is not None:
+            endpoint = winner.endpoint
+            if winner.success:
+                return jsonify({
+                    'success': True,
+                    'status_code': winner.status_code,
+                    'test_endpoint': endpoint,
+                    'response_size': winner.response_size,
+                    'message': f'Connection test successful! Tested endpoint: {endpoint}'
+                })
+            elif winner.status_code == 401:
+                return jsonify({
+                    'success': False,
+                    'status_code': winner.status_code,
+                    'test_endpoint': endpoint,
+                    'error': 'Authentication failed - please check your API credentials'
+                }), 401
+            elif winner.status_code == 403:
+                return jsonify({
+                    'success': False,
+                    'status_code': winner.status_code,
+                    'test_endpoint': endpoint,
+                    'error': 'Access forbidden - check API permissions and rate limits'
+                }), 403
         
-        # Try each test endpoint
-        last_error = None
-        for endpoint in test_endpoints:
-            try:
-                test_url = base_url + endpoint
-                response = requests.get(test_url, headers=headers, timeout=10)
-                
-                # Consider various success conditions
-                if response.status_code in [200, 201, 202]:
-                    return jsonify({
-                        'success': True,
-                        'status_code': response.status_code,
-                        'test_endpoint': endpoint,
-                        'response_size': len(response.content),
-                        'message': f'Connection test successful! Tested endpoint: {endpoint}'
-                    })
-                elif response.status_code == 401:
-                    return jsonify({
-                        'success': False,
-                        'status_code': response.status_code,
-                        'test_endpoint': endpoint,
-                        'error': 'Authentication failed - please check your API credentials'
-                    }), 401
-                elif response.status_code == 403:
-                    return jsonify({
-                        'success': False,
-                        'status_code': response.status_code,
-                        'test_endpoint': endpoint,
-                        'error': 'Access forbidden - check API permissions and rate limits'
-                    }), 403
-                elif response.status_code == 404:
-                    # Continue to next endpoint
-                    last_error = f"Endpoint {endpoint} not found (404)"
-                    continue
-                else:
-                    last_error = f"HTTP {response.status_code}: {response.text[:200]}"
-                    continue
-                    
-            except requests.exceptions.Timeout:
-                last_error = f"Timeout connecting to {endpoint}"
-                continue
-            except requests.exceptions.ConnectionError:
-                last_error = f"Connection error to {endpoint}"
-                continue
-            except requests.exceptions.RequestException as e:
-                last_error = f"Request error to {endpoint}: {str(e)}"
-                continue
+        errors = [result.error for result in results if result.error]
+        if len(results) < len(test_endpoints):
+            errors.append(f"Timed out after {deadline}s waiting for "
+                          f"{len(test_endpoints) - len(results)} endpoint(s)")
+        last_error = errors[-1] if errors else None
         
         # If we get here, all endpoints failed
         return jsonify({
@@ -512,67 +894,179 @@ def test_connection():
             'error': f'Connection test failed: {str(e)}'
         }), 500
 
+def active_connection_ids():
+    """IDs of connections the health monitor should check (runs on the monitor thread)"""
+    with app.app_context():
+        return [row.id for row in db.session.query(APIConnection.id).filter_by(is_active=True)]
+
+def check_connection_health(connection_id):
+    """
+    Probe one connection the same way /api/test-connection does (runs on a monitor thread).
+    Returns None when the connection was deleted since it was scheduled.
+    """
+    with app.app_context():
+        connection = db.session.get(APIConnection, connection_id)
+        if connection is None:
+            return None
+        template = request_templates.get(connection)
+    base_url, headers, provider_key = template.base_url, template.headers, template.provider_key
+    
+    started = time.monotonic()
+    winner, results, _, unreachable = run_connection_test(
+        http_client, base_url, headers, provider_key,
+        deadline=app.config['HEALTH_CHECK_TIMEOUT'],
+        probe_timeout=app.config['HEALTH_CHECK_TIMEOUT'],
+        precheck_timeout=app.config['TEST_CONNECTION_PRECHECK_TIMEOUT']
+    )
+    latency_ms = round((time.monotonic() - started) * 1000, 1)
+    
+    if unreachable:
+        return {'status': 'unreachable', 'error': unreachable, 'latency_ms': latency_ms}
+    if winner is None:
+        errors = [result.error for result in results if result.error]
+        return {'status': 'down', 'error': errors[-1] if errors else 'No endpoint responded',
+                'latency_ms': latency_ms}
+    return {
+        'status': 'healthy' if winner.success else 'auth_failed',
+        'status_code': winner.status_code,
+        'test_endpoint': winner.endpoint,
+        'latency_ms': latency_ms
+    }
+
+def store_connection_health(connection_id, result):
+    """Save the latest health check result (runs on a monitor thread)"""
+    with app.app_context():
+        try:
+            health = db.session.get(ConnectionHealth, connection_id)
+            if health is None:
+                health = ConnectionHealth(api_connection_id=connection_id, consecutive_failures=0)
+                db.session.add(health)
+            health.status = result['status']
+            health.status_code = result.get('status_code')
+            health.latency_ms = result.get('latency_ms')
+            health.test_endpoint = result.get('test_endpoint')
+            health.error = result.get('error')
+            health.consecutive_failures = 0 if result['status'] == 'healthy' else health.consecutive_failures + 1
+            health.checked_at = datetime.utcnow()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+# Background health checks; one process per host runs them, every worker serves the results
+health_monitor = HealthMonitor.from_config(
+    active_connection_ids, check_connection_health, store_connection_health, app.config
+)
+atexit.register(health_monitor.stop)
+
+@app.before_request
+def start_health_monitor():
+    if app.config['HEALTH_MONITOR_ENABLED']:
+        health_monitor.ensure_started()
+
+def serialize_health(connection_id, name, health):
+    if health is None:
+        return {'connection_id': connection_id, 'name': name, 'status': 'unknown', 'checked_at': None}
+    return {
+        'connection_id': connection_id,
+        'name': name,
+        'status': health.status,
+        'status_code': health.status_code,
+        'latency_ms': health.latency_ms,
+        'test_endpoint': health.test_endpoint,
+        'error': health.error,
+        'consecutive_failures': health.consecutive_failures,
+        'checked_at': health.checked_at.isoformat()
+    }
+
+@app.route('/api/connections/health', methods=['GET'])
+def get_connections_health():
+    """Get the last recorded health of every active connection (never calls upstream APIs)"""
+    rows = db.session.query(APIConnection.id, APIConnection.name, ConnectionHealth).outerjoin(
+        ConnectionHealth, ConnectionHealth.api_connection_id == APIConnection.id
+    ).filter(APIConnection.is_active == True).all()
+    return jsonify([serialize_health(*row) for row in rows])
+
+@app.route('/api/connections/<int:connection_id>/health', methods=['GET'])
+def get_connection_health(connection_id):
+    """Get the last recorded health of one connection"""
+    connection = APIConnection.query.get_or_404(connection_id)
+    return jsonify(serialize_health(connection.id, connection.name,
+                                    db.session.get(ConnectionHealth, connection.id)))
+
 # API Provider endpoints
+# Catalog bodies are serialized like jsonify's compact output, once per catalog version
+catalog_dumps = partial(app.json.dumps, separators=(',', ':'))
+get_catalog_payloads(catalog_dumps)
+
+def catalog_response(payload):
+    """Serve a precomputed catalog payload, answering 304 when the client's ETag still matches"""
+    encoding, body, etag = payload.select(request.accept_encodings)
+    if payload.matches(request.if_none_match):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f"public, max-age={app.config['CATALOG_CACHE_MAX_AGE']}"
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/api/providers', methods=['GET'])
 def get_providers():
     """Get all available API providers"""
-    providers = get_all_providers()
-    # Convert to list format for frontend
-    provider_list = []
-    for key, config in providers.items():
-        provider_list.append({
-            'key': key,
-            'name': config['name'],
-            'base_url': config['base_url'],
-            'auth_type': config['auth_type'],
-            'description': config['description'],
-            'example_queries': config.get('example_queries', [])
-        })
-    return jsonify(provider_list)
+    return catalog_response(get_catalog_payloads(catalog_dumps).providers_list)
 
 @app.route('/api/providers/categories', methods=['GET'])
 def get_provider_categories_endpoint():
     """Get providers organized by categories"""
-    categories = get_provider_categories()
-    providers = get_all_providers()
-    
-    # Add provider details to categories
-    result = {}
-    for category, provider_keys in categories.items():
-        result[category] = []
-        for key in provider_keys:
-            if key in providers:
-                config = providers[key]
-                result[category].append({
-                    'key': key,
-                    'name': config['name'],
-                    'description': config['description'],
-                    'base_url': config['base_url'],
-                    'auth_type': config['auth_type']
-                })
-    
-    return jsonify(result)
+    return catalog_response(get_catalog_payloads(catalog_dumps).categories)
+
+SEARCH_MAX_LIMIT = 200
 
 @app.route('/api/providers/search', methods=['GET'])
 def search_providers_endpoint():
-    """Search providers by query"""
+    """Search providers by query, best matches first; optional limit (default all, max 200)"""
     query = request.args.get('q', '')
     if not query:
         return jsonify([])
     
-    results = search_providers(query)
+    limit = request.args.get('limit')
+    try:
+        limit = min(max(int(limit), 1), SEARCH_MAX_LIMIT) if limit else None
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    results = search_providers(query, limit)
     return jsonify(results)
 
 @app.route('/api/providers/<provider_key>', methods=['GET'])
 def get_provider_details(provider_key):
     """Get detailed information about a specific provider"""
-    provider = get_api_provider(provider_key)
-    if not provider:
+    payload = get_catalog_payloads(catalog_dumps).provider_detail(provider_key.lower())
+    if payload is None:
         return jsonify({'error': 'Provider not found'}), 404
     
+    return catalog_response(payload)
+
+# Metrics
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Get runtime counters for this worker process"""
     return jsonify({
-        'key': provider_key,
-        **provider
+        'health_monitor': health_monitor.stats(),
+        'history_writer': history_writer.stats(),
+        'http_pool': http_client.stats(),
+        'response_cache': response_cache.stats(),
+        'interpretation_memo': ai_processor.memo_stats(),
+        'llm_interpreter': interpreter.stats(),
+        'request_templates': request_templates.stats(),
+        'rate_limiter': rate_limiter.stats(),
+        'upstream': upstream_caller.stats(),
+        'coalescing': single_flight.stats(),
+        'provider_registry': get_all_providers().stats(),
+        'catalog_payloads': get_catalog_payloads(catalog_dumps).stats()
     })
 
 # Settings Management
@@ -595,6 +1089,34 @@ class APIKey(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
 
+# Defaults for the 'api' settings category used on the query path
+DEFAULT_API_SETTINGS = {
+    'timeout': 30,
+    'retries': 3,
+    'caching': True,
+}
+API_SETTINGS_TTL = 5  # seconds
+_api_settings_cache = {'value': None, 'expires_at': 0}
+
+def _parse_setting_value(value):
+    """Parse a stored setting value (JSON, or str() of a Python bool)"""
+    try:
+        return json.loads(value)
+    except ValueError:
+        if value in ('True', 'False'):
+            return value == 'True'
+        return value
+
+def get_api_settings():
+    """Get the 'api' settings, cached briefly to keep the database off the query path"""
+    now = time.monotonic()
+    if _api_settings_cache['value'] is None or _api_settings_cache['expires_at'] <= now:
+        settings = dict(DEFAULT_API_SETTINGS)
+        for setting in UserSettings.query.filter_by(user_id='default', category='api').all():
+            settings[setting.setting_key] = _parse_setting_value(setting.setting_value)
+        _api_settings_cache.update(value=settings, expires_at=now + API_SETTINGS_TTL)
+    return _api_settings_cache['value']
+
 # Settings endpoints
 @app.route('/api/settings', methods=['GET'])
 def get_settings():
@@ -633,11 +1155,7 @@ def get_settings():
                 'crashReports': True,
                 'shareUsage': False,
             },
-            'api': {
-                'timeout': 30,
-                'retries': 3,
-                'caching': True,
-            }
+            'api': dict(DEFAULT_API_SETTINGS)
         }
     
     return jsonify(result)
@@ -663,6 +1181,7 @@ def save_settings():
                 db.session.add(setting)
         
         db.session.commit()
+        _api_settings_cache['value'] = None
         return jsonify({'message': 'Settings saved successfully'})
     
     except Exception as e:
@@ -746,13 +1265,13 @@ def test_api_key(key_id):
         # Test the key based on service
         if key.service.lower() == 'openai':
             headers = {'Authorization': f'Bearer {key.key_value}'}
-            response = requests.get('https://api.openai.com/v1/models', headers=headers, timeout=10)
+            response = http_client.get('https://api.openai.com/v1/models', headers=headers, timeout=10)
         elif key.service.lower() == 'github':
             headers = {'Authorization': f'token {key.key_value}'}
-            response = requests.get('https://api.github.com/user', headers=headers, timeout=10)
+            response = http_client.get('https://api.github.com/user', headers=headers, timeout=10)
         elif key.service.lower() == 'stripe':
             headers = {'Authorization': f'Bearer {key.key_value}'}
-            response = requests.get('https://api.stripe.com/v1/charges', headers=headers, timeout=10)
+            response = http_client.get('https://api.stripe.com/v1/charges', headers=headers, timeout=10)
         else:
             return jsonify({'error': 'API key testing not implemented for this service'}), 400
         
@@ -779,19 +1298,41 @@ def test_api_key(key_id):
             'error': str(e)
         }), 500
 
-# Create tables safely (only if they don't exist)
+def upgrade_schema():
+    """Create missing tables and add columns introduced after the database was created"""
+    from sqlalchemy import inspect, text
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    db.create_all()
+    
+    added = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                with db.engine.begin() as connection:
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                    ))
+                added.append(f'{table.name}.{column.name}')
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    return existing_tables, added
+
+# Create tables safely (only if they don't exist) and apply additive upgrades
 with app.app_context():
     try:
-        # Check if tables exist before creating
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        existing_tables = inspector.get_table_names()
+        existing_tables, added_columns = upgrade_schema()
         
         if not existing_tables:
-            db.create_all()
             print("✅ Database tables created successfully")
         else:
             print(f"✅ Database already initialized with {len(existing_tables)} tables")
+        if added_columns:
+            print(f"✅ Database upgraded with new columns: {', '.join(added_columns)}")
     except Exception as e:
         print(f"⚠️  Database initialization warning: {e}")
 
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point for async query execution
+Serves POST /api/query on an event loop so a single worker can keep hundreds
+of upstream calls in flight; every other route is delegated to the Flask app.
+
+Run with: gunicorn -k uvicorn.workers.UvicornWorker --workers 4 asgi:app
+"""
+import asyncio
+import json
+import math
+import os
+
+# Set production environment before the app reads its config
+os.environ.setdefault('FLASK_ENV', 'production')
+
+import httpx
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.exceptions import NotFound
+
+from app import (
+    app as flask_app, APIConnection, prepare_query, record_query,
+    lookup_cached_response, response_cache, request_templates, rate_limiter,
+    upstream_caller, upstream_policy, upstream_error_status, upstream_request_key, single_flight,
+    wire_method, EXPOSED_HEADERS
+)
+from rate_limiter import RateLimitExceeded
+from resilience import CircuitOpenError
+
+
+class AsyncQueryApp:
+    """ASGI app running /api/query upstream calls on a shared async client"""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+        self.client = None
+
+        config = flask_app.config
+        self.limits = httpx.Limits(
+            max_connections=config.get('ASYNC_HTTP_MAX_CONNECTIONS', 500),
+            max_keepalive_connections=config.get('ASYNC_HTTP_MAX_KEEPALIVE', 100)
+        )
+        self.timeout = httpx.Timeout(
+            config.get('HTTP_READ_TIMEOUT', 30),
+            connect=config.get('HTTP_CONNECT_TIMEOUT', 5)
+        )
+
+    def _get_client(self):
+        if self.client is None:
+            self.client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self.client
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif (scope['type'] == 'http' and scope['method'] == 'POST'
+                and scope['path'].rstrip('/') == '/api/query'):
+            await self._process_query(scope, receive, send)
+        else:
+            await self.wsgi_app(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._get_client()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.client is not None:
+                    await self.client.aclose()
+                    self.client = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _read_body(self, receive):
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+        return body
+
+    def _replay_body(self, body):
+        """Build a receive callable that hands an already-read body to another app"""
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {'type': 'http.disconnect'}
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        return receive
+
+    def _cors_headers(self, scope):
+        origins = self.flask_app.config.get('CORS_ORIGINS', ['*'])
+        request_origin = None
+        for name, value in scope.get('headers', []):
+            if name == b'origin':
+                request_origin = value.decode('latin-1')
+        # Same headers the Flask app exposes, so browsers can read X-Cache, X-Query-Id, ...
+        exposed = (b'access-control-expose-headers', ', '.join(EXPOSED_HEADERS).encode('latin-1'))
+        if '*' in origins:
+            return [(b'access-control-allow-origin', b'*'), exposed]
+        if request_origin in origins:
+            return [
+                (b'access-control-allow-origin', request_origin.encode('latin-1')),
+                exposed,
+                (b'vary', b'Origin')
+            ]
+        return []
+
+    async def _send_json(self, scope, send, payload, status=200, extra_headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii'))
+        ] + self._cors_headers(scope) + (extra_headers or [])
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _prepare(self, data):
+        """Load the connection, build the upstream request and check the cache (runs in a thread)"""
+        with self.flask_app.app_context():
+            connection = APIConnection.query.get_or_404(data['connection_id'])
+            interpretation, url, headers = prepare_query(connection, data['query'])
+            cache_key, cache_ttl, cached_body = lookup_cached_response(
+                connection, interpretation, url, headers
+            )
+            cached_query_id = None
+            if cached_body is not None:
+                cached_query_id = record_query(
+                    connection.id, data['query'], interpretation, url, cached_body, 'success', cached=True
+                )
+            upstream = (request_templates.get(connection).rate_limits, upstream_policy())
+            cache = (cache_key, cache_ttl, cached_body, cached_query_id)
+            return connection.id, interpretation, url, headers, upstream, cache
+
+    def _record(self, *args, **kwargs):
+        """Save query history (runs in a thread)"""
+        with self.flask_app.app_context():
+            return record_query(*args, **kwargs)
+
+    def _store(self, cache, connection_id, user_query, interpretation, url, response_body):
+        """Populate the response cache and save query history (runs in a thread)"""
+        cache_key, cache_ttl = cache[0], cache[1]
+        if cache_key:
+            response_cache.set(cache_key, response_body, cache_ttl)
+        return self._record(connection_id, user_query, interpretation, url, response_body, 'success')
+
+    async def _process_query(self, scope, receive, send):
+        body = await self._read_body(receive)
+        try:
+            data = json.loads(body or b'null')
+        except ValueError:
+            data = None
+
+        if not isinstance(data, dict) or 'query' not in data or 'connection_id' not in data:
+            return await self._send_json(
+                scope, send, {'error': 'Missing required fields: query and connection_id'}, 400
+            )
+
+        if data.get('stream'):
+            # Streaming passthrough is served by the Flask route
+            return await self.wsgi_app(scope, self._replay_body(body), send)
+
+        user_query = data['query']
+        try:
+            connection_id, interpretation, url, headers, upstream, cache = await asyncio.to_thread(
+                self._prepare, data
+            )
+        except NotFound:
+            return await self._send_json(scope, send, {'error': 'Connection not found'}, 404)
+
+        cache_key, _, cached_body, cached_query_id = cache
+        if cached_body is not None:
+            return await self._send_json(scope, send, {
+                'success': True,
+                'data': json.loads(cached_body),
+                'interpretation': interpretation,
+                'query_id': cached_query_id,
+                'cache': 'hit'
+            }, extra_headers=[(b'x-cache', b'HIT')])
+
+        # requests drops None-valued params; keep the same wire format
+        params = {key: value for key, value in interpretation['params'].items() if value is not None}
+        client = self._get_client()
+        rate_limits, policy = upstream
+        connect_timeout, read_timeout = policy['timeout']
+        method = wire_method(interpretation)
+
+        async def send_upstream(timeout):
+            async with rate_limiter.limit_async(rate_limits):
+                if method == 'GET':
+                    response = await client.get(url, headers=headers, params=params, timeout=timeout)
+                else:
+                    response = await client.post(url, headers=headers, json=interpretation['params'],
+                                                 timeout=timeout)
+            await rate_limiter.observe_async(rate_limits, response.status_code, response.headers)
+            return response
+
+        async def execute():
+            response = await upstream_caller.call_async(
+                send_upstream, method, url, retries=policy['retries'],
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                retry_errors=(httpx.TransportError,)
+            )
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            if interpretation['method'] == 'GET':
+                # Identical concurrent GETs on this event loop share one upstream call
+                response_data, shared = await single_flight.do_async(
+                    upstream_request_key(connection_id, interpretation, url), execute
+                )
+            else:
+                response_data, shared = await execute(), False
+
+        except (httpx.HTTPError, RateLimitExceeded, CircuitOpenError, ValueError) as e:
+            await asyncio.to_thread(
+                self._record, connection_id, user_query, interpretation, url, str(e), 'error'
+            )
+            payload = {
+                'success': False,
+                'error': str(e),
+                'interpretation': interpretation
+            }
+            status, retry_after = upstream_error_status(e)
+            if retry_after is None:
+                return await self._send_json(scope, send, payload, status)
+            payload['retry_after'] = retry_after
+            return await self._send_json(scope, send, payload, status, extra_headers=[
+                (b'retry-after', str(max(int(math.ceil(retry_after)), 1)).encode('ascii'))
+            ])
+
+        query_id = await asyncio.to_thread(
+            self._store, cache if not shared else (None, None), connection_id, user_query, interpretation,
+            url, json.dumps(response_data)
+        )
+        cache_status = 'miss' if cache_key else 'bypass'
+        await self._send_json(scope, send, {
+            'success': True,
+            'data': response_data,
+            'interpretation': interpretation,
+            'query_id': query_id,
+            'cache': cache_status
+        }, extra_headers=[(b'x-cache', cache_status.upper().encode('ascii'))])
+
+
+app = AsyncQueryApp(flask_app)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(os.environ.get('PORT', 8000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
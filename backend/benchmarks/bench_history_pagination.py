@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/history latency on a large query_history table
+
+Seeds a throwaway SQLite database with synthetic history rows, then times
+first pages, deep keyset pages and filtered pages through the Flask test
+client, alongside the OFFSET query keyset pagination replaces.
+
+Usage: python benchmarks/bench_history_pagination.py [--rows N] [--db PATH]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+STATUSES = ['success'] * 8 + ['error']
+ENDPOINTS = ['/users', '/posts', '/comments', '/repos/acme/api/commits', '/weather', '/v2/everything']
+
+
+def seed(db_path, rows, connections, batch_size=50000):
+    """Insert synthetic history rows directly through sqlite3"""
+    database = sqlite3.connect(db_path)
+    database.execute('PRAGMA journal_mode=OFF')
+    database.execute('PRAGMA synchronous=OFF')
+    database.executemany(
+        "INSERT INTO api_connection (id, name, base_url, auth_type, created_at, is_active) "
+        "VALUES (?, ?, ?, 'bearer', ?, 1)",
+        [(i, f'Connection {i}', f'https://api{i}.example.com', datetime.utcnow().isoformat(sep=' '))
+         for i in range(1, connections + 1)]
+    )
+
+    rng = random.Random(42)
+    started_at = datetime.utcnow() - timedelta(days=365)
+    step = timedelta(days=365) / rows
+    inserted = 0
+    while inserted < rows:
+        batch = []
+        for offset in range(min(batch_size, rows - inserted)):
+            position = inserted + offset
+            endpoint = rng.choice(ENDPOINTS)
+            batch.append((
+                rng.randint(1, connections),
+                f'query {position}',
+                f'https://api.example.com{endpoint}',
+                rng.choice(STATUSES),
+                (started_at + step * position).isoformat(sep=' ')
+            ))
+        database.executemany(
+            "INSERT INTO query_history (api_connection_id, user_query, api_endpoint, status, cached, created_at) "
+            "VALUES (?, ?, ?, ?, 0, ?)", batch
+        )
+        database.commit()
+        inserted += len(batch)
+    database.execute('ANALYZE')
+    database.close()
+
+
+def timed(callable_, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callable_()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--pages', type=int, default=200, help='pages to walk for the deep-page timing')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--db', help='reuse/keep a database file instead of a temporary one')
+    args = parser.parse_args()
+
+    db_path = args.db or tempfile.mktemp(suffix='.db', prefix='history_bench_')
+    fresh = not os.path.exists(db_path)
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ.setdefault('FLASK_ENV', 'production')
+
+    from app import app
+
+    if fresh:
+        started = time.perf_counter()
+        seed(db_path, args.rows, args.connections)
+        print(f"Seeded {args.rows} rows in {time.perf_counter() - started:.1f}s ({db_path})")
+
+    client = app.test_client()
+
+    # Walk forward with keyset cursors to reach a deep page
+    cursor = None
+    for _ in range(args.pages):
+        response = client.get('/api/history', query_string={'cursor': cursor} if cursor else {})
+        cursor = response.headers.get('X-Next-Cursor')
+    deep_offset = args.pages * 50
+
+    cases = [
+        ('first page', {}),
+        (f'keyset page at offset {deep_offset}', {'cursor': cursor}),
+        ('filter connection_id', {'connection_id': 7}),
+        ('filter status=error', {'status': 'error'}),
+        ('filter date range', {'since': (datetime.utcnow() - timedelta(days=30)).isoformat(),
+                               'until': (datetime.utcnow() - timedelta(days=20)).isoformat()}),
+        ('filter connection + status', {'connection_id': 7, 'status': 'error'}),
+    ]
+    print(f"{'case':<40} median ms")
+    for label, params in cases:
+        print(f"{label:<40} {timed(lambda: client.get('/api/history', query_string=params), args.repeat):8.2f}")
+
+    # OFFSET pagination cost grows with depth; keyset pages do not
+    database = sqlite3.connect(db_path)
+    for offset in (deep_offset, args.rows // 2):
+        offset_ms = timed(lambda: database.execute(
+            'SELECT * FROM query_history ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET ?',
+            (offset,)
+        ).fetchall(), max(args.repeat // 4, 1))
+        print(f"{f'OFFSET {offset} (raw SQL, for contrast)':<40} {offset_ms:8.2f}")
+    database.close()
+
+    if not args.db:
+        os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
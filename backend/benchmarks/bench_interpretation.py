@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: query interpretation throughput over a replayed query corpus
+
+Builds a corpus from the catalog's example queries and query patterns,
+replays it with a skewed (dashboard-like) repeat distribution and compares
+AIQueryProcessor with and without the interpretation memo.
+
+Usage: python benchmarks/bench_interpretation.py [--queries N] [--corpus FILE]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_providers import get_all_providers
+from query_processor import AIQueryProcessor
+
+GENERIC_BASE_URLS = ['https://internal.example.com/api', 'https://legacy.example.org']
+
+
+def build_corpus():
+    """Return a list of (query, base_url) pairs drawn from the catalog"""
+    corpus = []
+    for provider_config in get_all_providers().values():
+        base_url = provider_config['base_url'].replace('{', '').replace('}', '')
+        for query in provider_config.get('example_queries', []):
+            corpus.append((query, base_url))
+        for patterns in provider_config.get('query_patterns', {}).values():
+            for pattern in patterns:
+                corpus.append((f'Get the latest 10 {pattern} "apiflexy"', base_url))
+    for base_url in GENERIC_BASE_URLS:
+        for query in ['list all users', 'get posts by id 42', 'show comments', 'fetch data']:
+            corpus.append((query, base_url))
+    return corpus
+
+
+def load_corpus(path):
+    """Load (query, base_url) pairs from a JSONL file with query/base_url fields"""
+    with open(path) as corpus_file:
+        return [(row['query'], row['base_url']) for row in map(json.loads, corpus_file)]
+
+
+def replay(processor, stream):
+    started = time.perf_counter()
+    for query, connection in stream:
+        processor.interpret_query(query, connection)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=50000)
+    parser.add_argument('--corpus', help='JSONL file of {"query", "base_url"} rows')
+    parser.add_argument('--memo-size', type=int, default=2048)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus()
+    connections = {base_url: SimpleNamespace(base_url=base_url) for _, base_url in corpus}
+    corpus = [(query, connections[base_url]) for query, base_url in corpus]
+
+    # Dashboards re-send a small set of queries far more often than the rest
+    rng = random.Random(args.seed)
+    weights = [1 / (rank + 1) for rank in range(len(corpus))]
+    stream = rng.choices(corpus, weights=weights, k=args.queries)
+
+    uncached = AIQueryProcessor(memo_size=0)
+    memoized = AIQueryProcessor(memo_size=args.memo_size)
+
+    mismatches = sum(
+        1 for query, connection in corpus
+        if uncached.interpret_query(query, connection) != memoized.interpret_query(query, connection)
+    )
+    memoized.clear_memo()
+
+    baseline = replay(uncached, stream)
+    with_memo = replay(memoized, stream)
+    stats = memoized.memo_stats()
+
+    print(f"Corpus: {len(corpus)} distinct queries, {args.queries} replayed")
+    print(f"No memo:   {args.queries / baseline:10.0f} queries/s")
+    print(f"With memo: {args.queries / with_memo:10.0f} queries/s ({baseline / with_memo:.1f}x)")
+    print(f"Memo hit rate: {stats['hit_rate']:.1%}, uncacheable: {stats['uncacheable']}, "
+          f"entries: {stats['entries']}")
+    print(f"Interpretation mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
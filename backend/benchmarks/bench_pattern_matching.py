@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled query-pattern matchers vs per-pattern substring scoring
+
+Checks that every provider picks exactly the same endpoint (and the generic
+fallback the same method and endpoint) for every query in the corpus, then
+times both implementations.
+
+Usage: python benchmarks/bench_pattern_matching.py [--iterations N] [--corpus FILE]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_providers import get_all_providers
+from pattern_matcher import EndpointMatcher, EndpointMatcherTable
+from query_processor import GENERIC_RULES
+
+
+def linear_best_match(provider_config, query_lower):
+    """Original AIQueryProcessor._interpret_query endpoint scoring"""
+    endpoints = provider_config['endpoints']
+    query_patterns = provider_config.get('query_patterns', {})
+    best_match = None
+    best_score = 0
+    for endpoint_key, endpoint_path in endpoints.items():
+        if endpoint_key in query_patterns:
+            patterns = query_patterns[endpoint_key]
+            score = sum(1 for pattern in patterns if pattern in query_lower)
+            if score > best_score:
+                best_score = score
+                best_match = (endpoint_key, endpoint_path)
+    return best_match
+
+
+def linear_generic(query_lower):
+    """Original AIQueryProcessor._interpret_generic_query keyword chains"""
+    method = None
+    if any(word in query_lower for word in ['get', 'fetch', 'retrieve', 'show', 'list']):
+        method = 'GET'
+    elif any(word in query_lower for word in ['create', 'add', 'post', 'new']):
+        method = 'POST'
+    elif any(word in query_lower for word in ['update', 'edit', 'modify']):
+        method = 'PUT'
+    elif any(word in query_lower for word in ['delete', 'remove']):
+        method = 'DELETE'
+    if any(word in query_lower for word in ['user', 'users', 'profile', 'account']):
+        endpoint = '/users'
+    elif any(word in query_lower for word in ['post', 'posts', 'article', 'blog']):
+        endpoint = '/posts'
+    elif any(word in query_lower for word in ['comment', 'comments']):
+        endpoint = '/comments'
+    elif any(word in query_lower for word in ['data', 'all', 'list']):
+        endpoint = '/data'
+    else:
+        endpoint = '/'
+    return method, endpoint
+
+
+def enriched_provider(endpoint_count, patterns_per_endpoint, seed=7):
+    """A synthetic provider with many endpoints and patterns, as catalog entries grow"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = sorted({''.join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+                    for _ in range(endpoint_count * patterns_per_endpoint)})
+    endpoints = {f'endpoint_{index}': f'/endpoint/{index}' for index in range(endpoint_count)}
+    query_patterns = {
+        endpoint_key: rng.sample(words, patterns_per_endpoint) for endpoint_key in endpoints
+    }
+    return {'endpoints': endpoints, 'query_patterns': query_patterns}, words
+
+
+def build_queries(providers):
+    """Example queries plus single and paired pattern queries from the whole catalog"""
+    queries = set()
+    patterns = []
+    for provider_config in providers.values():
+        queries.update(query.lower() for query in provider_config.get('example_queries', []))
+        for endpoint_patterns in provider_config.get('query_patterns', {}).values():
+            patterns.extend(endpoint_patterns)
+    for index, pattern in enumerate(patterns):
+        queries.add(f'get the latest 10 {pattern}')
+        queries.add(f'{pattern} and {patterns[(index * 7 + 3) % len(patterns)]} for "apiflexy"')
+    queries.update(['', 'list all users', 'delete the blog post', 'update my profile data', 'xyz'])
+    return sorted(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--endpoints', type=int, default=60, help='endpoints of the enriched provider')
+    parser.add_argument('--patterns', type=int, default=8, help='patterns per enriched endpoint')
+    parser.add_argument('--corpus', help='JSONL file with a "query" field per row')
+    args = parser.parse_args()
+
+    providers = get_all_providers()
+    if args.corpus:
+        with open(args.corpus) as corpus_file:
+            queries = [json.loads(line)['query'].lower() for line in corpus_file]
+    else:
+        queries = build_queries(providers)
+    scored = [(key, config) for key, config in providers.items() if 'endpoints' in config]
+    table = EndpointMatcherTable(providers)
+    matchers = [(config, table.get(key, config)) for key, config in scored]
+
+    mismatches = sum(
+        1 for config, matcher in matchers for query in queries
+        if linear_best_match(config, query) != matcher.best_match(query)
+    )
+    mismatches += sum(
+        1 for query in queries
+        if linear_generic(query) != tuple(GENERIC_RULES.match(query).values())
+    )
+
+    enriched, words = enriched_provider(args.endpoints, args.patterns)
+    enriched_matcher = EndpointMatcher(enriched['endpoints'], enriched['query_patterns'])
+    rng = random.Random(11)
+    enriched_queries = [
+        ' '.join(rng.choice(words + ['show', 'me', 'the', 'latest', 'for']) for _ in range(rng.randint(3, 10)))
+        for _ in range(500)
+    ]
+    mismatches += sum(
+        1 for query in enriched_queries
+        if linear_best_match(enriched, query) != enriched_matcher.best_match(query)
+    )
+
+    def run_linear():
+        for config, _ in matchers:
+            for query in queries:
+                linear_best_match(config, query)
+
+    def run_compiled():
+        for _, matcher in matchers:
+            for query in queries:
+                matcher.best_match(query)
+
+    def run_generic_linear():
+        for query in queries:
+            linear_generic(query)
+
+    def run_generic_compiled():
+        for query in queries:
+            GENERIC_RULES.match(query)
+
+    def run_enriched_linear():
+        for query in enriched_queries:
+            linear_best_match(enriched, query)
+
+    def run_enriched_compiled():
+        for query in enriched_queries:
+            enriched_matcher.best_match(query)
+
+    def build_all():
+        built = EndpointMatcherTable(providers)
+        return [built.get(key, config) for key, config in scored]
+
+    build_time = timeit.timeit(build_all, number=5) / 5
+    lookups = len(matchers) * len(queries)
+    linear = timeit.timeit(run_linear, number=args.iterations) / args.iterations
+    compiled = timeit.timeit(run_compiled, number=args.iterations) / args.iterations
+    generic_linear = timeit.timeit(run_generic_linear, number=args.iterations * 10) / (args.iterations * 10)
+    generic_compiled = timeit.timeit(run_generic_compiled, number=args.iterations * 10) / (args.iterations * 10)
+
+    print(f"Corpus:            {len(queries)} queries x {len(matchers)} providers")
+    print(f"Matcher build:     {build_time * 1e3:.1f} ms for the whole catalog")
+    print(f"Endpoint scoring:  linear {linear / lookups * 1e6:.2f} us, "
+          f"compiled {compiled / lookups * 1e6:.2f} us ({linear / compiled:.1f}x)")
+    print(f"Generic fallback:  linear {generic_linear / len(queries) * 1e6:.2f} us, "
+          f"compiled {generic_compiled / len(queries) * 1e6:.2f} us ({generic_linear / generic_compiled:.1f}x)")
+    enriched_linear = timeit.timeit(run_enriched_linear, number=args.iterations) / args.iterations
+    enriched_compiled = timeit.timeit(run_enriched_compiled, number=args.iterations) / args.iterations
+    print(f"Enriched provider: {args.endpoints} endpoints x {args.patterns} patterns: "
+          f"linear {enriched_linear / len(enriched_queries) * 1e6:.2f} us, "
+          f"compiled {enriched_compiled / len(enriched_queries) * 1e6:.2f} us "
+          f"({enriched_linear / enriched_compiled:.1f}x)")
+    print(f"Mismatches:        {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
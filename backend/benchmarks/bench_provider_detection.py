@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: provider detection index vs the original linear catalog scan
+
+Usage: python benchmarks/bench_provider_detection.py [--iterations N]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_providers import get_all_providers
+from provider_index import ProviderIndex
+
+
+def linear_scan(providers, base_url):
+    """Original AIQueryProcessor.detect_api_provider implementation"""
+    base_url_lower = base_url.lower()
+    for provider_key, provider_config in providers.items():
+        provider_url = provider_config['base_url'].lower()
+        provider_url_clean = re.sub(r'\{[^}]+\}', '', provider_url)
+        if any(domain in base_url_lower for domain in [
+            provider_url_clean.replace('https://', '').replace('http://', '').split('/')[0],
+            provider_key
+        ]):
+            return provider_key, provider_config
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    providers = get_all_providers()
+    urls = [config['base_url'] for config in providers.values()]
+    urls += ['https://acme.myshopify.com/admin/api/2023-10', 'https://internal.example.com/api']
+
+    build_time = timeit.timeit(lambda: ProviderIndex(providers), number=20) / 20
+    index = ProviderIndex(providers)
+
+    def run_linear():
+        for url in urls:
+            linear_scan(providers, url)
+
+    def run_resolve():
+        for url in urls:
+            index._resolve(url)
+
+    def run_index():
+        for url in urls:
+            index.lookup(url)
+
+    linear = timeit.timeit(run_linear, number=args.iterations)
+    resolved = timeit.timeit(run_resolve, number=args.iterations)
+    indexed = timeit.timeit(run_index, number=args.iterations)
+    lookups = args.iterations * len(urls)
+
+    print(f"Catalog size:      {len(providers)} providers, {len(urls)} URLs")
+    print(f"Index build:       {build_time * 1e3:.3f} ms")
+    print(f"Linear scan:       {linear / lookups * 1e6:.2f} us/lookup")
+    print(f"Index (uncached):  {resolved / lookups * 1e6:.2f} us/lookup ({linear / resolved:.1f}x)")
+    print(f"Index (memoized):  {indexed / lookups * 1e6:.2f} us/lookup ({linear / indexed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: provider search index vs the original linear substring scan
+
+Usage: python benchmarks/bench_provider_search.py [--providers N] [--iterations N]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_providers import get_all_providers, get_provider_categories
+from provider_search import ProviderSearchIndex
+
+QUERIES = [
+    'weather', 'weathr', 'git', 'stripe pay', 'crypto price', 'spotfy',
+    'music streaming', 'a', 'api', 'send email', 'wikipdia search', 'zzzz'
+]
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ten', 'vo', 'zu', 'pex', 'dri', 'nal', 'quo', 'sy']
+
+
+def linear_scan(providers, query):
+    """Original api_providers.search_providers implementation"""
+    query = query.lower()
+    results = []
+    for key, provider in providers.items():
+        if (query in provider['name'].lower() or
+                query in provider['description'].lower() or
+                query in key):
+            results.append({
+                'key': key,
+                'name': provider['name'],
+                'description': provider['description']
+            })
+    return results
+
+
+def synthetic_catalog(size, seed=7):
+    """Grow the real catalog to size providers with made-up brand names"""
+    rng = random.Random(seed)
+    base = get_all_providers()
+    templates = list(base.values())
+    providers = dict(base)
+    while len(providers) < size:
+        brand = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        template = rng.choice(templates)
+        key = f'{brand}_{len(providers)}'
+        providers[key] = {
+            **template,
+            'name': f"{brand.title()} {template['name']}",
+            'description': f"{brand.title()}: {template['description']}"
+        }
+    return providers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--providers', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    providers = synthetic_catalog(args.providers)
+    categories = get_provider_categories()
+
+    build_time = timeit.timeit(lambda: ProviderSearchIndex(providers, categories), number=1)
+    index = ProviderSearchIndex(providers, categories)
+
+    print(f"Catalog size:  {len(providers)} providers, {len(index.vocabulary)} indexed tokens")
+    print(f"Index build:   {build_time * 1e3:.1f} ms")
+    print(f"{'query':<18}{'linear us':>11}{'ranked us':>11}{'memo+limit=10 us':>18}{'hits':>7}")
+    for query in QUERIES:
+        linear = timeit.timeit(lambda: linear_scan(providers, query), number=args.iterations)
+        ranked = timeit.timeit(lambda: index.rank(query), number=args.iterations)
+        limited = timeit.timeit(lambda: index.search(query, 10), number=args.iterations)
+        hits = len(index.rank(query))
+        print(f"{query!r:<18}{linear / args.iterations * 1e6:>11.0f}"
+              f"{ranked / args.iterations * 1e6:>11.0f}{limited / args.iterations * 1e6:>18.1f}{hits:>7}")
+
+
+if __name__ == '__main__':
+    main()
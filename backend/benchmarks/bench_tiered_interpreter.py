@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: tiered interpretation against a local fake LLM server
+
+Replays a corpus mixing confident catalog queries with vague generic ones,
+repeated and lightly paraphrased (reordered words, typos), through
+TieredInterpreter backed by benchmarks/fake_llm_server.py. Reports how many
+queries took each tier and the latency of each, then checks that a failing
+backend falls back to the rule-based result.
+
+Usage: python benchmarks/bench_tiered_interpreter.py [--queries N] [--latency-ms N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_llm_server import start_server
+from llm_interpreter import OpenAICompatibleBackend, SemanticCache, TieredInterpreter
+from query_processor import AIQueryProcessor
+
+CONFIDENT = [
+    ('show my recent commits', 'https://api.github.com'),
+    ('weather forecast in paris', 'https://api.openweathermap.org/data/2.5'),
+    ('search tweets about "python"', 'https://api.twitter.com/2'),
+    ('list all users', 'https://internal.example.com/api')
+]
+VAGUE = [
+    'how many invoices are overdue', 'which servers are unhealthy', 'open support tickets for acme',
+    'quarterly revenue by region', 'pending shipments to berlin', 'top 5 products this month',
+    'employees hired last year', 'failed payments yesterday', 'inventory below reorder level',
+    'subscriptions expiring soon'
+]
+GENERIC_BASE_URL = 'https://erp.example.com/api'
+
+
+def paraphrase(query, rng):
+    words = query.split()
+    roll = rng.random()
+    if roll < 0.3 and len(words) > 2:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    elif roll < 0.5:
+        word = rng.choice([w for w in words if len(w) > 4] or words)
+        i = rng.randrange(len(word))
+        words[words.index(word)] = word[:i] + word[i + 1:]
+    elif roll < 0.6:
+        return query.upper() + '?'
+    return ' '.join(words)
+
+
+def build_stream(count, seed):
+    rng = random.Random(seed)
+    stream = []
+    for _ in range(count):
+        if rng.random() < 0.7:
+            query, base_url = rng.choice(CONFIDENT)
+        else:
+            query, base_url = paraphrase(rng.choice(VAGUE), rng), GENERIC_BASE_URL
+        stream.append((query, SimpleNamespace(base_url=base_url)))
+    return stream
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--similarity', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    server = start_server(latency=args.latency_ms / 1000)
+    backend = OpenAICompatibleBackend(f'http://127.0.0.1:{server.server_port}/v1', api_key='test', timeout=5)
+    interpreter = TieredInterpreter(
+        AIQueryProcessor(), backend=backend, cache=SemanticCache(similarity=args.similarity)
+    )
+
+    tiers = {'rules': [], 'cache': [], 'model': []}
+    started = time.perf_counter()
+    for query, connection in build_stream(args.queries, args.seed):
+        calls, hits = interpreter.backend_calls, interpreter.cache.exact_hits + interpreter.cache.semantic_hits
+        query_started = time.perf_counter()
+        interpretation = interpreter.interpret_query(query, connection)
+        elapsed = time.perf_counter() - query_started
+        assert interpretation['endpoint'].startswith('/') or interpretation['endpoint'] == ''
+        if interpreter.backend_calls > calls:
+            tiers['model'].append(elapsed)
+        elif interpreter.cache.exact_hits + interpreter.cache.semantic_hits > hits:
+            tiers['cache'].append(elapsed)
+        else:
+            tiers['rules'].append(elapsed)
+    total = time.perf_counter() - started
+
+    print(f"Queries:       {args.queries} in {total:.2f}s (fake model latency {args.latency_ms:.0f} ms)")
+    for tier, latencies in tiers.items():
+        print(f"{tier + ':':<14} {len(latencies):>6} queries, p50 {percentile(latencies, 0.5):8.3f} ms, "
+              f"p99 {percentile(latencies, 0.99):8.3f} ms")
+    cache = interpreter.cache.stats()
+    print(f"Cache:         {cache['exact_hits']} exact, {cache['semantic_hits']} semantic hits, "
+          f"{cache['entries']} entries; server saw {server.completions} completions")
+
+    server.shutdown()
+    server.server_close()
+    interpreter.cache.clear()
+    failing = TieredInterpreter(AIQueryProcessor(), backend=backend)
+    query, connection = 'how many invoices are overdue', SimpleNamespace(base_url=GENERIC_BASE_URL)
+    expected = AIQueryProcessor().interpret_query(query, connection)
+    fallback_ok = failing.interpret_query(query, connection) == expected
+    print(f"Backend down:  fell back to rules: {fallback_ok}, failures {failing.backend_failures}")
+    return 0 if fallback_ok and server.completions == interpreter.backend_calls else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Equivalence check: catalog param_rules vs the original provider if/elif chain
+
+Applies both to every rule-carrying provider, for each of its endpoints (or a
+set of stand-in endpoints for providers that declare none), over a generated
+query corpus, and reports any interpretation that differs. Then times both.
+
+Usage: python benchmarks/check_param_rules.py [--queries N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import query_processor
+from api_providers import get_all_providers
+from param_rules import ParamRules
+from query_processor import AIQueryProcessor, tokenize_query
+
+WORDS = [
+    'search', 'author', 'category', 'subreddit', 'country', 'since', 'today', 'yesterday',
+    'published', 'forecast', 'weather', 'temperature', 'in', 'for', 'at', 'near', 'paris',
+    'new york', 'london,', 'artist', 'album', 'track', 'commits', 'posts', 'octocat', 'us',
+    'gb', 'python', 'news', '"beatles"', "'jazz'", '""', '10', '3', 'show', 'me', 'the'
+]
+STAND_IN_ENDPOINTS = {'current': '/current.json', 'search': '/search', 'posts': '/posts', 'commits': '/commits'}
+FIXED_NOW = query_processor.datetime(2024, 5, 17, 12, 0, 0)
+
+
+def original_params(processor, interpretation, query_lower, provider_key, endpoint_key):
+    """The if/elif chain AIQueryProcessor._add_provider_specific_params used to be"""
+    if provider_key == 'github':
+        if endpoint_key == 'commits':
+            if 'since' in query_lower:
+                interpretation['params']['since'] = processor._extract_date(query_lower)
+            if 'author' in query_lower:
+                author = processor._extract_after_keyword(query_lower, 'author')
+                if author:
+                    interpretation['params']['author'] = author
+    elif provider_key == 'wordpress':
+        if endpoint_key == 'posts':
+            if 'search' in query_lower:
+                search_terms = processor.extract_quoted_text(query_lower)
+                if search_terms:
+                    interpretation['params']['search'] = search_terms[0]
+            if 'category' in query_lower:
+                interpretation['params']['categories'] = processor._extract_after_keyword(query_lower, 'category')
+            if 'published' in query_lower:
+                interpretation['params']['status'] = 'publish'
+    elif provider_key in ['openweather', 'weatherapi']:
+        location = processor.extract_location(query_lower)
+        if location:
+            interpretation['params']['q'] = location
+        if 'forecast' in query_lower:
+            interpretation['endpoint'] = interpretation['endpoint'].replace('current', 'forecast')
+    elif provider_key == 'twitter':
+        if 'search' in query_lower:
+            search_terms = processor.extract_quoted_text(query_lower)
+            if search_terms:
+                interpretation['params']['query'] = search_terms[0]
+    elif provider_key == 'spotify':
+        if 'search' in query_lower:
+            search_terms = processor.extract_quoted_text(query_lower)
+            if search_terms:
+                interpretation['params']['q'] = search_terms[0]
+            if 'artist' in query_lower:
+                interpretation['params']['type'] = 'artist'
+            elif 'album' in query_lower:
+                interpretation['params']['type'] = 'album'
+            elif 'track' in query_lower:
+                interpretation['params']['type'] = 'track'
+    elif provider_key == 'youtube':
+        if 'search' in query_lower:
+            search_terms = processor.extract_quoted_text(query_lower)
+            if search_terms:
+                interpretation['params']['q'] = search_terms[0]
+            interpretation['params']['part'] = 'snippet'
+    elif provider_key == 'reddit':
+        if 'subreddit' in query_lower:
+            subreddit = processor._extract_after_keyword(query_lower, 'subreddit')
+            if subreddit:
+                interpretation['endpoint'] = f'/r/{subreddit}'
+    elif provider_key == 'newsapi':
+        if 'search' in query_lower:
+            search_terms = processor.extract_quoted_text(query_lower)
+            if search_terms:
+                interpretation['params']['q'] = search_terms[0]
+        if 'country' in query_lower:
+            country = processor._extract_after_keyword(query_lower, 'country')
+            if country:
+                interpretation['params']['country'] = country[:2].lower()
+
+
+def build_queries(count, seed):
+    rng = random.Random(seed)
+    queries = ['', 'search', 'country', 'author   ', 'category  ', 'weather in paris', 'temperature london']
+    while len(queries) < count:
+        queries.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 8))))
+    return queries
+
+
+def fresh_interpretation(endpoint_path):
+    return {'endpoint': endpoint_path, 'method': 'GET', 'params': {}, 'filters': {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=3)
+    args = parser.parse_args()
+
+    processor = AIQueryProcessor()
+    queries = build_queries(args.queries, args.seed)
+    tokens = [tokenize_query(query) for query in queries]
+    cases = []
+    for provider_key, provider_config in get_all_providers().items():
+        if 'param_rules' not in provider_config:
+            continue
+        endpoints = provider_config.get('endpoints') or STAND_IN_ENDPOINTS
+        cases.append((provider_key, endpoints, ParamRules(endpoints, provider_config['param_rules'])))
+
+    mismatches = 0
+    checked = 0
+    with mock.patch.object(query_processor, 'datetime', mock.Mock(wraps=query_processor.datetime)) as clock:
+        clock.now.return_value = FIXED_NOW
+        for provider_key, endpoints, rules in cases:
+            for endpoint_key, endpoint_path in endpoints.items():
+                for query_tokens in tokens:
+                    expected = fresh_interpretation(endpoint_path)
+                    original_params(processor, expected, query_tokens.lower, provider_key, endpoint_key)
+                    actual = fresh_interpretation(endpoint_path)
+                    rules.apply(actual, query_tokens, endpoint_key)
+                    checked += 1
+                    if actual != expected:
+                        mismatches += 1
+                        if mismatches <= 10:
+                            print(f'MISMATCH {provider_key}/{endpoint_key} {query_tokens.text!r}: '
+                                  f'{actual} != {expected}')
+
+    def run_chain():
+        for provider_key, endpoints, _ in cases:
+            for endpoint_key, endpoint_path in endpoints.items():
+                for query in queries:
+                    original_params(processor, fresh_interpretation(endpoint_path), query.lower(),
+                                    provider_key, endpoint_key)
+
+    def run_rules():
+        # The query is tokenized once before dispatch in either case; only time the rules
+        batches = [[tokenize_query(query) for query in queries] for _, endpoints, _ in cases for _ in endpoints]
+        started = time.perf_counter()
+        batch = iter(batches)
+        for _, endpoints, rules in cases:
+            for endpoint_key, endpoint_path in endpoints.items():
+                for query_tokens in next(batch):
+                    rules.apply(fresh_interpretation(endpoint_path), query_tokens, endpoint_key)
+        return time.perf_counter() - started
+
+    chain = min(timeit.repeat(run_chain, number=1, repeat=args.iterations))
+    compiled = min(run_rules() for _ in range(args.iterations))
+    print(f"Providers:   {', '.join(provider_key for provider_key, _, _ in cases)}")
+    print(f"Checked:     {checked} (provider, endpoint, query) cases")
+    print(f"if/elif:     {chain / checked * 1e6:.2f} us per case")
+    print(f"param_rules: {compiled / checked * 1e6:.2f} us per case")
+    print(f"Mismatches:  {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
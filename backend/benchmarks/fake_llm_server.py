@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI-compatible chat completions server for the tiered interpreter
+
+Answers POST .../chat/completions with a deterministic interpretation after a
+configurable delay, so the LLM tier can be exercised and benchmarked offline.
+GET /stats returns the number of completions served.
+
+Usage: python benchmarks/fake_llm_server.py [--port 8090] [--latency-ms 300] [--fail-rate 0]
+Then:  LLM_INTERPRETER_ENABLED=true LLM_BASE_URL=http://127.0.0.1:8090/v1 python app.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METHOD_WORDS = [
+    (('create', 'add', 'new', 'post'), 'POST'),
+    (('update', 'edit', 'change'), 'PUT'),
+    (('delete', 'remove'), 'DELETE')
+]
+STOP_WORDS = {'a', 'an', 'the', 'me', 'my', 'all', 'of', 'for', 'to', 'in', 'on', 'with', 'please',
+              'show', 'get', 'list', 'find', 'what', 'are', 'is', 'some', 'latest', 'recent'}
+
+
+def fake_interpretation(request):
+    """A plausible, deterministic interpretation of the request the interpreter sent"""
+    query = request.get('query', '').lower()
+    words = re.findall(r'[a-z]+', query)
+    method = next((method for keywords, method in METHOD_WORDS if any(word in words for word in keywords)), 'GET')
+    endpoints = request.get('endpoints') or {}
+    endpoint = next((path for key, path in endpoints.items() if any(word.startswith(key[:4]) for word in words)), None)
+    if endpoint is None:
+        nouns = [word for word in words if word not in STOP_WORDS and len(word) > 2]
+        endpoint = '/' + (nouns[-1] if nouns else '')
+    numbers = re.findall(r'\b\d+\b', query)
+    params = {'limit': int(numbers[0])} if numbers else {}
+    return {'endpoint': endpoint, 'method': method, 'params': params}
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/stats'):
+            self._reply(200, {'completions': self.server.completions, 'failures': self.server.failures})
+        else:
+            self._reply(404, {'error': 'not found'})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._reply(404, {'error': 'not found'})
+            return
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            if self.server.rng.random() < self.server.fail_rate:
+                self.server.failures += 1
+                fail = True
+            else:
+                self.server.completions += 1
+                fail = False
+        if fail:
+            self._reply(503, {'error': {'message': 'overloaded'}})
+            return
+        request = json.loads(body['messages'][-1]['content'])
+        self._reply(200, {
+            'id': f'chatcmpl-fake-{self.server.completions}',
+            'object': 'chat.completion',
+            'model': body.get('model'),
+            'choices': [{
+                'index': 0,
+                'finish_reason': 'stop',
+                'message': {'role': 'assistant', 'content': json.dumps(fake_interpretation(request))}
+            }]
+        })
+
+
+def start_server(port=0, latency=0.0, fail_rate=0.0, seed=1):
+    """Serve in a background thread; returns the server (server.server_port, server.shutdown())"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), FakeLLMHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fail_rate = fail_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.completions = 0
+    server.failures = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    server = start_server(args.port, args.latency_ms / 1000, args.fail_rate)
+    print(f'Fake LLM server on http://127.0.0.1:{server.server_port}/v1 (Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Load test: /api/query throughput in sync (wsgi.py) and async (asgi.py) modes
+
+Starts a local stub upstream that answers after a fixed delay, boots the
+backend under gunicorn in each mode against a throwaway SQLite database and
+fires concurrent queries at it.
+
+Usage: python benchmarks/load_test_query_modes.py [--requests N] [--concurrency N]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'sync': ['wsgi:app'],
+    'async': ['--worker-class', 'uvicorn.workers.UvicornWorker', 'asgi:app'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_upstream(delay):
+    """Serve a small JSON body after `delay` seconds on every path"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps({'path': self.path, 'items': list(range(20))}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_POST = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url + '/', timeout=1).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'Backend at {base_url} did not start')
+
+
+def run_mode(mode, args, upstream_url):
+    db_path = tempfile.mktemp(suffix='.db', prefix=f'loadtest_{mode}_')
+    env = dict(os.environ, FLASK_ENV='production', DATABASE_URL=f'sqlite:///{db_path}')
+
+    # Initialise the schema once so workers do not race on create_all
+    subprocess.run([sys.executable, '-c', 'import app'], cwd=BACKEND_DIR, env=env,
+                   check=True, stdout=subprocess.DEVNULL)
+
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    command = [
+        sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(args.workers), '--timeout', '120', '--log-level', 'warning'
+    ] + MODES[mode]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+    try:
+        wait_until_ready(base_url)
+        connection_id = requests.post(base_url + '/api/connections', json={
+            'name': 'Load test stub',
+            'base_url': upstream_url,
+            'auth_type': 'bearer',
+            'auth_data': {'token': 'load-test'}
+        }).json()['id']
+
+        session = requests.Session()
+        session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+
+        def fire(_):
+            started = time.perf_counter()
+            try:
+                response = session.post(base_url + '/api/query', json={
+                    'query': 'list users',
+                    'connection_id': connection_id
+                }, timeout=300)
+                ok = response.status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            return ok, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(fire, range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+    latencies = sorted(latency for _, latency in results)
+    return {
+        'mode': mode,
+        'throughput': len(results) / elapsed,
+        'errors': sum(1 for ok, _ in results if not ok),
+        'p50_ms': latencies[len(latencies) // 2] * 1e3,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--upstream-delay', type=float, default=0.2,
+                        help='seconds the stub upstream waits before answering')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    upstream = start_stub_upstream(args.upstream_delay)
+    upstream_url = f'http://127.0.0.1:{upstream.server_address[1]}'
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, "
+          f"{args.workers} workers, upstream delay {args.upstream_delay * 1e3:.0f} ms")
+    for mode in args.modes:
+        result = run_mode(mode, args, upstream_url)
+        print(f"{result['mode']:>6}: {result['throughput']:8.1f} req/s  "
+              f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+              f"errors {result['errors']}")
+
+    upstream.shutdown()
+
+
+if __name__ == '__main__':
+    main()
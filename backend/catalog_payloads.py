@@ -0,0 +1,137 @@
+"""
+Precomputed Catalog Payloads
+The provider list and category map serialized once per catalog version, and
+per-provider details on first request, with gzip (and brotli, when installed)
+copies and strong ETags, so catalog endpoints only pick bytes and compare
+validators.
+"""
+
+import gzip
+import hashlib
+import threading
+
+from api_providers import get_all_providers, get_catalog_version, get_provider_categories, get_provider_summaries
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+MIN_COMPRESS_BYTES = 256
+
+
+def provider_list(providers):
+    """Body of /api/providers"""
+    return [{
+        'key': key,
+        'name': config['name'],
+        'base_url': config['base_url'],
+        'auth_type': config['auth_type'],
+        'description': config['description'],
+        'example_queries': config.get('example_queries', [])
+    } for key, config in providers.items()]
+
+
+def category_map(providers, categories):
+    """Body of /api/providers/categories"""
+    return {
+        category: [{
+            'key': key,
+            'name': providers[key]['name'],
+            'description': providers[key]['description'],
+            'base_url': providers[key]['base_url'],
+            'auth_type': providers[key]['auth_type']
+        } for key in provider_keys if key in providers]
+        for category, provider_keys in categories.items()
+    }
+
+
+class Payload:
+    """One serialized response body and its encoded variants"""
+
+    __slots__ = ('bodies', 'etags', 'digest')
+
+    def __init__(self, body):
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.bodies = {'identity': body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.bodies['gzip'] = gzip.compress(body, GZIP_LEVEL, mtime=0)
+            if brotli is not None:
+                self.bodies['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+        # Strong validators must differ between encodings of the same content
+        self.etags = {
+            encoding: self.digest if encoding == 'identity' else f'{self.digest}-{encoding}'
+            for encoding in self.bodies
+        }
+
+    def select(self, accept_encodings):
+        """Pick the smallest variant the client accepts; returns (encoding, body, etag)"""
+        best = 'identity'
+        for encoding in ('br', 'gzip'):
+            if encoding in self.bodies and accept_encodings[encoding]:
+                best = encoding
+                break
+        return best, self.bodies[best], self.etags[best]
+
+    def matches(self, if_none_match):
+        """True when the client already holds any encoding of this content"""
+        # Weak comparison, as If-None-Match requires (proxies may weaken validators they re-encode)
+        return any(if_none_match.contains_weak(etag) for etag in self.etags.values())
+
+
+class CatalogPayloads:
+    """Every catalog response for one catalog version"""
+
+    def __init__(self, providers, summaries, categories, dumps):
+        self.providers_list = Payload(self._encode(dumps, provider_list(summaries)))
+        self.categories = Payload(self._encode(dumps, category_map(summaries, categories)))
+        self.provider_details = {}
+        self._providers = providers
+        self._dumps = dumps
+
+    def provider_detail(self, provider_key):
+        """Payload of one provider's details, serialized on first request; None when unknown"""
+        payload = self.provider_details.get(provider_key)
+        if payload is None:
+            provider_config = self._providers.get(provider_key)
+            if provider_config is None:
+                return None
+            payload = self.provider_details.setdefault(
+                provider_key, Payload(self._encode(self._dumps, {'key': provider_key, **provider_config}))
+            )
+        return payload
+
+    @staticmethod
+    def _encode(dumps, obj):
+        # Match jsonify, which terminates bodies with a newline
+        return (dumps(obj) + '\n').encode('utf-8')
+
+    def stats(self):
+        payloads = [self.providers_list, self.categories, *self.provider_details.values()]
+        return {
+            'payloads': len(payloads),
+            'identity_bytes': sum(len(payload.bodies['identity']) for payload in payloads),
+            'gzip_bytes': sum(len(payload.bodies.get('gzip', payload.bodies['identity'])) for payload in payloads),
+            'brotli': brotli is not None
+        }
+
+
+_payloads = None
+_payloads_version = None
+_payloads_lock = threading.Lock()
+
+
+def get_catalog_payloads(dumps):
+    """Return the shared payloads, re-serializing them when the catalog version changes"""
+    global _payloads, _payloads_version
+    version = get_catalog_version()
+    if _payloads is None or _payloads_version != version:
+        with _payloads_lock:
+            if _payloads is None or _payloads_version != version:
+                _payloads = CatalogPayloads(
+                    get_all_providers(), get_provider_summaries(), get_provider_categories(), dumps
+                )
+                _payloads_version = version
+    return _payloads
@@ -7,6 +7,101 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Outbound HTTP connection pooling (per upstream host, per worker)
+    HTTP_POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 10))
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 10))
+    HTTP_POOL_BLOCK = os.environ.get('HTTP_POOL_BLOCK', 'false').lower() == 'true'
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', 30))
+    HTTP_KEEPALIVE = os.environ.get('HTTP_KEEPALIVE', 'true').lower() == 'true'
+    
+    # Async query execution (asgi.py)
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.environ.get('ASYNC_HTTP_MAX_CONNECTIONS', 500))
+    ASYNC_HTTP_MAX_KEEPALIVE = int(os.environ.get('ASYNC_HTTP_MAX_KEEPALIVE', 100))
+    
+    # Upstream response cache ('memory' per worker, or 'redis' shared between workers)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 60))
+    
+    # Client-side upstream rate limiting ('memory' per worker or 'redis' shared)
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_REDIS_URL = os.environ.get('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+    RATE_LIMIT_MAX_WAIT = float(os.environ.get('RATE_LIMIT_MAX_WAIT', 10))
+    
+    # Upstream retries (count and timeout come from the 'api' settings), hedging and circuit breaking
+    RETRY_BACKOFF_BASE = float(os.environ.get('RETRY_BACKOFF_BASE', 0.2))
+    RETRY_BACKOFF_CAP = float(os.environ.get('RETRY_BACKOFF_CAP', 5))
+    HEDGE_DELAY = float(os.environ.get('HEDGE_DELAY', 0))  # seconds before a duplicate GET is sent; 0 disables
+    CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CIRCUIT_FAILURE_THRESHOLD', 5))  # 0 disables
+    CIRCUIT_RESET_TIMEOUT = float(os.environ.get('CIRCUIT_RESET_TIMEOUT', 30))
+    
+    # Identical concurrent GETs to the same connection share one upstream call
+    COALESCE_REQUESTS = os.environ.get('COALESCE_REQUESTS', 'true').lower() == 'true'
+    
+    # Memoized query interpretations per worker (0 disables)
+    INTERPRETATION_CACHE_SIZE = int(os.environ.get('INTERPRETATION_CACHE_SIZE', 2048))
+    
+    # Tiered interpretation: queries the rules are less confident about than the threshold
+    # are sent to an OpenAI-compatible model ('openai', or a 'module:Class' backend), and the
+    # answers kept in a per-worker semantic cache (cosine similarity of hashed features)
+    LLM_INTERPRETER_ENABLED = os.environ.get('LLM_INTERPRETER_ENABLED', 'false').lower() == 'true'
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'openai')
+    LLM_BASE_URL = os.environ.get('LLM_BASE_URL', 'https://api.openai.com/v1')
+    LLM_API_KEY = os.environ.get('LLM_API_KEY') or os.environ.get('OPENAI_API_KEY')
+    LLM_MODEL = os.environ.get('LLM_MODEL', 'gpt-4o-mini')
+    LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', 10))
+    LLM_CONFIDENCE_THRESHOLD = float(os.environ.get('LLM_CONFIDENCE_THRESHOLD', 0.5))
+    LLM_CACHE_SIZE = int(os.environ.get('LLM_CACHE_SIZE', 4096))
+    LLM_CACHE_SIMILARITY = float(os.environ.get('LLM_CACHE_SIMILARITY', 0.9))  # 1 disables near matches
+    
+    # Compiled per-connection request templates per worker
+    REQUEST_TEMPLATE_CACHE_SIZE = int(os.environ.get('REQUEST_TEMPLATE_CACHE_SIZE', 1024))
+    
+    # Provider catalog data files (JSON/YAML, merged in name order), their compiled snapshot
+    # (default: a file in the system temp dir) and how often edits are checked for (0 disables)
+    PROVIDERS_DIR = os.environ.get('PROVIDERS_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'providers')
+    PROVIDER_SNAPSHOT_PATH = os.environ.get('PROVIDER_SNAPSHOT_PATH') or None
+    PROVIDER_RELOAD_INTERVAL = float(os.environ.get('PROVIDER_RELOAD_INTERVAL', 2))
+    
+    # Browser/CDN cache lifetime of catalog responses (revalidated by ETag afterwards)
+    CATALOG_CACHE_MAX_AGE = int(os.environ.get('CATALOG_CACHE_MAX_AGE', 86400))
+    
+    # POST /api/query/batch limits
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 50))
+    BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', 8))
+    
+    # Streaming passthrough for /api/query with {"stream": true}
+    STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 64 * 1024))
+    STREAM_PREVIEW_BYTES = int(os.environ.get('STREAM_PREVIEW_BYTES', 4096))
+    
+    # Query history response bodies ('zstd' needs the zstandard package; falls back to 'zlib')
+    RESPONSE_STORE_ENCODING = os.environ.get('RESPONSE_STORE_ENCODING', 'zlib')
+    RESPONSE_STORE_LEVEL = int(os.environ.get('RESPONSE_STORE_LEVEL', 6))
+    RESPONSE_STORE_MAX_BYTES = int(os.environ.get('RESPONSE_STORE_MAX_BYTES', 1024 * 1024))
+    
+    # Write-behind query history (batched background inserts)
+    HISTORY_WRITE_BEHIND = os.environ.get('HISTORY_WRITE_BEHIND', 'true').lower() == 'true'
+    HISTORY_QUEUE_SIZE = int(os.environ.get('HISTORY_QUEUE_SIZE', 10000))
+    HISTORY_BATCH_SIZE = int(os.environ.get('HISTORY_BATCH_SIZE', 200))
+    HISTORY_FLUSH_INTERVAL = float(os.environ.get('HISTORY_FLUSH_INTERVAL', 0.5))
+    HISTORY_ENQUEUE_TIMEOUT = float(os.environ.get('HISTORY_ENQUEUE_TIMEOUT', 1.0))
+    
+    # Connection testing (candidate endpoints are probed concurrently)
+    TEST_CONNECTION_DEADLINE = float(os.environ.get('TEST_CONNECTION_DEADLINE', 15))
+    TEST_CONNECTION_PROBE_TIMEOUT = float(os.environ.get('TEST_CONNECTION_PROBE_TIMEOUT', 10))
+    TEST_CONNECTION_PRECHECK_TIMEOUT = float(os.environ.get('TEST_CONNECTION_PRECHECK_TIMEOUT', 3))
+    
+    # Background connection health checks
+    HEALTH_MONITOR_ENABLED = os.environ.get('HEALTH_MONITOR_ENABLED', 'true').lower() == 'true'
+    HEALTH_CHECK_INTERVAL = float(os.environ.get('HEALTH_CHECK_INTERVAL', 300))
+    HEALTH_CHECK_JITTER = float(os.environ.get('HEALTH_CHECK_JITTER', 0.2))
+    HEALTH_CHECK_CONCURRENCY = int(os.environ.get('HEALTH_CHECK_CONCURRENCY', 4))
+    HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 10))
+    HEALTH_MONITOR_LOCK_FILE = os.environ.get('HEALTH_MONITOR_LOCK_FILE')
+    
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///api_connector.db'
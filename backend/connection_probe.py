@@ -0,0 +1,293 @@
+"""
+Connection Probing
+Reachability pre-check and concurrent endpoint probing for /api/test-connection.
+Known providers are verified with the single probe request from their catalog
+entry; other hosts have candidate endpoints probed in parallel under one
+overall deadline, and the path that worked is remembered for next time.
+"""
+
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+from urllib.request import getproxies
+
+import requests
+
+from api_providers import get_catalog_version, get_provider_summaries
+
+# Status codes that settle a connection test one way or the other
+SUCCESS_STATUSES = (200, 201, 202)
+AUTH_FAILURE_STATUSES = (401, 403)
+
+# Candidate endpoints for hosts without a catalog probe
+GENERIC_ENDPOINTS = ['/', '/api', '/v1', '/health', '/status', '/ping']
+TEMPLATE_SEGMENT = re.compile(r'^\{[^}]+\}$')
+PROBE_MEMORY_SIZE = 1024
+
+
+class ProbeResult:
+    """Outcome of probing a single candidate endpoint"""
+
+    def __init__(self, endpoint, status_code=None, response_size=None, error=None, success=False):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.response_size = response_size
+        self.error = error
+        self.success = success
+
+    @property
+    def decisive(self):
+        return self.success or self.status_code in AUTH_FAILURE_STATUSES
+
+
+def precheck(base_url, timeout=3):
+    """
+    Resolve the host and open a TCP connection to it.
+    Returns an error message, or None when the host is reachable (or behind a proxy).
+    """
+    parts = urlsplit(base_url)
+    host = parts.hostname
+    if not host:
+        return f'Invalid base URL: {base_url}'
+    # A proxy makes the direct connection irrelevant; let the probes go through it
+    if parts.scheme in getproxies():
+        return None
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+
+    try:
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        return f'Could not resolve host {host}'
+
+    last_error = None
+    deadline = time.monotonic() + timeout
+    for family, socktype, proto, _, address in addresses:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            with socket.socket(family, socktype, proto) as sock:
+                sock.settimeout(remaining)
+                sock.connect(address)
+            return None
+        except OSError as e:
+            last_error = e
+    if isinstance(last_error, socket.timeout) or last_error is None:
+        return f'Timeout connecting to {host}:{port}'
+    return f'Could not connect to {host}:{port}'
+
+
+def _probe(http_client, base_url, endpoint, headers, timeout, abandoned, success_statuses):
+    try:
+        response = http_client.get(base_url + endpoint, headers=headers, timeout=timeout, stream=True)
+    except requests.exceptions.Timeout:
+        return ProbeResult(endpoint, error=f'Timeout connecting to {endpoint}')
+    except requests.exceptions.ConnectionError:
+        return ProbeResult(endpoint, error=f'Connection error to {endpoint}')
+    except requests.exceptions.RequestException as e:
+        return ProbeResult(endpoint, error=f'Request error to {endpoint}: {str(e)}')
+
+    with response:
+        # Another probe already won; skip reading the body
+        if abandoned.is_set():
+            return ProbeResult(endpoint, status_code=response.status_code)
+        try:
+            if response.status_code in success_statuses:
+                return ProbeResult(endpoint, response.status_code, len(response.content), success=True)
+            if response.status_code == 404:
+                return ProbeResult(endpoint, response.status_code,
+                                   error=f'Endpoint {endpoint} not found (404)')
+            if response.status_code in AUTH_FAILURE_STATUSES:
+                return ProbeResult(endpoint, response.status_code)
+            return ProbeResult(endpoint, response.status_code,
+                               error=f'HTTP {response.status_code}: {response.text[:200]}')
+        except requests.exceptions.RequestException as e:
+            return ProbeResult(endpoint, error=f'Request error to {endpoint}: {str(e)}')
+
+
+def probe_endpoints(http_client, base_url, endpoints, headers, deadline=15, probe_timeout=10,
+                    success_statuses=SUCCESS_STATUSES):
+    """
+    Probe every endpoint concurrently and return (winner, results).
+    winner is the first decisive result in priority order, or None; results
+    holds whatever completed before the deadline, in priority order.
+    """
+    expires_at = time.monotonic() + deadline
+    timeout = min(probe_timeout, deadline)
+    abandoned = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(endpoints), thread_name_prefix='probe')
+    futures = [
+        executor.submit(_probe, http_client, base_url, endpoint, headers, timeout, abandoned, success_statuses)
+        for endpoint in endpoints
+    ]
+
+    def settled():
+        # Walk in priority order; stop at the first probe still in flight
+        for future in futures:
+            if not future.done():
+                return None, False
+            if future.result().decisive:
+                return future.result(), True
+        return None, True
+
+    try:
+        pending = set(futures)
+        winner, finished = settled()
+        while not finished and pending:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            winner, finished = settled()
+
+        if not finished:
+            # Deadline hit with higher-priority probes outstanding; take the best answer we have
+            winner = next((future.result() for future in futures
+                           if future.done() and future.result().decisive), None)
+        return winner, [future.result() for future in futures if future.done()]
+    finally:
+        abandoned.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProbeTable:
+    """Per-provider probe requests compiled from the catalog's "probe" entries"""
+
+    def __init__(self, providers):
+        # providers may be summaries: only base_url and probe are read
+        self.probes = {}
+        for provider_key, provider_config in providers.items():
+            probe = provider_config.get('probe')
+            if probe:
+                base_path = urlsplit(provider_config['base_url']).path
+                self.probes[provider_key] = (
+                    [segment for segment in base_path.split('/') if segment],
+                    probe['path'],
+                    tuple(probe.get('expect', SUCCESS_STATUSES))
+                )
+
+    def plan(self, provider_key, base_url):
+        """
+        Return (endpoint, success_statuses) for a provider's probe, or None.
+        The endpoint is relative to the connection's base URL, so catalog path
+        segments the user left out (e.g. a /v1 prefix) are filled back in.
+        """
+        if provider_key not in self.probes:
+            return None
+        catalog_segments, probe_path, expect = self.probes[provider_key]
+        user_segments = [segment for segment in urlsplit(base_url).path.split('/') if segment]
+
+        if len(user_segments) < len(catalog_segments):
+            matches = all(
+                TEMPLATE_SEGMENT.match(expected) or expected == actual
+                for expected, actual in zip(catalog_segments, user_segments)
+            )
+            missing = catalog_segments[len(user_segments):]
+            if matches and not any(TEMPLATE_SEGMENT.match(segment) for segment in missing):
+                return '/' + '/'.join(missing) + probe_path, expect
+        return probe_path, expect
+
+
+_table = None
+_table_version = None
+_table_lock = threading.Lock()
+
+
+def get_probe_table():
+    """Return the shared probe table, rebuilding it when the catalog version changes"""
+    global _table, _table_version
+    version = get_catalog_version()
+    if _table is None or _table_version != version:
+        with _table_lock:
+            if _table is None or _table_version != version:
+                _table = ProbeTable(get_provider_summaries())
+                _table_version = version
+    return _table
+
+
+class ProbeMemory:
+    """Remembers which candidate endpoint last answered for each unknown base URL"""
+
+    def __init__(self, max_entries=PROBE_MEMORY_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url):
+        parts = urlsplit(base_url)
+        return f"{parts.scheme}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+    def get(self, base_url):
+        with self._lock:
+            endpoint = self._entries.get(self._key(base_url))
+            if endpoint is not None:
+                self._entries.move_to_end(self._key(base_url))
+            return endpoint
+
+    def remember(self, base_url, endpoint):
+        with self._lock:
+            self._entries[self._key(base_url)] = endpoint
+            self._entries.move_to_end(self._key(base_url))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, base_url):
+        with self._lock:
+            self._entries.pop(self._key(base_url), None)
+
+
+probe_memory = ProbeMemory()
+
+
+def plan_probes(provider_key, base_url):
+    """
+    Choose what to probe for a connection test.
+    Returns (endpoints, success_statuses, source) where source is 'catalog',
+    'memory' or 'generic'.
+    """
+    plan = get_probe_table().plan(provider_key, base_url)
+    if plan is not None:
+        endpoint, expect = plan
+        return [endpoint], expect, 'catalog'
+    remembered = probe_memory.get(base_url)
+    if remembered is not None:
+        return [remembered], SUCCESS_STATUSES, 'memory'
+    return list(GENERIC_ENDPOINTS), SUCCESS_STATUSES, 'generic'
+
+
+def run_connection_test(http_client, base_url, headers, provider_key, deadline=15, probe_timeout=10,
+                        precheck_timeout=3):
+    """
+    Pre-check the host, then probe it as planned for its provider.
+    Returns (winner, results, tested_endpoints, unreachable_error).
+    """
+    test_endpoints, success_statuses, probe_source = plan_probes(provider_key, base_url)
+
+    # Fail fast when the host cannot be resolved or reached at all
+    unreachable = precheck(base_url, precheck_timeout)
+    if unreachable:
+        return None, [], [], unreachable
+
+    started = time.monotonic()
+    winner, results = probe_endpoints(
+        http_client, base_url, test_endpoints, headers, deadline=deadline,
+        probe_timeout=probe_timeout, success_statuses=success_statuses
+    )
+    remaining = deadline - (time.monotonic() - started)
+    if probe_source == 'memory' and winner is None and remaining > 0:
+        # The remembered path stopped answering; fall back to the full candidate list
+        probe_memory.forget(base_url)
+        probe_source = 'generic'
+        test_endpoints = list(GENERIC_ENDPOINTS)
+        winner, results = probe_endpoints(
+            http_client, base_url, test_endpoints, headers, deadline=remaining, probe_timeout=probe_timeout
+        )
+
+    if winner is not None and probe_source != 'catalog':
+        probe_memory.remember(base_url, winner.endpoint)
+    return winner, results, test_endpoints, None
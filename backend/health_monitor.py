@@ -0,0 +1,187 @@
+"""
+Connection Health Monitor
+Background thread that periodically probes every active connection with
+jittered scheduling and bounded concurrency. Results are handed to a store
+callback so any worker can serve them without calling upstream APIs.
+Only one process per host runs checks; the others stand by on a file lock.
+"""
+
+import heapq
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; every process checks
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# How often the set of active connections is re-read
+REFRESH_INTERVAL = 30
+
+
+class HealthMonitor:
+    """Schedules health checks for a changing set of connections"""
+
+    def __init__(self, list_fn, check_fn, store_fn, interval=300, jitter=0.2, max_workers=4,
+                 lock_path=None):
+        self.list_fn = list_fn
+        self.check_fn = check_fn
+        self.store_fn = store_fn
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), 'apiflexy-health.lock')
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock_file = None
+        self._in_flight = set()
+        self.leader = False
+        self.checks = 0
+        self.failures = 0
+
+    @classmethod
+    def from_config(cls, list_fn, check_fn, store_fn, config):
+        """Build a monitor from Flask config values"""
+        return cls(
+            list_fn, check_fn, store_fn,
+            interval=config.get('HEALTH_CHECK_INTERVAL', 300),
+            jitter=config.get('HEALTH_CHECK_JITTER', 0.2),
+            max_workers=config.get('HEALTH_CHECK_CONCURRENCY', 4),
+            lock_path=config.get('HEALTH_MONITOR_LOCK_FILE')
+        )
+
+    def ensure_started(self):
+        """Start the scheduler thread in this process if it is not running"""
+        # Threads do not survive a fork, so each worker process starts its own
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                self._pid = os.getpid()
+                self._stop = threading.Event()
+                self._in_flight = set()
+                self.leader = False
+                self._lock_file = None
+                self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop scheduling new checks and release leadership"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._release()
+
+    def _acquire(self):
+        """Try to become the checking process for this host"""
+        if fcntl is None:
+            return True
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.leader = False
+
+    def _next_due(self, now):
+        spread = self.interval * self.jitter
+        return now + self.interval + random.uniform(-spread, spread)
+
+    def _run(self):
+        # Stand by until the leader process exits and releases the lock
+        while not self._stop.is_set():
+            self.leader = self._acquire()
+            if self.leader:
+                break
+            self._stop.wait(self.interval)
+        if not self.leader:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='health-check')
+        schedule = []
+        due_at = {}  # connection id -> its live entry in schedule
+        next_refresh = 0
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now >= next_refresh:
+                    self._refresh(schedule, due_at, now)
+                    next_refresh = now + min(self.interval, REFRESH_INTERVAL)
+
+                while schedule and schedule[0][0] <= now:
+                    due, connection_id = heapq.heappop(schedule)
+                    if due_at.get(connection_id) != due:
+                        continue  # removed or rescheduled since this entry was pushed
+                    if connection_id not in self._in_flight and len(self._in_flight) >= self.max_workers:
+                        # Bounded concurrency: retry shortly once a slot frees up
+                        self._schedule(schedule, due_at, connection_id, now + 1)
+                        break
+                    self._schedule(schedule, due_at, connection_id, self._next_due(now))
+                    # A check that is still running is never doubled up
+                    if connection_id not in self._in_flight:
+                        self._in_flight.add(connection_id)
+                        executor.submit(self._check, connection_id)
+
+                wait = schedule[0][0] - time.monotonic() if schedule else self.interval
+                self._stop.wait(min(max(wait, 0.1), next_refresh - time.monotonic()))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self, schedule, due_at, connection_id, due):
+        due_at[connection_id] = due
+        heapq.heappush(schedule, (due, connection_id))
+
+    def _refresh(self, schedule, due_at, now):
+        """Pick up added and removed connections; new ones get a jittered first slot"""
+        try:
+            current = set(self.list_fn())
+        except Exception:
+            logger.exception('Failed to list connections for health checks')
+            return
+        for connection_id in set(due_at) - current:
+            del due_at[connection_id]
+        for connection_id in current - set(due_at):
+            self._schedule(schedule, due_at, connection_id, now + random.uniform(0, self.interval * self.jitter))
+
+    def _check(self, connection_id):
+        try:
+            result = self.check_fn(connection_id)
+            if result is None:
+                # Connection removed since it was scheduled; the next refresh drops it
+                return
+            self.store_fn(connection_id, result)
+            self.checks += 1
+        except Exception:
+            self.failures += 1
+            logger.exception('Health check failed for connection %s', connection_id)
+        finally:
+            self._in_flight.discard(connection_id)
+
+    def stats(self):
+        """Scheduler counters for this worker process"""
+        return {
+            'leader': self.leader,
+            'interval': self.interval,
+            'in_flight': len(self._in_flight),
+            'checks': self.checks,
+            'failures': self.failures
+        }
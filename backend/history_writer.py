@@ -0,0 +1,169 @@
+"""
+Write-Behind History Writer
+Request handlers enqueue query history records; a background thread writes
+them in batched transactions so requests never wait on the database lock.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class HistoryWriter:
+    """Bounded queue of history records flushed by a background thread"""
+
+    def __init__(self, flush_fn, max_queue=10000, batch_size=200, flush_interval=0.5, put_timeout=1.0):
+        self.flush_fn = flush_fn
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self.enqueued = 0
+        self.written = 0
+        self.failed = 0
+        self.retried_batches = 0
+        self.batches = 0
+        self.sync_writes = 0
+
+    @classmethod
+    def from_config(cls, flush_fn, config):
+        """Build a writer from Flask config values"""
+        return cls(
+            flush_fn,
+            max_queue=config.get('HISTORY_QUEUE_SIZE', 10000),
+            batch_size=config.get('HISTORY_BATCH_SIZE', 200),
+            flush_interval=config.get('HISTORY_FLUSH_INTERVAL', 0.5),
+            put_timeout=config.get('HISTORY_ENQUEUE_TIMEOUT', 1.0)
+        )
+
+    def _ensure_started(self):
+        # Threads do not survive a fork, so each worker process starts its own
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                self._pid = os.getpid()
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, record):
+        """
+        Enqueue a record for writing. When the queue stays full for put_timeout
+        seconds the caller writes the record itself (back-pressure, never loss).
+        """
+        self._ensure_started()
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+            self.enqueued += 1
+        except queue.Full:
+            self.sync_writes += 1
+            self._write([record])
+
+    def submit_many(self, records):
+        for record in records:
+            self.submit(record)
+
+    def _write(self, batch):
+        """
+        Write a batch, retrying it once; if the retry fails too each record is
+        written on its own, so a bad record only loses itself
+        """
+        try:
+            self.flush_fn(batch)
+            self.written += len(batch)
+            return
+        except Exception:
+            logger.warning('Failed to write %d query history records, retrying', len(batch), exc_info=True)
+
+        self.retried_batches += 1
+        try:
+            self.flush_fn(batch)
+            self.written += len(batch)
+            return
+        except Exception:
+            if len(batch) == 1:
+                self._drop(batch[0])
+                return
+            logger.warning('Retry of %d query history records failed, writing them one by one', len(batch))
+
+        for record in batch:
+            try:
+                self.flush_fn([record])
+                self.written += 1
+            except Exception:
+                self._drop(record)
+
+    def _drop(self, record):
+        """Count and log a record that could not be written (call from an except block)"""
+        self.failed += 1
+        record_id = record.get('public_id') if isinstance(record, dict) else None
+        logger.exception('Dropped query history record %s', record_id or repr(record)[:200])
+
+    def _run(self):
+        pending_queue = self._queue
+        while True:
+            record = pending_queue.get()
+            if record is _STOP:
+                pending_queue.task_done()
+                return
+
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    record = pending_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stop = True
+                    break
+                batch.append(record)
+
+            self._write(batch)
+            self.batches += 1
+            for _ in range(len(batch) + (1 if stop else 0)):
+                pending_queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Block until every record enqueued so far has been written"""
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def stop(self, timeout=10):
+        """Flush outstanding records and stop the writer thread"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self):
+        """Queue depth and throughput counters for this worker process"""
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'max_queue': self.max_queue,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'failed': self.failed,
+            'retried_batches': self.retried_batches,
+            'batches': self.batches,
+            'sync_writes': self.sync_writes
+        }
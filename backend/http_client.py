@@ -0,0 +1,138 @@
+"""
+Pooled HTTP Client
+Keeps one keep-alive requests.Session per upstream host so outbound API calls
+reuse TCP/TLS connections instead of opening a new one per query
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPClientPool:
+    """Per-host pool of requests sessions, safe to share between threads"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False,
+                 connect_timeout=5, read_timeout=30, keepalive=True):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.default_timeout = (connect_timeout, read_timeout)
+        self.keepalive = keepalive
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a pool from Flask config values"""
+        return cls(
+            pool_connections=config.get('HTTP_POOL_CONNECTIONS', 10),
+            pool_maxsize=config.get('HTTP_POOL_MAXSIZE', 10),
+            pool_block=config.get('HTTP_POOL_BLOCK', False),
+            connect_timeout=config.get('HTTP_CONNECT_TIMEOUT', 5),
+            read_timeout=config.get('HTTP_READ_TIMEOUT', 30),
+            keepalive=config.get('HTTP_KEEPALIVE', True)
+        )
+
+    def _reset(self):
+        # Sessions must never be shared across a fork (gunicorn preload)
+        self._pid = os.getpid()
+        self._sessions = {}
+        self._session_hits = 0
+        self._session_misses = 0
+        self._requests_sent = 0
+
+    def _new_session(self):
+        session = requests.Session()
+        # Upstream cookies must not leak between connections sharing a host
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keepalive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def session_for(self, url):
+        """Get the shared session for the URL's scheme and host"""
+        parts = urlsplit(url)
+        host_key = f'{parts.scheme}://{parts.netloc}'.lower()
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = self._new_session()
+                self._sessions[host_key] = session
+                self._session_misses += 1
+            else:
+                self._session_hits += 1
+            self._requests_sent += 1
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the pooled session for its host"""
+        kwargs.setdefault('timeout', self.default_timeout)
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """Session and connection reuse counters for this worker process"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            result = {
+                'pid': self._pid,
+                'hosts': len(sessions),
+                'session_hits': self._session_hits,
+                'session_misses': self._session_misses,
+                'requests_sent': self._requests_sent
+            }
+
+        connections_opened = self._connections_opened(sessions)
+        if connections_opened is not None:
+            result['connections_opened'] = connections_opened
+            # A request that did not open a new connection reused a pooled one
+            result['connection_hits'] = max(self._requests_sent - connections_opened, 0)
+            result['connection_misses'] = connections_opened
+        return result
+
+    @staticmethod
+    def _connections_opened(sessions):
+        """Connections urllib3 opened for these sessions, or None if its pools cannot be read"""
+        connections_opened = 0
+        try:
+            for session in sessions:
+                for adapter in set(session.adapters.values()):
+                    pools = adapter.poolmanager.pools
+                    for pool_key in list(pools.keys()):
+                        try:
+                            connections_opened += pools[pool_key].num_connections
+                        except KeyError:
+                            # Evicted from the pool manager since keys() was read
+                            continue
+        except (AttributeError, TypeError):
+            return None
+        return connections_opened
+
+    def close(self):
+        """Close every pooled session"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._reset()
+        for session in sessions:
+            session.close()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Offline Query Interpretation
+Replays a query corpus (the QueryHistory table or a JSONL export) through
+AIQueryProcessor.interpret_query on a process pool, without calling any
+upstream API. Writes one JSONL interpretation per row and reports
+throughput, endpoint distribution and disagreement with the stored
+interpretations.
+
+Rows are streamed in chunks and only a bounded number of chunks is in flight,
+so memory stays flat whatever the corpus size.
+
+Usage:
+    python interpret_corpus.py --jsonl history.jsonl --output interpretations.jsonl
+    python interpret_corpus.py --database-url sqlite:////path/to/api_connector.db --limit 100000
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from config import config
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+TOP_ENDPOINTS = 20
+
+HISTORY_QUERY = """
+    SELECT query_history.id, query_history.user_query, query_history.interpreted_query,
+           api_connection.base_url
+    FROM query_history
+    JOIN api_connection ON api_connection.id = query_history.api_connection_id
+    ORDER BY query_history.id
+"""
+
+
+def database_url(url=None):
+    """The app's database URL, with relative SQLite paths resolved like Flask-SQLAlchemy does"""
+    url = make_url(url or config[os.environ.get('FLASK_ENV', 'production')].SQLALCHEMY_DATABASE_URI)
+    if url.drivername.startswith('sqlite') and url.database and url.database != ':memory:' \
+            and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(BACKEND_DIR, 'instance', url.database))
+    return url
+
+
+def rows_from_database(url, limit=None, batch_size=5000):
+    """Stream (id, query, base_url, stored interpretation JSON) rows from query_history"""
+    engine = create_engine(url)
+    sql = HISTORY_QUERY + (' LIMIT :limit' if limit else '')
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(
+                text(sql), {'limit': limit} if limit else {}
+            )
+            for row_id, user_query, interpreted_query, base_url in result:
+                yield row_id, user_query, base_url, interpreted_query
+    finally:
+        engine.dispose()
+
+
+def rows_from_jsonl(path, limit=None):
+    """Stream rows from a JSONL file with query (or user_query), base_url and optional id/interpreted_query"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line_number, line in enumerate(itertools.islice(stream, limit), 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            stored = row.get('interpreted_query')
+            if stored is not None and not isinstance(stored, str):
+                stored = json.dumps(stored)
+            yield row.get('id', line_number), row.get('query', row.get('user_query')), row['base_url'], stored
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Per-worker processor, created once by the pool initializer
+_processor = None
+
+
+def _init_worker(memo_size):
+    global _processor
+    from query_processor import AIQueryProcessor
+    _processor = AIQueryProcessor(memo_size=memo_size)
+
+
+def _compare(interpretation, stored, time_dependent):
+    """Fields of the stored interpretation that differ ('unparsable' when it is not JSON)"""
+    try:
+        stored = json.loads(stored)
+    except (TypeError, ValueError):
+        return ['unparsable']
+    if not isinstance(stored, dict):
+        return ['unparsable']
+    fields = ['endpoint', 'method'] if time_dependent else ['endpoint', 'method', 'params', 'filters']
+    return [field for field in fields if interpretation.get(field) != stored.get(field)]
+
+
+def interpret_chunk(chunk):
+    """Interpret a chunk of rows in a worker; returns (output records, per-row stats)"""
+    from query_processor import RELATIVE_DATE_WORDS
+    records = []
+    for row_id, user_query, base_url, stored in chunk:
+        record = {'id': row_id, 'query': user_query, 'base_url': base_url}
+        stats = {'endpoint': None, 'differs': None, 'error': False}
+        try:
+            interpretation = _processor.interpret_query(user_query or '', SimpleNamespace(base_url=base_url or ''))
+        except Exception as e:
+            record['error'] = f'{type(e).__name__}: {e}'
+            stats['error'] = True
+        else:
+            record['interpretation'] = interpretation
+            stats['endpoint'] = interpretation['endpoint']
+            if stored is not None:
+                # 'since' and similar values are stamped with the time of interpretation
+                time_dependent = any(word in (user_query or '').lower() for word in RELATIVE_DATE_WORDS)
+                stats['differs'] = record['differs'] = _compare(interpretation, stored, time_dependent)
+        records.append((json.dumps(record, separators=(',', ':')), stats))
+    return records
+
+
+def run_pool(chunks, workers, memo_size):
+    """Yield chunk results in input order, keeping at most 2 chunks per worker in flight"""
+    if workers <= 1:
+        _init_worker(memo_size)
+        for chunk in chunks:
+            yield interpret_chunk(chunk)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(memo_size,)) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.apply_async(interpret_chunk, (chunk,)))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+
+def summarize(counters, elapsed, workers):
+    rows = counters['rows']
+    compared = counters['compared']
+    return {
+        'rows': rows,
+        'errors': counters['errors'],
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed else None,
+        'endpoints': {
+            'distinct': len(counters['endpoints']),
+            'top': dict(counters['endpoints'].most_common(TOP_ENDPOINTS))
+        },
+        'disagreement': {
+            'compared': compared,
+            'disagreeing': counters['disagreeing'],
+            'rate': round(counters['disagreeing'] / compared, 4) if compared else 0.0,
+            'by_field': dict(counters['fields'])
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Interpret a query corpus offline on a process pool')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--jsonl', help="JSONL corpus ('-' for stdin) instead of the database")
+    source.add_argument('--database-url', help='Database to read query_history from (default: the app config)')
+    parser.add_argument('--output', '-o', default='-', help="JSONL interpretations file (default: stdout, '' to skip)")
+    parser.add_argument('--summary', help='Also write the summary JSON to this file')
+    parser.add_argument('--limit', type=int, help='Stop after this many rows')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per task sent to a worker')
+    parser.add_argument('--memo-size', type=int, default=2048, help='Per-worker interpretation memo size')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 1:
+        parser.error('--chunk-size and --workers must be positive')
+
+    if args.jsonl:
+        rows = rows_from_jsonl(args.jsonl, args.limit)
+    else:
+        rows = rows_from_database(database_url(args.database_url), args.limit)
+
+    counters = {'rows': 0, 'errors': 0, 'compared': 0, 'disagreeing': 0,
+                'endpoints': Counter(), 'fields': Counter()}
+    output = None
+    if args.output == '-':
+        output = sys.stdout
+    elif args.output:
+        output = open(args.output, 'w', encoding='utf-8')
+
+    started = time.perf_counter()
+    try:
+        for results in run_pool(chunked(rows, args.chunk_size), args.workers, args.memo_size):
+            for line, stats in results:
+                counters['rows'] += 1
+                if stats['error']:
+                    counters['errors'] += 1
+                else:
+                    counters['endpoints'][stats['endpoint']] += 1
+                if stats['differs'] is not None:
+                    counters['compared'] += 1
+                    if stats['differs']:
+                        counters['disagreeing'] += 1
+                        counters['fields'].update(stats['differs'])
+                if output is not None:
+                    output.write(line + '\n')
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+    summary = summarize(counters, time.perf_counter() - started, args.workers)
+
+    report = json.dumps(summary, indent=2)
+    print(report, file=sys.stderr)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+Tiered Query Interpretation
+The rule engine answers first; only interpretations it is not confident
+about are escalated to a language model backend. Escalated results are kept
+in a semantic cache (normalized text, then hashed-feature cosine similarity)
+so repeated and near-identical queries never pay model latency again.
+
+Backends are pluggable: anything with interpret(user_query, context) that
+returns an interpretation dict. The built-in one speaks the OpenAI-compatible
+chat completions protocol, so a local fake server (benchmarks/fake_llm_server.py)
+or any compatible gateway can stand in for the hosted API.
+"""
+
+import importlib
+import json
+import logging
+import math
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import requests
+
+from query_processor import NUMBER_PATTERN, QUOTED_PATTERN, RELATIVE_DATE_WORDS, _copy_interpretation
+from resilience import CircuitBreaker, CircuitOpenError
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+HASH_DIMENSIONS = 1 << 20
+WORD_PATTERN = re.compile(r'\w+')
+
+SYSTEM_PROMPT = (
+    'You translate natural-language requests into a single REST API call. '
+    'Reply with only a JSON object: {"endpoint": "/path", "method": "GET|POST|PUT|PATCH|DELETE", '
+    '"params": {...}}. Use one of the listed endpoints when one fits.'
+)
+
+
+def normalize_query(user_query):
+    """Lowercased words separated by single spaces; punctuation other than quotes dropped"""
+    return ' '.join(re.findall(r"[\w'\"]+", user_query.lower()))
+
+
+def query_slots(normalized):
+    """Numbers and quoted spans: near-identical queries must agree on these to share a result"""
+    quoted = tuple(single or double for single, double in QUOTED_PATTERN.findall(normalized))
+    return tuple(NUMBER_PATTERN.findall(normalized)), quoted
+
+
+def hashing_vector(normalized):
+    """
+    L2-normalized sparse vector of hashed word and character trigram features,
+    so reordered words and small typos still land close together
+    """
+    counts = {}
+    for word in WORD_PATTERN.findall(normalized):
+        features = ['w:' + word]
+        padded = f'<{word}>'
+        features.extend('c:' + padded[i:i + 3] for i in range(len(padded) - 2))
+        for feature in features:
+            index = zlib.crc32(feature.encode('utf-8')) % HASH_DIMENSIONS
+            counts[index] = counts.get(index, 0) + 1
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    return {index: count / norm for index, count in counts.items()} if norm else {}
+
+
+class SemanticCache:
+    """
+    Bounded LRU of escalated interpretations per scope (connection base URL).
+    Lookups try the normalized text, then the most similar cached query above
+    the similarity threshold, found through an inverted index of features.
+    """
+
+    def __init__(self, max_entries=4096, similarity=0.9):
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._entries = OrderedDict()  # (scope, normalized) -> (interpretation, vector, slots)
+        self._postings = {}  # (scope, feature) -> {(scope, normalized): weight}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def get(self, scope, normalized):
+        """Return (interpretation, 'exact' | 'semantic') or (None, None)"""
+        key = (scope, normalized)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[0], 'exact'
+            if self.similarity < 1:
+                best_key = self._most_similar(scope, hashing_vector(normalized), query_slots(normalized))
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    self.semantic_hits += 1
+                    return self._entries[best_key][0], 'semantic'
+            self.misses += 1
+            return None, None
+
+    def _most_similar(self, scope, vector, slots):
+        scores = {}
+        for index, weight in vector.items():
+            for key, other_weight in self._postings.get((scope, index), {}).items():
+                scores[key] = scores.get(key, 0.0) + weight * other_weight
+        best_key = None
+        best_score = self.similarity
+        for key, score in scores.items():
+            if score >= best_score and self._entries[key][2] == slots:
+                best_key, best_score = key, score
+        return best_key
+
+    def put(self, scope, normalized, interpretation):
+        if not self.max_entries:
+            return
+        key = (scope, normalized)
+        vector = hashing_vector(normalized)
+        with self._lock:
+            if key in self._entries:
+                self._unindex(key)
+            self._entries[key] = (interpretation, vector, query_slots(normalized))
+            self._entries.move_to_end(key)
+            for index, weight in vector.items():
+                self._postings.setdefault((scope, index), {})[key] = weight
+            while len(self._entries) > self.max_entries:
+                self._unindex(next(iter(self._entries)))
+
+    def _unindex(self, key):
+        _, vector, _ = self._entries.pop(key)
+        for index in vector:
+            postings = self._postings.get((key[0], index))
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[(key[0], index)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def stats(self):
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'similarity': self.similarity,
+            'exact_hits': self.exact_hits,
+            'semantic_hits': self.semantic_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.exact_hits + self.semantic_hits) / lookups, 4) if lookups else 0.0
+        }
+
+
+def validate_interpretation(data):
+    """Normalize a backend reply into an interpretation dict; ValueError when it is unusable"""
+    if isinstance(data, str):
+        data = json.loads(data)
+    if not isinstance(data, dict):
+        raise ValueError('interpretation must be a JSON object')
+    endpoint = data.get('endpoint')
+    if not isinstance(endpoint, str) or not endpoint.startswith('/'):
+        raise ValueError(f'invalid endpoint {endpoint!r}')
+    method = str(data.get('method') or 'GET').upper()
+    if method not in HTTP_METHODS:
+        raise ValueError(f'invalid method {method!r}')
+    params = data.get('params') or {}
+    filters = data.get('filters') or {}
+    if not isinstance(params, dict) or not isinstance(filters, dict):
+        raise ValueError('params and filters must be objects')
+    return {'endpoint': endpoint, 'method': method, 'params': params, 'filters': filters}
+
+
+class OpenAICompatibleBackend:
+    """Chat completions backend for the OpenAI API or any server speaking its protocol"""
+
+    name = 'openai'
+
+    def __init__(self, base_url, api_key=None, model='gpt-4o-mini', timeout=10, http_client=None):
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.http_client = http_client or requests
+
+    @classmethod
+    def from_config(cls, config, http_client=None):
+        return cls(
+            config.get('LLM_BASE_URL', 'https://api.openai.com/v1'),
+            api_key=config.get('LLM_API_KEY'),
+            model=config.get('LLM_MODEL', 'gpt-4o-mini'),
+            timeout=config.get('LLM_TIMEOUT', 10),
+            http_client=http_client
+        )
+
+    def interpret(self, user_query, context):
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        body = {
+            'model': self.model,
+            'temperature': 0,
+            'response_format': {'type': 'json_object'},
+            'messages': [
+                {'role': 'system', 'content': SYSTEM_PROMPT},
+                {'role': 'user', 'content': json.dumps({**context, 'query': user_query})}
+            ]
+        }
+        response = self.http_client.post(self.url, json=body, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content']
+
+
+BACKENDS = {'openai': OpenAICompatibleBackend}
+
+
+def load_backend(config, http_client=None):
+    """Backend named by LLM_BACKEND: a key of BACKENDS or a 'module:Class' path with from_config"""
+    name = config.get('LLM_BACKEND', 'openai')
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        module_name, _, class_name = name.partition(':')
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class.from_config(config, http_client=http_client)
+
+
+class TieredInterpreter:
+    """Rule engine first; low-confidence queries escalate to the model backend through the cache"""
+
+    def __init__(self, processor, backend=None, threshold=0.5, cache=None, breaker=None):
+        self.processor = processor
+        self.backend = backend
+        self.threshold = threshold
+        self.cache = cache if cache is not None else SemanticCache()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self._flight = SingleFlight()
+        self.fast_path = 0
+        self.escalated = 0
+        self.backend_calls = 0
+        self.backend_failures = 0
+        self.backend_seconds = 0.0
+
+    @classmethod
+    def from_config(cls, config, processor, http_client=None):
+        """Build the interpreter; without LLM_INTERPRETER_ENABLED every query takes the fast path"""
+        backend = load_backend(config, http_client) if config.get('LLM_INTERPRETER_ENABLED', False) else None
+        return cls(
+            processor,
+            backend=backend,
+            threshold=config.get('LLM_CONFIDENCE_THRESHOLD', 0.5),
+            cache=SemanticCache(config.get('LLM_CACHE_SIZE', 4096), config.get('LLM_CACHE_SIMILARITY', 0.9)),
+            breaker=CircuitBreaker(
+                failure_threshold=config.get('CIRCUIT_FAILURE_THRESHOLD', 5),
+                reset_timeout=config.get('CIRCUIT_RESET_TIMEOUT', 30)
+            )
+        )
+
+    def interpret_query(self, user_query, api_config):
+        """Same contract as AIQueryProcessor.interpret_query"""
+        interpretation, confidence = self.processor.interpret_with_confidence(user_query, api_config)
+        if self.backend is None or confidence >= self.threshold:
+            self.fast_path += 1
+            return interpretation
+
+        self.escalated += 1
+        scope = api_config.base_url
+        normalized = normalize_query(user_query)
+        # Date words resolve to the current time, so such answers are never reused
+        cacheable = not any(word in normalized for word in RELATIVE_DATE_WORDS)
+        if cacheable:
+            cached, _ = self.cache.get(scope, normalized)
+            if cached is not None:
+                return _copy_interpretation(cached)
+
+        def escalate():
+            return self._call_backend(user_query, scope, interpretation)
+
+        # Concurrent escalations of the same query share one backend call
+        escalated, _ = self._flight.do(json.dumps([scope, normalized]), escalate)
+        if escalated is None:
+            return interpretation
+        if cacheable:
+            self.cache.put(scope, normalized, escalated)
+        return _copy_interpretation(escalated)
+
+    def _call_backend(self, user_query, scope, fallback):
+        host = self.backend_host()
+        try:
+            self.breaker.before_request(host)
+        except CircuitOpenError:
+            return None
+        self.backend_calls += 1
+        started = time.perf_counter()
+        try:
+            interpretation = validate_interpretation(
+                self.backend.interpret(user_query, self._context(scope, fallback))
+            )
+        except Exception as e:
+            self.backend_failures += 1
+            self.breaker.record_failure(host)
+            logger.warning('LLM interpretation failed; using the rule-based result: %s', e)
+            return None
+        finally:
+            self.backend_seconds += time.perf_counter() - started
+        self.breaker.record_success(host)
+        return interpretation
+
+    def backend_host(self):
+        return getattr(self.backend, 'url', None) or getattr(self.backend, 'name', type(self.backend).__name__)
+
+    def _context(self, scope, fallback):
+        """What the backend knows besides the query: the connection, its catalog endpoints, the rule guess"""
+        context = {'base_url': scope, 'rule_based_guess': fallback}
+        provider_key, provider_config = self.processor.detect_api_provider(scope)
+        if provider_config:
+            context['provider'] = provider_config.get('name', provider_key)
+            if provider_config.get('endpoints'):
+                context['endpoints'] = provider_config['endpoints']
+        return context
+
+    def stats(self):
+        return {
+            'enabled': self.backend is not None,
+            'backend': getattr(self.backend, 'name', type(self.backend).__name__) if self.backend else None,
+            'threshold': self.threshold,
+            'fast_path': self.fast_path,
+            'escalated': self.escalated,
+            'backend_calls': self.backend_calls,
+            'backend_failures': self.backend_failures,
+            'backend_avg_ms': round(self.backend_seconds / self.backend_calls * 1000, 1)
+            if self.backend_calls else None,
+            'circuit_open': self.breaker.open_hosts(),
+            'short_circuited': self.breaker.short_circuited,
+            'cache': self.cache.stats()
+        }
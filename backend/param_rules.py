@@ -0,0 +1,171 @@
+"""
+Provider Parameter Rules
+Declarative `param_rules` in provider configurations, compiled per catalog
+version into a dispatch table: endpoint -> ordered rules, plus one keyword
+matcher per provider, so applying them costs a single scan of the query.
+
+A rule is an object with one target and, unless it sets a constant, a value:
+
+    endpoints   endpoint keys it applies to (default: every endpoint)
+    when        keywords that must all occur in the query
+    unless      keywords that must not occur
+    param       query parameter to set, from `value` or the constant `set`
+    endpoint    endpoint template to substitute the value into ("/r/{value}")
+    replace     [old, new]: rewrite the matched endpoint path
+    value       quoted | number | location | date | after:<keyword>
+    max_length  truncate the value
+    keep_empty  set the parameter even when the value is missing
+
+Rules run in order on the interpretation of the matched endpoint.
+"""
+
+import logging
+import threading
+
+from api_providers import get_all_providers, get_catalog_version
+from pattern_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+# value name -> (read it from QueryTokens, whether an empty string counts as missing)
+VALUE_SOURCES = {
+    'quoted': (lambda tokens: tokens.quoted[0] if tokens.quoted else None, False),
+    'number': (lambda tokens: tokens.numbers[0] if tokens.numbers else None, False),
+    'location': (lambda tokens: tokens.location, True),
+    'date': (lambda tokens: tokens.date, True)
+}
+TARGETS = ('param', 'endpoint', 'replace')
+
+
+def _keywords(rule, field):
+    keywords = rule.get(field, [])
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    return frozenset(keyword.lower() for keyword in keywords)
+
+
+def _value_reader(value):
+    if value.startswith('after:'):
+        keyword = value[len('after:'):].strip().lower()
+        if not keyword:
+            raise ValueError("'after:' needs a keyword")
+        return (lambda tokens: tokens.value_after(keyword)), True
+    if value not in VALUE_SOURCES:
+        raise ValueError(f'unknown value {value!r}')
+    return VALUE_SOURCES[value]
+
+
+class ParamRule:
+    """One compiled rule"""
+
+    __slots__ = ('when', 'unless', 'target', 'name', 'constant', 'read', 'empty_is_missing',
+                 'max_length', 'keep_empty')
+
+    def __init__(self, rule):
+        targets = [target for target in TARGETS if target in rule]
+        if len(targets) != 1:
+            raise ValueError(f'a rule needs exactly one of {", ".join(TARGETS)}')
+        self.target = targets[0]
+        self.name = rule[self.target]
+        if self.target == 'replace' and not (isinstance(self.name, list) and len(self.name) == 2):
+            raise ValueError("'replace' must be [old, new]")
+        self.when = _keywords(rule, 'when')
+        self.unless = _keywords(rule, 'unless')
+        self.constant = rule.get('set')
+        self.read = self.empty_is_missing = None
+        if 'value' in rule:
+            self.read, self.empty_is_missing = _value_reader(rule['value'])
+        elif self.target != 'replace' and 'set' not in rule:
+            raise ValueError("a rule needs 'value' or 'set'")
+        self.max_length = rule.get('max_length')
+        self.keep_empty = rule.get('keep_empty', False)
+
+    def apply(self, interpretation, tokens, hits):
+        if not self.when <= hits or not self.unless.isdisjoint(hits):
+            return
+        if self.target == 'replace':
+            old, new = self.name
+            interpretation['endpoint'] = interpretation['endpoint'].replace(old, new)
+            return
+        if self.read is None:
+            value = self.constant
+        else:
+            value = self.read(tokens)
+            if value is None or (self.empty_is_missing and value == ''):
+                if not self.keep_empty:
+                    return
+            elif self.max_length and isinstance(value, str):
+                value = value[:self.max_length]
+        if self.target == 'param':
+            interpretation['params'][self.name] = value
+        else:
+            interpretation['endpoint'] = self.name.format(value=value)
+
+
+class ParamRules:
+    """A provider's rules, grouped by the endpoint they apply to"""
+
+    def __init__(self, endpoints, rules):
+        compiled = [(rule.get('endpoints'), ParamRule(rule)) for rule in rules]
+        self.by_endpoint = {
+            endpoint_key: tuple(rule for keys, rule in compiled if keys is None or endpoint_key in keys)
+            for endpoint_key in endpoints
+        }
+        self.keywords = KeywordMatcher(
+            keyword for _, rule in compiled for keyword in rule.when | rule.unless
+        )
+
+    def apply(self, interpretation, tokens, endpoint_key):
+        """Set the parameters (and endpoint rewrites) the query implies"""
+        rules = self.by_endpoint.get(endpoint_key)
+        if not rules:
+            return
+        hits = self.keywords.hits(tokens.lower)
+        for rule in rules:
+            rule.apply(interpretation, tokens, hits)
+
+
+def compile_param_rules(provider_key, provider_config):
+    """ParamRules for a provider, or None when it has no (valid) rules"""
+    rules = provider_config.get('param_rules')
+    if not rules:
+        return None
+    try:
+        return ParamRules(provider_config.get('endpoints', {}), rules)
+    except (ValueError, TypeError, AttributeError, KeyError) as e:
+        logger.warning('Ignoring param_rules of provider %s: %s', provider_key, e)
+        return None
+
+
+class ParamRuleTable:
+    """ParamRules of catalog providers, compiled on first use and kept for the catalog version"""
+
+    def __init__(self, providers):
+        self._rules = {}  # provider_key -> ParamRules, or None when it declares none
+        self._providers = providers
+
+    def get(self, provider_key, provider_config):
+        if provider_key in self._rules:
+            return self._rules[provider_key]
+        rules = compile_param_rules(provider_key, provider_config)
+        # Config objects that are not the catalog's own entry are not kept
+        if provider_config is self._providers.get(provider_key):
+            rules = self._rules.setdefault(provider_key, rules)
+        return rules
+
+
+_table = None
+_table_version = None
+_table_lock = threading.Lock()
+
+
+def get_param_rules():
+    """Return the shared rule table, rebuilding it when the catalog version changes"""
+    global _table, _table_version
+    version = get_catalog_version()
+    if _table is None or _table_version != version:
+        with _table_lock:
+            if _table is None or _table_version != version:
+                _table = ParamRuleTable(get_all_providers())
+                _table_version = version
+    return _table
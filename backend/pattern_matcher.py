@@ -0,0 +1,163 @@
+"""
+Query Pattern Matching
+Keyword lists compiled into one regex each, so a single pass over a query
+finds every keyword it contains. Used to score provider endpoints and the
+generic REST fallback without looping over every pattern.
+"""
+
+import re
+import threading
+
+from api_providers import get_all_providers, get_catalog_version
+
+
+def trie_regex(keywords):
+    """
+    Alternation of keywords factored into a character trie, so the regex
+    engine never backtracks across alternatives and prefers the longest
+    keyword at a position
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds which of a set of keywords occur as substrings of a text, exactly
+    like `keyword in text` for each one. Each search reports the longest
+    keyword starting at the next matching position; keywords contained in a
+    hit (e.g. 'post' in 'posts') are implied by it.
+    """
+
+    def __init__(self, keywords):
+        keywords = set(keywords)
+        self.always = frozenset(keyword for keyword in keywords if not keyword)
+        keywords = sorted(keyword for keyword in keywords if keyword)
+        self.pattern = re.compile(trie_regex(keywords)) if keywords else None
+        self.implied = {
+            keyword: frozenset(other for other in keywords if other in keyword) | self.always
+            for keyword in keywords
+        }
+
+    def hits(self, text):
+        """The set of keywords occurring in text"""
+        if self.pattern is None:
+            return self.always
+        found = set(self.always)
+        search = self.pattern.search
+        match = search(text)
+        while match is not None:
+            found |= self.implied[match.group()]
+            # Restart one character in so overlapping keywords are found too
+            match = search(text, match.start() + 1)
+        return found
+
+
+class EndpointMatcher:
+    """A provider's endpoint scoring: the endpoint matching the most patterns wins, first on ties"""
+
+    def __init__(self, endpoints, query_patterns):
+        self.endpoints = [
+            (endpoint_key, endpoint_path) for endpoint_key, endpoint_path in endpoints.items()
+            if endpoint_key in query_patterns
+        ]
+        # pattern -> [(endpoint index, times listed)], so only hit patterns are visited
+        self.weights = {}
+        for index, (endpoint_key, _) in enumerate(self.endpoints):
+            counts = {}
+            for pattern in query_patterns[endpoint_key]:
+                counts[pattern] = counts.get(pattern, 0) + 1
+            for pattern, count in counts.items():
+                self.weights.setdefault(pattern, []).append((index, count))
+        self.keywords = KeywordMatcher(self.weights)
+
+    def best_match(self, query_lower):
+        """Return (endpoint_key, endpoint_path) with the highest non-zero score, or None"""
+        scores = {}
+        for pattern in self.keywords.hits(query_lower):
+            for index, count in self.weights[pattern]:
+                scores[index] = scores.get(index, 0) + count
+        if not scores:
+            return None
+        best_index = min(scores, key=lambda index: (-scores[index], index))
+        return self.endpoints[best_index]
+
+
+class RuleMatcher:
+    """
+    Named lists of ordered (keywords, value) rules decided by one scan of the
+    text: per list, the first rule with any keyword in the text wins
+    """
+
+    def __init__(self, rule_lists, defaults=None):
+        self.rule_lists = {
+            name: [(frozenset(keywords), value) for keywords, value in rules]
+            for name, rules in rule_lists.items()
+        }
+        self.defaults = defaults or {}
+        self.keywords = KeywordMatcher(
+            keyword for rules in self.rule_lists.values() for keywords, _ in rules for keyword in keywords
+        )
+
+    def match(self, text):
+        """Return {list name: winning value or its default}"""
+        found = self.keywords.hits(text)
+        result = {}
+        for name, rules in self.rule_lists.items():
+            result[name] = self.defaults.get(name)
+            for keywords, value in rules:
+                if not keywords.isdisjoint(found):
+                    result[name] = value
+                    break
+        return result
+
+
+def _compile_endpoint_matcher(provider_config):
+    return EndpointMatcher(provider_config['endpoints'], provider_config.get('query_patterns', {}))
+
+
+class EndpointMatcherTable:
+    """EndpointMatchers of catalog providers, compiled on first use and kept for the catalog version"""
+
+    def __init__(self, providers):
+        self._providers = providers
+        self._matchers = {}
+
+    def get(self, provider_key, provider_config):
+        matcher = self._matchers.get(provider_key)
+        if matcher is None:
+            matcher = _compile_endpoint_matcher(provider_config)
+            # Config objects that are not the catalog's own entry are not kept
+            if provider_config is self._providers.get(provider_key):
+                matcher = self._matchers.setdefault(provider_key, matcher)
+        return matcher
+
+
+_table = None
+_table_version = None
+_table_lock = threading.Lock()
+
+
+def get_endpoint_matchers():
+    """Return the shared matcher table, rebuilding it when the catalog version changes"""
+    global _table, _table_version
+    version = get_catalog_version()
+    if _table is None or _table_version != version:
+        with _table_lock:
+            if _table is None or _table_version != version:
+                _table = EndpointMatcherTable(get_all_providers())
+                _table_version = version
+    return _table
@@ -0,0 +1,176 @@
+"""
+Provider Detection Index
+Host-keyed lookup table used to map a connection base URL to its API provider
+"""
+
+import re
+import threading
+from urllib.parse import urlsplit
+
+from api_providers import get_all_providers, get_catalog_version, get_provider_summaries
+
+TEMPLATE_PATTERN = re.compile(r'\{[^}]+\}')
+WILDCARD = '*'
+LOOKUP_CACHE_SIZE = 4096
+
+
+def _split_url(url):
+    """Return (netloc, hostname, path) for a URL, tolerating missing schemes"""
+    url = url.strip().lower()
+    if '://' not in url:
+        url = 'https://' + url
+    parts = urlsplit(url)
+    return parts.netloc, parts.hostname or '', parts.path.rstrip('/')
+
+
+def _path_matches(path, prefix):
+    return not prefix or path == prefix or path.startswith(prefix + '/')
+
+
+def _add_candidate(candidates, clean_path, entry):
+    candidates.append((clean_path, entry))
+    candidates.sort(key=lambda candidate: (-len(candidate[0]), candidate[1][0]))
+
+
+def _pick_candidate(candidates, path):
+    """Prefer the provider with the longest matching path, then catalog order"""
+    for prefix, entry in candidates:
+        if _path_matches(path, prefix):
+            return entry
+    return min(entry for _, entry in candidates)
+
+
+class _SuffixNode:
+    __slots__ = ('children', 'candidates')
+
+    def __init__(self):
+        self.children = {}
+        self.candidates = []
+
+
+class ProviderIndex:
+    """Resolve base URLs to providers without scanning the whole catalog"""
+
+    def __init__(self, providers, summaries=None):
+        self.providers = providers
+        self.exact_hosts = {}
+        self.suffix_root = _SuffixNode()
+        self.path_rules = []
+        self.key_rules = []
+        self._lookup_cache = {}
+
+        # Only base URLs are needed; summaries avoid decoding every catalog entry
+        for ordinal, (provider_key, summary) in enumerate((summaries or providers).items()):
+            self._add_provider(ordinal, provider_key, summary)
+
+        self.path_rules.sort(key=lambda rule: (-len(rule[0]), rule[1]))
+
+    def _add_provider(self, ordinal, provider_key, provider_config):
+        entry = (ordinal, provider_key)
+        self.key_rules.append((provider_key, entry))
+
+        netloc, hostname, path = _split_url(provider_config['base_url'])
+        clean_path = TEMPLATE_PATTERN.sub('', path).rstrip('/')
+        if not TEMPLATE_PATTERN.sub('', hostname).strip('.'):
+            # Host is entirely user supplied (e.g. {domain}); match on the path instead
+            if clean_path:
+                self.path_rules.append((clean_path, ordinal, provider_key))
+            return
+
+        if '{' not in hostname:
+            _add_candidate(self.exact_hosts.setdefault(netloc, []), clean_path, entry)
+            if netloc != hostname:
+                # Port-qualified hosts (e.g. localhost:1337) only match exactly
+                return
+
+        labels = [WILDCARD if '{' in label else label for label in hostname.split('.')]
+        node = self.suffix_root
+        for label in reversed(labels):
+            node = node.children.setdefault(label, _SuffixNode())
+        _add_candidate(node.candidates, clean_path, entry)
+
+    def _match_suffix(self, labels, path):
+        """Walk host labels right-to-left, returning the most specific match"""
+        best = None
+        best_depth = -1
+        stack = [(self.suffix_root, len(labels) - 1, 0)]
+        while stack:
+            node, position, depth = stack.pop()
+            if node.candidates:
+                match = _pick_candidate(node.candidates, path)
+                if depth > best_depth or (depth == best_depth and match[0] < best[0]):
+                    best, best_depth = match, depth
+            if position < 0:
+                continue
+            label = labels[position]
+            child = node.children.get(label)
+            if child is not None:
+                stack.append((child, position - 1, depth + 1))
+            wildcard = node.children.get(WILDCARD)
+            if wildcard is not None:
+                stack.append((wildcard, position - 1, depth + 1))
+        return best
+
+    def lookup(self, base_url):
+        """Return (provider_key, provider_config) or (None, None)"""
+        if not base_url:
+            return None, None
+
+        provider_key = self._lookup_cache.get(base_url, False)
+        if provider_key is False:
+            provider_key = self._resolve(base_url)
+            if len(self._lookup_cache) >= LOOKUP_CACHE_SIZE:
+                self._lookup_cache.clear()
+            self._lookup_cache[base_url] = provider_key
+
+        if provider_key is None:
+            return None, None
+        return provider_key, self.providers[provider_key]
+
+    def _resolve(self, base_url):
+        """Resolve a base URL to a provider key without consulting the memo"""
+        netloc, hostname, path = _split_url(base_url)
+        entry = None
+        candidates = self.exact_hosts.get(netloc) or self.exact_hosts.get(hostname)
+        if candidates:
+            entry = _pick_candidate(candidates, path)
+        elif hostname:
+            entry = self._match_suffix(hostname.split('.'), path)
+
+        if entry is None:
+            for rule_path, ordinal, provider_key in self.path_rules:
+                if _path_matches(path, rule_path):
+                    entry = (ordinal, provider_key)
+                    break
+
+        if entry is None:
+            # Fall back to the provider key appearing anywhere in the URL
+            base_url_lower = base_url.lower()
+            for provider_key, key_entry in self.key_rules:
+                if provider_key in base_url_lower:
+                    entry = key_entry
+                    break
+
+        return entry[1] if entry is not None else None
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_provider_index():
+    """Return the shared index, rebuilding it when the catalog version changes"""
+    global _index, _index_version
+    version = get_catalog_version()
+    if _index is None or _index_version != version:
+        with _index_lock:
+            if _index is None or _index_version != version:
+                _index = ProviderIndex(get_all_providers(), get_provider_summaries())
+                _index_version = version
+    return _index
+
+
+def detect_provider(base_url):
+    """Detect the API provider for a base URL using the shared index"""
+    return get_provider_index().lookup(base_url)
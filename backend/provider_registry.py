@@ -0,0 +1,303 @@
+"""
+Provider Registry
+Provider definitions live in JSON (or YAML) files and are compiled into a
+marshal snapshot that every worker memory-maps, so its pages are shared
+through the OS page cache and each entry is only decoded when first used.
+The catalog listing, search and host detection indexes are built from small
+per-entry summaries kept in the snapshot index, not from decoded entries.
+Source files are re-checked periodically; when they change the snapshot is
+recompiled and re-mapped without a restart.
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import MutableMapping
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; workers may then compile concurrently
+    fcntl = None
+
+try:
+    import yaml
+except ImportError:  # optional dependency
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+SOURCE_SUFFIXES = ('.json', '.yaml', '.yml')
+
+# marshal output is specific to the interpreter, so it is part of the magic
+MAGIC = b'APXR' + bytes([sys.version_info[0], sys.version_info[1], marshal.version, 3])
+HEADER = struct.Struct('<8sQ')  # magic, index length
+
+# Entry fields copied into the snapshot index for building catalog-wide indexes
+SUMMARY_FIELDS = ('name', 'base_url', 'auth_type', 'description', 'example_queries', 'endpoints', 'probe')
+
+
+def default_snapshot_path(directory):
+    """A per-source-directory snapshot file in the system temp dir"""
+    digest = hashlib.sha1(os.path.abspath(directory).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f'apiflexy-providers-{digest}.snapshot')
+
+
+def source_files(directory):
+    """Provider data files, in the order their entries are merged"""
+    return [
+        os.path.join(directory, name) for name in sorted(os.listdir(directory))
+        if name.endswith(SOURCE_SUFFIXES) and not name.startswith('.')
+    ]
+
+
+def source_fingerprint(paths):
+    """Name, mtime and size of every source file; any edit changes it"""
+    fingerprint = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def load_source(path):
+    """Read one data file of provider_key -> config"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            data = json.load(f)
+        elif yaml is None:
+            raise RuntimeError(f'{path}: YAML provider files require the PyYAML package (pip install pyyaml)')
+        else:
+            data = yaml.safe_load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f'{path}: expected an object mapping provider keys to configurations')
+    return data
+
+
+def summarize(provider_config):
+    """The SUMMARY_FIELDS of a provider entry"""
+    return {field: provider_config[field] for field in SUMMARY_FIELDS if field in provider_config}
+
+
+def compile_snapshot(directory):
+    """Merge the source files (later files override earlier keys) into snapshot bytes"""
+    paths = source_files(directory)
+    fingerprint = source_fingerprint(paths)
+    providers = {}
+    for path in paths:
+        for provider_key, provider_config in load_source(path).items():
+            providers[provider_key.lower()] = provider_config
+
+    blobs = []
+    spans = []
+    offset = 0
+    for provider_config in providers.values():
+        blob = marshal.dumps(provider_config)
+        spans.append((offset, len(blob)))
+        offset += len(blob)
+        blobs.append(blob)
+    index = marshal.dumps({
+        'fingerprint': fingerprint,
+        'keys': list(providers),
+        'spans': spans,
+        'summaries': [summarize(provider_config) for provider_config in providers.values()]
+    })
+    return b''.join([HEADER.pack(MAGIC, len(index)), index, *blobs])
+
+
+class Snapshot:
+    """Read-only view of compiled provider entries over a buffer (usually an mmap)"""
+
+    def __init__(self, buffer):
+        magic, index_length = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError('Provider snapshot was compiled by a different Python version')
+        index = marshal.loads(buffer[HEADER.size:HEADER.size + index_length])
+        self.buffer = buffer
+        self.fingerprint = index['fingerprint']
+        self.keys = index['keys']
+        self.spans = dict(zip(self.keys, index['spans']))
+        self.summaries = dict(zip(self.keys, index['summaries']))
+        self.base = HEADER.size + index_length
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def load(self, provider_key):
+        offset, length = self.spans[provider_key]
+        start = self.base + offset
+        return marshal.loads(self.buffer[start:start + length])
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+def open_snapshot(directory, snapshot_path):
+    """
+    Map the snapshot for the current source files, compiling it first when it
+    is missing or stale. One worker compiles under a file lock; the others
+    wait for it and map the result.
+    """
+    fingerprint = source_fingerprint(source_files(directory))
+    lock_file = None
+    try:
+        for attempt in range(2):
+            try:
+                snapshot = Snapshot.from_file(snapshot_path)
+                if snapshot.fingerprint == fingerprint:
+                    return snapshot
+            except (OSError, ValueError, EOFError, TypeError, KeyError, struct.error):
+                pass
+            if attempt or fcntl is None:
+                break
+            try:
+                lock_file = open(snapshot_path + '.lock', 'a')
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except OSError:
+                break
+
+        data = compile_snapshot(directory)
+        temp_path = f'{snapshot_path}.{os.getpid()}.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, snapshot_path)
+            return Snapshot.from_file(snapshot_path)
+        except OSError:
+            # Unwritable location: this worker keeps a private in-memory copy
+            logger.warning('Could not write provider snapshot %s; using an in-memory copy', snapshot_path)
+            return Snapshot(data)
+    finally:
+        if lock_file is not None:
+            lock_file.close()
+
+
+class ProviderRegistry(MutableMapping):
+    """
+    Ordered provider_key -> config mapping backed by a snapshot.
+    Runtime registrations are kept on top of the snapshot across reloads.
+    """
+
+    def __init__(self, directory, snapshot_path=None, reload_interval=2):
+        self.directory = directory
+        self.snapshot_path = snapshot_path or default_snapshot_path(directory)
+        self.reload_interval = reload_interval
+        self.version = 0
+        self.reloads = 0
+        self._overrides = {}
+        self._removed = set()
+        self._lock = threading.Lock()
+        self._next_check = time.monotonic() + reload_interval
+        self._failed_fingerprint = None
+        self._snapshot = None
+        self._install(open_snapshot(directory, self.snapshot_path))
+
+    def _install(self, snapshot):
+        with self._lock:
+            previous = self._snapshot
+            self._snapshot = snapshot
+            self._decoded = {}
+            self._order = [key for key in snapshot.keys if key not in self._removed]
+            self._order += [key for key in self._overrides if key not in snapshot.spans]
+        if previous is not None:
+            previous.close()
+
+    def check_for_changes(self):
+        """Reload when the source files changed; checked at most once per reload interval"""
+        if not self.reload_interval or time.monotonic() < self._next_check:
+            return False
+        self._next_check = time.monotonic() + self.reload_interval
+        fingerprint = None
+        try:
+            fingerprint = source_fingerprint(source_files(self.directory))
+            if fingerprint in (self._snapshot.fingerprint, self._failed_fingerprint):
+                return False
+            self._install(open_snapshot(self.directory, self.snapshot_path))
+        except Exception:
+            # Keep serving the previous catalog until the files are fixed
+            self._failed_fingerprint = fingerprint
+            logger.exception('Failed to reload provider files from %s', self.directory)
+            return False
+        self.reloads += 1
+        self.version += 1
+        return True
+
+    def __getitem__(self, provider_key):
+        provider_config = self._overrides.get(provider_key)
+        if provider_config is not None:
+            return provider_config
+        provider_config = self._decoded.get(provider_key)
+        if provider_config is None:
+            snapshot = self._snapshot
+            if provider_key not in snapshot.spans or provider_key in self._removed:
+                raise KeyError(provider_key)
+            try:
+                provider_config = snapshot.load(provider_key)
+            except ValueError:
+                if snapshot is self._snapshot:
+                    raise
+                # A reload closed the mapping this read started on
+                return self[provider_key]
+            provider_config = self._decoded.setdefault(provider_key, provider_config)
+        return provider_config
+
+    def summary(self, provider_key):
+        """The SUMMARY_FIELDS of a provider, without decoding its snapshot entry"""
+        provider_config = self._overrides.get(provider_key)
+        if provider_config is not None:
+            return summarize(provider_config)
+        if provider_key in self._removed:
+            raise KeyError(provider_key)
+        return self._snapshot.summaries[provider_key]
+
+    def summaries(self):
+        """Ordered provider_key -> summary mapping of the whole catalog"""
+        return {provider_key: self.summary(provider_key) for provider_key in list(self._order)}
+
+    def __setitem__(self, provider_key, provider_config):
+        with self._lock:
+            if provider_key not in self:
+                self._order.append(provider_key)
+            self._removed.discard(provider_key)
+            self._overrides[provider_key] = provider_config
+            self.version += 1
+
+    def __delitem__(self, provider_key):
+        with self._lock:
+            if provider_key not in self:
+                raise KeyError(provider_key)
+            self._overrides.pop(provider_key, None)
+            self._removed.add(provider_key)
+            self._order.remove(provider_key)
+            self.version += 1
+
+    def __contains__(self, provider_key):
+        return provider_key in self._overrides or (
+            provider_key in self._snapshot.spans and provider_key not in self._removed
+        )
+
+    def __iter__(self):
+        return iter(list(self._order))
+
+    def __len__(self):
+        return len(self._order)
+
+    def stats(self):
+        return {
+            'providers': len(self._order),
+            'decoded': len(self._decoded),
+            'runtime_overrides': len(self._overrides),
+            'snapshot_bytes': len(self._snapshot.buffer),
+            'reloads': self.reloads,
+            'version': self.version
+        }
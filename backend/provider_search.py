@@ -0,0 +1,261 @@
+"""
+Provider Search Index
+Inverted token index over the provider catalog with prefix, substring (trigram)
+and typo-tolerant matching, used to rank results for the Explorer search box
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+from api_providers import get_catalog_version, get_provider_categories, get_provider_summaries
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Relevance weight of a token by the field it appears in
+FIELD_WEIGHTS = (
+    ('key', 8.0),
+    ('name', 6.0),
+    ('categories', 3.0),
+    ('endpoints', 2.0),
+    ('description', 2.0),
+    ('example_queries', 1.0),
+)
+
+# Score multiplier by how a query token matched an indexed token
+EXACT = 1.0
+PREFIX = 0.75
+SUBSTRING = 0.5
+FUZZY = 0.6
+
+PHRASE_BONUS = 4.0
+MIN_SUBSTRING_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 512
+RESULT_CACHE_SIZE = 256
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _trigrams(token, padded=True):
+    if padded:
+        token = f'${token}$'
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _max_edits(token):
+    """Typos tolerated for a query token: none for short tokens, more for long ones"""
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+def _edit_distance(a, b, limit):
+    """Damerau-Levenshtein (optimal string alignment) distance, or limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and char_a == b[j - 2] and a[i - 2] == char_b):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _provider_fields(provider_key, provider_config, categories):
+    """Searchable text of one provider, by field"""
+    endpoints = provider_config.get('endpoints', {})
+    return {
+        'key': provider_key,
+        'name': provider_config.get('name', ''),
+        'categories': ' '.join(categories),
+        'endpoints': ' '.join(list(endpoints) + list(endpoints.values())),
+        'description': provider_config.get('description', ''),
+        'example_queries': ' '.join(provider_config.get('example_queries', [])),
+    }
+
+
+class ProviderSearchIndex:
+    """Ranked provider search without scanning the whole catalog"""
+
+    def __init__(self, providers, categories=None):
+        self.keys = list(providers)
+        self.ordinals = {provider_key: ordinal for ordinal, provider_key in enumerate(self.keys)}
+        self.providers = providers
+        self.postings = {}  # token -> {ordinal: weight}
+        self.trigrams = {}  # trigram -> set of tokens
+        self.names = []
+        self._result_cache = {}  # phrase -> ranking; broad keystroke prefixes rank most of the catalog
+
+        provider_categories = {}
+        for category, provider_keys in (categories or {}).items():
+            for provider_key in provider_keys:
+                provider_categories.setdefault(provider_key, []).append(category)
+
+        for ordinal, (provider_key, provider_config) in enumerate(providers.items()):
+            fields = _provider_fields(provider_key, provider_config, provider_categories.get(provider_key, ()))
+            self.names.append(fields['name'].lower())
+            weights = {}
+            for field, weight in FIELD_WEIGHTS:
+                for token in set(tokenize(fields[field])):
+                    weights[token] = weights.get(token, 0) + weight
+            for token, weight in weights.items():
+                self.postings.setdefault(token, {})[ordinal] = weight
+
+        self.vocabulary = sorted(self.postings)
+        for token in self.vocabulary:
+            for trigram in _trigrams(token):
+                self.trigrams.setdefault(trigram, set()).add(token)
+
+    def _prefix_matches(self, token):
+        """Indexed tokens starting with token (including token itself)"""
+        start = bisect_left(self.vocabulary, token)
+        matches = []
+        for candidate in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(token):
+                break
+            matches.append(candidate)
+        return matches
+
+    def _substring_matches(self, token):
+        """Indexed tokens containing token, found by intersecting trigram postings"""
+        if len(token) < MIN_SUBSTRING_LENGTH:
+            return []
+        postings = sorted((self.trigrams.get(trigram, ()) for trigram in _trigrams(token, padded=False)), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [candidate for candidate in candidates if token in candidate]
+
+    def _fuzzy_matches(self, token):
+        """Indexed tokens within the tolerated edit distance, as (token, edits)"""
+        limit = _max_edits(token)
+        if not limit:
+            return []
+        query_trigrams = _trigrams(token)
+        # An edit changes at most four padded trigrams (a transposition touches four)
+        required = max(len(query_trigrams) - 4 * limit, 1)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self.trigrams.get(trigram, ()))
+        matches = []
+        for candidate, count in shared.items():
+            if count >= required and candidate != token:
+                edits = _edit_distance(token, candidate, limit)
+                if edits <= limit:
+                    matches.append((candidate, edits))
+        return matches
+
+    def _score_token(self, token):
+        """Best score per provider ordinal for one query token"""
+        matches = {}
+        for candidate in self._prefix_matches(token):
+            matches[candidate] = EXACT if candidate == token else PREFIX
+        for candidate in self._substring_matches(token):
+            matches.setdefault(candidate, SUBSTRING)
+        if token not in self.postings:
+            for candidate, edits in self._fuzzy_matches(token):
+                matches.setdefault(candidate, FUZZY / edits)
+
+        scores = {}
+        for candidate, factor in matches.items():
+            for ordinal, weight in self.postings[candidate].items():
+                score = weight * factor
+                if score > scores.get(ordinal, 0):
+                    scores[ordinal] = score
+        return scores
+
+    def rank(self, phrase):
+        """
+        (score, ordinal) for providers matching any token of a lowercased
+        query, ordered by tokens matched, then score, then catalog order
+        """
+        tokens = list(dict.fromkeys(tokenize(phrase)))
+        if not tokens:
+            return []
+
+        if len(tokens) == 1:
+            scores = self._score_token(tokens[0])
+            ranked = [((1, score), ordinal) for ordinal, score in scores.items()]
+        else:
+            totals = {}  # ordinal -> [matched tokens, score]
+            for token in tokens:
+                for ordinal, score in self._score_token(token).items():
+                    total = totals.get(ordinal)
+                    if total is None:
+                        totals[ordinal] = [1, score]
+                    else:
+                        total[0] += 1
+                        total[1] += score
+            for ordinal, total in totals.items():
+                if total[0] == len(tokens) and phrase in self.names[ordinal]:
+                    total[1] += PHRASE_BONUS
+            ranked = [(tuple(total), ordinal) for ordinal, total in totals.items()]
+
+        exact_key = self.ordinals.get(phrase)
+        if exact_key is not None:
+            ranked = [((count, score + PHRASE_BONUS), ordinal) if ordinal == exact_key else ((count, score), ordinal)
+                      for (count, score), ordinal in ranked]
+
+        ranked.sort(key=lambda item: (item[0][0], item[0][1], -item[1]), reverse=True)
+        return [(score, ordinal) for (_, score), ordinal in ranked]
+
+    def search(self, query, limit=None):
+        """Ranked providers for a search box query, memoized per phrase"""
+        phrase = query.strip().lower()
+        ranked = self._result_cache.get(phrase)
+        if ranked is None:
+            ranked = self.rank(phrase)
+            if len(self._result_cache) >= RESULT_CACHE_SIZE:
+                self._result_cache.clear()
+            self._result_cache[phrase] = ranked
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        results = []
+        for score, ordinal in ranked:
+            provider_key = self.keys[ordinal]
+            provider = self.providers[provider_key]
+            results.append({
+                'key': provider_key,
+                'name': provider['name'],
+                'description': provider['description'],
+                'score': round(score, 3)
+            })
+        return results
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """Return the shared search index, rebuilding it when the catalog version changes"""
+    global _index, _index_version
+    version = get_catalog_version()
+    if _index is None or _index_version != version:
+        with _index_lock:
+            if _index is None or _index_version != version:
+                _index = ProviderSearchIndex(get_provider_summaries(), get_provider_categories())
+                _index_version = version
+    return _index
+
+
+def search_providers(query, limit=None):
+    """Search providers by relevance over names, descriptions, categories, endpoints and examples"""
+    return get_search_index().search(query, limit)
+
+
+# Build at import so the first keystroke does not pay for it
+get_search_index()
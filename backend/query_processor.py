@@ -0,0 +1,323 @@
+"""
+AI Query Processor
+Translates natural-language queries into upstream API requests
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from api_providers import get_all_providers, get_catalog_version
+from param_rules import get_param_rules
+from pattern_matcher import RuleMatcher, get_endpoint_matchers
+from provider_index import detect_provider
+
+# Words that make _extract_date depend on the current time
+RELATIVE_DATE_WORDS = ('today', 'yesterday')
+
+NUMBER_PATTERN = re.compile(r'\b\d+\b')
+QUOTED_PATTERN = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+# Location patterns in priority order, each with one capture group, and a
+# literal each one needs (so patterns that cannot match are not run)
+LOCATION_PATTERNS = (
+    (r'(?:for|in|at|near)\s+([A-Za-z\s,]+?)(?:\s|$|,)', None),
+    (r'weather\s+(?:for|in|at|near)?\s*([A-Za-z\s,]+?)(?:\s|$)', 'weather'),
+    (r'temperature\s+(?:for|in|at|near)?\s*([A-Za-z\s,]+?)(?:\s|$)', 'temperature')
+)
+
+# Keywords whose following words are extracted up front, for the after:<keyword>
+# values of catalog param rules (e.g. "author octocat"); others are found on demand
+VALUE_KEYWORDS = ('author', 'category', 'subreddit', 'country')
+
+
+def _keyword_value_regex(keyword):
+    return keyword + r'\s+([\w\s]+?)(?:\s|$)'
+
+
+def _compile_variants(pattern):
+    """
+    (case-insensitive, case-sensitive) compilations of a pattern. On lowercase
+    ASCII text IGNORECASE cannot change a match but makes it several times slower.
+    """
+    return re.compile(pattern, re.IGNORECASE), re.compile(pattern)
+
+
+LOCATION_REGEXES = [(_compile_variants(pattern), literal) for pattern, literal in LOCATION_PATTERNS]
+KEYWORD_VALUE_REGEXES = {keyword: _compile_variants(_keyword_value_regex(keyword)) for keyword in VALUE_KEYWORDS}
+
+_UNSET = object()
+
+
+@lru_cache(maxsize=64)
+def _keyword_value_pattern(keyword):
+    return re.compile(_keyword_value_regex(keyword), re.IGNORECASE)
+
+
+def _first_location(text, lowered=False):
+    """Location captured by the first pattern that matches, or None"""
+    variant = 1 if lowered and text.isascii() else 0
+    folded = text if lowered else text.lower()
+    for variants, literal in LOCATION_REGEXES:
+        if literal is None or literal in folded:
+            match = variants[variant].search(text)
+            if match:
+                return match.group(1).strip()
+    return None
+
+
+def _keyword_values(query_lower):
+    """The words after the first occurrence of each of VALUE_KEYWORDS in a lowercased query"""
+    ascii_only = query_lower.isascii()
+    values = {}
+    for keyword, variants in KEYWORD_VALUE_REGEXES.items():
+        if ascii_only:
+            match = keyword in query_lower and variants[1].search(query_lower)
+        else:
+            match = variants[0].search(query_lower)
+        if match:
+            values[keyword] = match.group(1).strip()
+    return values
+
+
+class QueryTokens:
+    """
+    Everything provider param rules read from a query, extracted once.
+    Extractors whose literals are absent are skipped; the location, which has
+    no such literal and only weather providers read, is found on first use.
+    """
+
+    __slots__ = ('text', 'lower', 'numbers', 'quoted', 'keywords', '_location', '_after')
+
+    def __init__(self, user_query):
+        self.text = user_query
+        self.lower = query_lower = user_query.lower()
+        self.numbers = [int(number) for number in NUMBER_PATTERN.findall(user_query)]
+        if "'" in query_lower or '"' in query_lower:
+            self.quoted = [single or double for single, double in QUOTED_PATTERN.findall(query_lower)]
+        else:
+            self.quoted = []
+        self.keywords = _keyword_values(query_lower)
+        self._location = _UNSET
+        self._after = None
+
+    @property
+    def location(self):
+        if self._location is _UNSET:
+            self._location = _first_location(self.lower, lowered=True)
+        return self._location
+
+    @property
+    def date(self):
+        return relative_date(self.lower)
+
+    def value_after(self, keyword):
+        """The words after the first occurrence of keyword, or None"""
+        if keyword in KEYWORD_VALUE_REGEXES:
+            return self.keywords.get(keyword)
+        if self._after is None:
+            self._after = {}
+        if keyword not in self._after:
+            match = keyword in self.lower and _keyword_value_pattern(re.escape(keyword)).search(self.lower)
+            self._after[keyword] = match.group(1).strip() if match else None
+        return self._after[keyword]
+
+
+def relative_date(query_lower):
+    """ISO timestamp for the first of RELATIVE_DATE_WORDS in the query, or None"""
+    if RELATIVE_DATE_WORDS[0] in query_lower:
+        return datetime.now().isoformat()
+    elif RELATIVE_DATE_WORDS[1] in query_lower:
+        return (datetime.now() - timedelta(days=1)).isoformat()
+    return None
+
+
+def tokenize_query(user_query):
+    """Run the extractor stage over a query"""
+    return QueryTokens(user_query)
+
+
+# Generic REST fallback: for method and endpoint, the first rule with a keyword in the query wins
+GENERIC_RULES = RuleMatcher({
+    'method': [
+        (['get', 'fetch', 'retrieve', 'show', 'list'], 'GET'),
+        (['create', 'add', 'post', 'new'], 'POST'),
+        (['update', 'edit', 'modify'], 'PUT'),
+        (['delete', 'remove'], 'DELETE')
+    ],
+    'endpoint': [
+        (['user', 'users', 'profile', 'account'], '/users'),
+        (['post', 'posts', 'article', 'blog'], '/posts'),
+        (['comment', 'comments'], '/comments'),
+        (['data', 'all', 'list'], '/data')
+    ]
+}, defaults={'endpoint': '/'})
+
+# How sure the rule engine is of an interpretation, by the evidence it found
+CONFIDENCE_PROVIDER_MATCH = 0.9  # a catalog provider's query patterns picked the endpoint
+CONFIDENCE_GENERIC_FULL = 0.6  # generic rules recognised both method and resource
+CONFIDENCE_GENERIC_PARTIAL = 0.4  # generic rules recognised one of them
+CONFIDENCE_PROVIDER_MISS = 0.2  # a catalog provider, but none of its patterns occur
+CONFIDENCE_NONE = 0.1  # nothing recognised; the generic default endpoint
+
+
+def _copy_interpretation(interpretation):
+    """Copy an interpretation deep enough that callers cannot mutate memoized state"""
+    return {
+        **interpretation,
+        'params': dict(interpretation['params']),
+        'filters': dict(interpretation['filters'])
+    }
+
+
+class AIQueryProcessor:
+    def __init__(self, memo_size=2048):
+        self.openai_api_key = os.environ.get('OPENAI_API_KEY')
+        self.providers = get_all_providers()
+        
+        # Bounded memo of interpret_query results
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.memo_uncacheable = 0
+    
+    def detect_api_provider(self, base_url):
+        """Detect API provider based on base URL"""
+        return detect_provider(base_url)
+    
+    def extract_numbers(self, query):
+        """Extract numbers from query text"""
+        return [int(number) for number in NUMBER_PATTERN.findall(query)]
+
+    def extract_quoted_text(self, query):
+        """Extract text within quotes"""
+        return [single or double for single, double in QUOTED_PATTERN.findall(query)]
+
+    def extract_location(self, query):
+        """Extract location from query"""
+        return _first_location(query)
+    
+    def interpret_query(self, user_query, api_config):
+        """
+        Enhanced query interpretation using provider configurations.
+        Results are memoized per (query, base URL) unless they depend on the current date.
+        """
+        return self.interpret_with_confidence(user_query, api_config)[0]
+    
+    def interpret_with_confidence(self, user_query, api_config):
+        """interpret_query, plus the rule engine's confidence in the result (0-1)"""
+        query_lower = user_query.lower()
+        if not self.memo_size or any(word in query_lower for word in RELATIVE_DATE_WORDS):
+            self.memo_uncacheable += 1
+            return self._interpret_scored(user_query, api_config)
+        
+        memo_key = (query_lower, api_config.base_url, get_catalog_version())
+        with self._memo_lock:
+            entry = self._memo.get(memo_key)
+            if entry is not None:
+                self._memo.move_to_end(memo_key)
+                self.memo_hits += 1
+                return _copy_interpretation(entry[0]), entry[1]
+            self.memo_misses += 1
+        
+        interpretation, confidence = self._interpret_scored(user_query, api_config)
+        with self._memo_lock:
+            self._memo[memo_key] = (_copy_interpretation(interpretation), confidence)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return interpretation, confidence
+    
+    def memo_stats(self):
+        """Hit/miss counters for the interpretation memo"""
+        lookups = self.memo_hits + self.memo_misses
+        return {
+            'entries': len(self._memo),
+            'max_entries': self.memo_size,
+            'hits': self.memo_hits,
+            'misses': self.memo_misses,
+            'uncacheable': self.memo_uncacheable,
+            'hit_rate': round(self.memo_hits / lookups, 4) if lookups else 0.0
+        }
+    
+    def clear_memo(self):
+        """Drop all memoized interpretations"""
+        with self._memo_lock:
+            self._memo.clear()
+    
+    def _interpret_query(self, user_query, api_config):
+        """Interpret a query without consulting the memo"""
+        return self._interpret_scored(user_query, api_config)[0]
+    
+    def _interpret_scored(self, user_query, api_config):
+        """Interpret a query without consulting the memo; returns (interpretation, confidence)"""
+        interpretation = {
+            'endpoint': '',
+            'method': 'GET',
+            'params': {},
+            'filters': {}
+        }
+        
+        tokens = tokenize_query(user_query)
+        
+        # Detect API provider
+        provider_key, provider_config = self.detect_api_provider(api_config.base_url)
+        
+        if provider_config and 'endpoints' in provider_config:
+            # Match provider query patterns to endpoints in one pass over the query
+            best_match = get_endpoint_matchers().get(provider_key, provider_config).best_match(tokens.lower)
+            confidence = CONFIDENCE_PROVIDER_MISS
+            
+            if best_match:
+                confidence = CONFIDENCE_PROVIDER_MATCH
+                endpoint_key, endpoint_path = best_match
+                interpretation['endpoint'] = endpoint_path
+                
+                # Add provider-specific parameters
+                self._add_provider_specific_params(
+                    interpretation, tokens, provider_key, provider_config, endpoint_key
+                )
+        
+        else:
+            # Fallback to generic patterns
+            confidence = self._interpret_generic_query(interpretation, tokens.lower, api_config)
+        
+        # Extract common parameters
+        numbers = tokens.numbers
+        if numbers:
+            if 'limit' not in interpretation['params'] and 'per_page' not in interpretation['params']:
+                interpretation['params']['per_page'] = numbers[0]
+                interpretation['params']['limit'] = numbers[0]
+        
+        return interpretation, confidence
+    
+    def _add_provider_specific_params(self, interpretation, tokens, provider_key, provider_config, endpoint_key):
+        """Apply the provider's declarative param_rules for the matched endpoint"""
+        rules = get_param_rules().get(provider_key, provider_config)
+        if rules is not None:
+            rules.apply(interpretation, tokens, endpoint_key)
+
+    def _interpret_generic_query(self, interpretation, query_lower, api_config):
+        """Fallback generic query interpretation; returns its confidence"""
+        
+        # Generic REST method and endpoint patterns
+        generic = GENERIC_RULES.match(query_lower)
+        if generic['method']:
+            interpretation['method'] = generic['method']
+        interpretation['endpoint'] = generic['endpoint']
+
+        recognised = (generic['method'] is not None) + (generic['endpoint'] != '/')
+        return (CONFIDENCE_NONE, CONFIDENCE_GENERIC_PARTIAL, CONFIDENCE_GENERIC_FULL)[recognised]
+
+    def _extract_date(self, query):
+        """Extract date from query"""
+        return relative_date(query)
+        
+    def _extract_after_keyword(self, query, keyword):
+        """Extract text after a specific keyword"""
+        match = _keyword_value_pattern(keyword).search(query)
+        return match.group(1).strip() if match else None
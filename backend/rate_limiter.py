@@ -0,0 +1,411 @@
+"""
+Upstream Rate Limiter
+Token buckets keyed per connection and per provider, sized from the
+"rate_limit" entries in API_PROVIDERS and tightened by the rate limit headers
+upstreams send back. Requests wait (up to a bound) for a token instead of
+failing. The in-process backend serves a single worker; the Redis backend
+shares buckets across gunicorn workers.
+"""
+
+import asyncio
+import threading
+import time
+from collections import namedtuple
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# One bucket a request must pass; rate is tokens per second (None: only upstream blocks apply)
+Limit = namedtuple('Limit', 'key rate burst concurrency')
+
+MAX_BLOCK_SECONDS = 3600
+RESET_HEADERS = ('x-ratelimit-reset', 'x-ratelimit-reset-requests', 'ratelimit-reset')
+REMAINING_HEADERS = ('x-ratelimit-remaining', 'x-ratelimit-remaining-requests', 'ratelimit-remaining')
+DURATION_UNITS = (('ms', 0.001), ('h', 3600), ('m', 60), ('s', 1))
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """No token became available within the allowed wait"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f'Rate limit reached; retry in {retry_after:.1f}s')
+
+
+def rate_limits_for(connection_id, provider_key, provider_config):
+    """
+    Build the buckets a connection's requests go through.
+    Every connection gets its own bucket so upstream rate limit headers can
+    pause it; providers declare whether their limit is per credential
+    ("scope": "connection", the default) or shared by every connection.
+    """
+    spec = (provider_config or {}).get('rate_limit') or {}
+    rate = spec['requests'] / spec.get('per', 1) if 'requests' in spec else None
+    burst = spec.get('burst', spec.get('requests', 1))
+    concurrency = spec.get('concurrency')
+
+    connection_key = f'connection:{connection_id}'
+    if spec.get('scope') == 'provider':
+        return (Limit(connection_key, None, None, None),
+                Limit(f'provider:{provider_key}', rate, burst, concurrency))
+    return (Limit(connection_key, rate, burst, concurrency),)
+
+
+def _parse_duration(value):
+    """Parse '30', '1.5', '20ms' or Go-style '6m0s' into seconds"""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    seconds = 0.0
+    number = ''
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char.isdigit() or char == '.':
+            number += char
+            index += 1
+            continue
+        for unit, scale in DURATION_UNITS:
+            if value.startswith(unit, index) and number:
+                seconds += float(number) * scale
+                number = ''
+                index += len(unit)
+                break
+        else:
+            return None
+    return seconds if not number else None
+
+
+def retry_after_from_headers(headers, now=None):
+    """
+    Seconds the upstream asked us to wait, from Retry-After or an exhausted
+    X-RateLimit-Remaining/Reset pair; None when there is nothing to honour.
+    """
+    now = time.time() if now is None else now
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        seconds = _parse_duration(retry_after)
+        if seconds is None:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - now
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            return min(max(seconds, 0), MAX_BLOCK_SECONDS)
+
+    for remaining_header, reset_header in zip(REMAINING_HEADERS, RESET_HEADERS):
+        remaining = headers.get(remaining_header)
+        reset = headers.get(reset_header)
+        if remaining is None or reset is None:
+            continue
+        try:
+            if int(float(remaining)) > 0:
+                return None
+        except ValueError:
+            continue
+        seconds = _parse_duration(reset)
+        if seconds is None:
+            continue
+        # Large values are epoch timestamps (GitHub, Twitter); small ones are deltas
+        if seconds > 1e9:
+            seconds -= now
+        return min(max(seconds, 0), MAX_BLOCK_SECONDS)
+    return None
+
+
+def retry_after_for_error(error):
+    """Retry delay for a failed upstream call that hit a rate limit, else None"""
+    if isinstance(error, RateLimitExceeded):
+        return error.retry_after
+    response = getattr(error, 'response', None)
+    if response is not None and response.status_code == 429:
+        retry_after = retry_after_from_headers(response.headers)
+        return retry_after if retry_after is not None else 1.0
+    return None
+
+
+class MemoryRateLimitBackend:
+    """Token buckets for this worker process"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    blocking = False
+
+    def take(self, limits):
+        """
+        Take one token from every bucket, or none at all; returns 0 when
+        granted, else seconds until all of them can grant one
+        """
+        now = time.monotonic()
+        with self._lock:
+            refilled = []
+            wait = 0
+            for limit in limits:
+                tokens, updated_at, blocked_until = self._buckets.get(limit.key, (limit.burst, now, 0))
+                if blocked_until > now:
+                    wait = max(wait, blocked_until - now)
+                    continue
+                if limit.rate is None:
+                    continue
+                tokens = min(limit.burst, tokens + (now - updated_at) * limit.rate)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / limit.rate)
+                refilled.append((limit.key, tokens))
+            if wait:
+                return wait
+            for key, tokens in refilled:
+                self._buckets[key] = (tokens - 1, now, 0)
+            return 0
+
+    def block(self, key, seconds):
+        """Refuse tokens for a key until the upstream's reset time"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at, blocked_until = self._buckets.get(key, (0, now, 0))
+            self._buckets[key] = (0, now, max(blocked_until, now + seconds))
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# Atomic refill-and-take across every bucket of a request on the Redis server
+# clock, so workers agree on time; tokens are taken from all buckets or none.
+# ARGV holds a rate, burst pair per key ('' rate: only upstream blocks apply).
+TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local wait = 0
+local refilled = {}
+for i, key in ipairs(KEYS) do
+    local state = redis.call('HMGET', key, 'tokens', 'ts', 'blocked')
+    local blocked = tonumber(state[3]) or 0
+    if blocked > now then
+        wait = math.max(wait, blocked - now)
+    elseif ARGV[2 * i - 1] ~= '' then
+        local rate = tonumber(ARGV[2 * i - 1])
+        local burst = tonumber(ARGV[2 * i])
+        local tokens = tonumber(state[1]) or burst
+        local updated_at = tonumber(state[2]) or now
+        tokens = math.min(burst, tokens + (now - updated_at) * rate)
+        if tokens < 1 then
+            wait = math.max(wait, (1 - tokens) / rate)
+        end
+        refilled[#refilled + 1] = {key, tokens, math.ceil(burst / rate) + 60}
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for _, bucket in ipairs(refilled) do
+    redis.call('HSET', bucket[1], 'tokens', tostring(bucket[2] - 1), 'ts', tostring(now))
+    redis.call('EXPIRE', bucket[1], bucket[3])
+end
+return '0'
+"""
+
+BLOCK_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local blocked = tonumber(redis.call('HGET', KEYS[1], 'blocked')) or 0
+local until_time = math.max(blocked, now + tonumber(ARGV[1]))
+redis.call('HSET', KEYS[1], 'blocked', tostring(until_time), 'tokens', '0', 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(until_time - now) + 60)
+return 1
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets in Redis, shared by every worker process"""
+
+    def __init__(self, url, prefix='apiflexy:ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_BACKEND=redis requires the redis package (pip install redis)')
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(TAKE_SCRIPT)
+        self._block = self.client.register_script(BLOCK_SCRIPT)
+
+    # Calls go over the network; the event loop runs them in a thread
+    blocking = True
+
+    def take(self, limits):
+        args = []
+        for limit in limits:
+            args += ['', ''] if limit.rate is None else [repr(float(limit.rate)), repr(float(limit.burst))]
+        return float(self._take(keys=[self.prefix + limit.key for limit in limits], args=args))
+
+    def block(self, key, seconds):
+        self._block(keys=[self.prefix + key], args=[repr(float(seconds))])
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(self.prefix + '*'))
+
+
+class RateLimiter:
+    """Waits for tokens and concurrency slots before upstream calls"""
+
+    def __init__(self, backend, max_wait=10, enabled=True):
+        self.backend = backend
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self._slots = {}
+        self._async_slots = {}
+        self._slots_lock = threading.Lock()
+        self.granted = 0
+        self.delayed = 0
+        self.wait_seconds = 0.0
+        self.rejected = 0
+        self.upstream_blocks = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a limiter from Flask config values"""
+        if config.get('RATE_LIMIT_BACKEND', 'memory') == 'redis':
+            backend = RedisRateLimitBackend(config['RATE_LIMIT_REDIS_URL'])
+        else:
+            backend = MemoryRateLimitBackend()
+        return cls(backend, config.get('RATE_LIMIT_MAX_WAIT', 10), config.get('RATE_LIMIT_ENABLED', True))
+
+    def _next_wait(self, limits, deadline):
+        """Take a token from every bucket at once; returns the wait needed before retrying, or 0"""
+        wait = self.backend.take(limits)
+        if wait > 0 and time.monotonic() + wait > deadline:
+            self.rejected += 1
+            raise RateLimitExceeded(wait)
+        return wait
+
+    async def _next_wait_async(self, limits, deadline):
+        if self.backend.blocking:
+            return await asyncio.get_running_loop().run_in_executor(None, self._next_wait, limits, deadline)
+        return self._next_wait(limits, deadline)
+
+    def _slot(self, limit):
+        # Concurrency caps are per process; tokens are what is shared across workers
+        with self._slots_lock:
+            slot = self._slots.get(limit.key)
+            if slot is None:
+                slot = self._slots[limit.key] = threading.BoundedSemaphore(limit.concurrency)
+            return slot
+
+    def _async_slot(self, limit):
+        # The event loop's own cap; calls it hands to threads go through _slot
+        slot = self._async_slots.get(limit.key)
+        if slot is None:
+            slot = self._async_slots[limit.key] = asyncio.BoundedSemaphore(limit.concurrency)
+        return slot
+
+    @contextmanager
+    def limit(self, limits):
+        """Hold a token (and concurrency slot) for each limit around a blocking upstream call"""
+        if not self.enabled or not limits:
+            yield
+            return
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        while True:
+            wait = self._next_wait(limits, deadline)
+            if not wait:
+                break
+            time.sleep(wait)
+        held = []
+        try:
+            for limit in limits:
+                if limit.concurrency:
+                    slot = self._slot(limit)
+                    if not slot.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                        self.rejected += 1
+                        raise RateLimitExceeded(1.0)
+                    held.append(slot)
+            self._record_grant(started)
+            yield
+        finally:
+            for slot in held:
+                slot.release()
+
+    @asynccontextmanager
+    async def limit_async(self, limits):
+        """Event-loop variant of limit(); waits with asyncio.sleep instead of blocking"""
+        if not self.enabled or not limits:
+            yield
+            return
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        while True:
+            wait = await self._next_wait_async(limits, deadline)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        held = []
+        try:
+            for limit in limits:
+                if limit.concurrency:
+                    slot = self._async_slot(limit)
+                    try:
+                        await asyncio.wait_for(slot.acquire(), max(deadline - time.monotonic(), 0))
+                    except asyncio.TimeoutError:
+                        self.rejected += 1
+                        raise RateLimitExceeded(1.0)
+                    held.append(slot)
+            self._record_grant(started)
+            yield
+        finally:
+            for slot in held:
+                slot.release()
+
+    def _record_grant(self, started):
+        self.granted += 1
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.delayed += 1
+            self.wait_seconds += waited
+
+    def _block_for(self, limits, status_code, headers):
+        """Seconds to pause the buckets for, from an upstream response; None when they stay open"""
+        if not self.enabled or not limits:
+            return None
+        retry_after = retry_after_from_headers(headers)
+        if retry_after is None and status_code == 429:
+            retry_after = 1.0
+        if retry_after:
+            self.upstream_blocks += 1
+            return retry_after
+        return None
+
+    def _block(self, limits, seconds):
+        for limit in limits:
+            self.backend.block(limit.key, seconds)
+
+    def observe(self, limits, status_code, headers):
+        """Pause a connection's buckets when the upstream says its limit is spent"""
+        seconds = self._block_for(limits, status_code, headers)
+        if seconds:
+            self._block(limits, seconds)
+
+    async def observe_async(self, limits, status_code, headers):
+        """Event-loop variant of observe()"""
+        seconds = self._block_for(limits, status_code, headers)
+        if seconds:
+            if self.backend.blocking:
+                await asyncio.get_running_loop().run_in_executor(None, self._block, limits, seconds)
+            else:
+                self._block(limits, seconds)
+
+    def stats(self):
+        """Limiter counters for this worker process"""
+        return {
+            'backend': type(self.backend).__name__,
+            'enabled': self.enabled,
+            'buckets': len(self.backend),
+            'granted': self.granted,
+            'delayed': self.delayed,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'rejected': self.rejected,
+            'upstream_blocks': self.upstream_blocks
+        }
@@ -0,0 +1,110 @@
+"""
+Prepared Request Templates
+Each APIConnection is compiled once into an immutable template holding its
+normalized base URL, merged auth headers, provider match and rate limit
+buckets, so the query hot path only has to fill in the endpoint and params.
+"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from api_providers import get_catalog_version
+from provider_index import detect_provider
+from rate_limiter import rate_limits_for
+from response_cache import ResponseCache
+
+TEMPLATE_CACHE_SIZE = 1024
+
+
+def connection_fingerprint(connection):
+    """The connection fields a template is compiled from, plus the catalog version"""
+    return (connection.base_url, connection.auth_type, connection.auth_data, connection.headers,
+            get_catalog_version())
+
+
+class RequestTemplate:
+    """Immutable per-connection request settings"""
+
+    __slots__ = ('connection_id', 'base_url', 'headers', 'auth_identity', 'provider_key',
+                 'provider_config', 'rate_limits', 'fingerprint')
+
+    def __init__(self, connection_id, base_url, headers, provider_key, provider_config, fingerprint):
+        object.__setattr__(self, 'connection_id', connection_id)
+        object.__setattr__(self, 'base_url', base_url)
+        object.__setattr__(self, 'headers', MappingProxyType(dict(headers)))
+        object.__setattr__(self, 'auth_identity', ResponseCache.auth_identity(headers))
+        object.__setattr__(self, 'provider_key', provider_key)
+        object.__setattr__(self, 'provider_config', provider_config)
+        object.__setattr__(self, 'rate_limits', rate_limits_for(connection_id, provider_key, provider_config))
+        object.__setattr__(self, 'fingerprint', fingerprint)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('RequestTemplate is immutable')
+
+    def url_for(self, endpoint):
+        """Join an interpreted endpoint onto the connection's base URL"""
+        return self.base_url + endpoint
+
+
+class TemplateCache:
+    """In-process LRU of compiled templates keyed by connection id"""
+
+    def __init__(self, build_headers, max_entries=TEMPLATE_CACHE_SIZE):
+        self.build_headers = build_headers
+        self.max_entries = max_entries
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, connection):
+        """Build a fresh template for a connection"""
+        base_url = connection.base_url.rstrip('/')
+        provider_key, provider_config = detect_provider(base_url)
+        return RequestTemplate(
+            connection.id, base_url, self.build_headers(connection),
+            provider_key, provider_config, connection_fingerprint(connection)
+        )
+
+    def get(self, connection):
+        """
+        Get the template for a connection, compiling it on first use.
+        The fingerprint check catches edits made by other worker processes,
+        which do not fire this process's invalidation events.
+        """
+        fingerprint = connection_fingerprint(connection)
+        with self._lock:
+            template = self._templates.get(connection.id)
+            if template is not None and template.fingerprint == fingerprint:
+                self._templates.move_to_end(connection.id)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = self.compile(connection)
+        with self._lock:
+            self._templates[connection.id] = template
+            self._templates.move_to_end(connection.id)
+            while len(self._templates) > self.max_entries:
+                self._templates.popitem(last=False)
+        return template
+
+    def invalidate(self, connection_id):
+        """Drop a connection's template after it is created, updated or deleted"""
+        with self._lock:
+            self._templates.pop(connection_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def stats(self):
+        """Hit/miss counters for this worker process"""
+        with self._lock:
+            return {
+                'entries': len(self._templates),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
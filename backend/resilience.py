@@ -0,0 +1,261 @@
+"""
+Upstream Resilience
+Retries with jittered exponential backoff for idempotent requests, optional
+hedged GETs for tail latency, and a per-host circuit breaker that fails fast
+while an upstream is down instead of tying up workers.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRY_STATUSES = (502, 503, 504)
+MAX_RETRIES = 10
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """The host's circuit breaker is open; the request was not sent"""
+
+    def __init__(self, host, retry_after):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f'{host} is failing; requests paused for {retry_after:.1f}s')
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker per host: closed -> open -> half-open -> closed"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts = {}  # host -> [consecutive failures, opened_at or None, trial in flight]
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.short_circuited = 0
+
+    def before_request(self, host):
+        """Raise CircuitOpenError unless the host may be called; half-open lets one trial through"""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state[1] is None:
+                return
+            remaining = state[1] + self.reset_timeout - time.monotonic()
+            if remaining <= 0 and not state[2]:
+                state[2] = True
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError(host, max(remaining, 1.0))
+
+    def record_success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            state = self._hosts.setdefault(host, [0, None, False])
+            state[0] += 1
+            if state[2] or (state[1] is None and state[0] >= self.failure_threshold):
+                # A failed half-open trial re-opens the circuit for another full timeout
+                if state[1] is None:
+                    self.opened += 1
+                state[1] = time.monotonic()
+                state[2] = False
+
+    def release_trial(self, host):
+        """Let another half-open trial through after one ended without a verdict"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is not None:
+                state[2] = False
+
+    def open_hosts(self):
+        with self._lock:
+            return sorted(host for host, state in self._hosts.items() if state[1] is not None)
+
+
+class UpstreamCaller:
+    """Runs a send callable under retry, hedging and circuit breaker policy"""
+
+    def __init__(self, breaker, backoff_base=0.2, backoff_cap=5, hedge_delay=0, max_hedges=32):
+        self.breaker = breaker
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_delay = hedge_delay
+        self._hedge_executor = ThreadPoolExecutor(max_workers=max_hedges, thread_name_prefix='hedge') \
+            if hedge_delay else None
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a caller from Flask config values"""
+        breaker = CircuitBreaker(
+            failure_threshold=config.get('CIRCUIT_FAILURE_THRESHOLD', 5),
+            reset_timeout=config.get('CIRCUIT_RESET_TIMEOUT', 30)
+        )
+        return cls(
+            breaker,
+            backoff_base=config.get('RETRY_BACKOFF_BASE', 0.2),
+            backoff_cap=config.get('RETRY_BACKOFF_CAP', 5),
+            hedge_delay=config.get('HEDGE_DELAY', 0)
+        )
+
+    @staticmethod
+    def host_for(url):
+        parts = urlsplit(url)
+        return f'{parts.scheme}://{parts.netloc}'.lower()
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff before retry number attempt (1-based)"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _attempt(self, send, host, timeout):
+        self.breaker.before_request(host)
+        try:
+            response = send(timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.breaker.record_failure(host)
+            raise
+        except Exception:
+            # Not the host's fault (e.g. a local rate limit), but it must not strand a half-open trial
+            self.breaker.release_trial(host)
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+    def _hedged_attempt(self, send, host, timeout):
+        """Send once; if no answer within hedge_delay, race a second copy and keep the first to finish"""
+        futures = [self._hedge_executor.submit(self._attempt, send, host, timeout)]
+        done, _ = wait(futures, timeout=self.hedge_delay)
+        if not done:
+            self.hedges += 1
+            futures.append(self._hedge_executor.submit(self._attempt, send, host, timeout))
+        pending = set(futures)
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not futures[0]:
+                        self.hedge_wins += 1
+                    for other in pending:
+                        other.add_done_callback(_close_response)
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+
+    def call(self, send, method, url, retries=0, timeout=None, hedge=True):
+        """
+        Call send(timeout) until it returns a non-retryable response.
+        Only idempotent methods are retried, on connection errors, timeouts
+        and 502/503/504; GETs are hedged when a hedge delay is configured.
+        """
+        host = self.host_for(url)
+        method = method.upper()
+        retries = min(max(int(retries), 0), MAX_RETRIES) if method in IDEMPOTENT_METHODS else 0
+        hedged = hedge and bool(self.hedge_delay) and method == 'GET'
+
+        for attempt in range(retries + 1):
+            if attempt:
+                self.retries += 1
+                time.sleep(self.backoff(attempt))
+            try:
+                if hedged:
+                    response = self._hedged_attempt(send, host, timeout)
+                else:
+                    response = self._attempt(send, host, timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == retries:
+                    raise
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                response.close()
+                continue
+            return response
+
+    async def call_async(self, send, method, url, retries=0, timeout=None, retry_errors=()):
+        """Event-loop variant of call(); send is a coroutine function taking the timeout"""
+        host = self.host_for(url)
+        method = method.upper()
+        retries = min(max(int(retries), 0), MAX_RETRIES) if method in IDEMPOTENT_METHODS else 0
+        hedged = bool(self.hedge_delay) and method == 'GET'
+
+        async def attempt_once():
+            self.breaker.before_request(host)
+            try:
+                response = await send(timeout)
+            except retry_errors:
+                self.breaker.record_failure(host)
+                raise
+            except BaseException:
+                self.breaker.release_trial(host)
+                raise
+            if response.status_code >= 500:
+                self.breaker.record_failure(host)
+            else:
+                self.breaker.record_success(host)
+            return response
+
+        async def hedged_once():
+            tasks = [asyncio.ensure_future(attempt_once())]
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if not done:
+                self.hedges += 1
+                tasks.append(asyncio.ensure_future(attempt_once()))
+            pending = set(tasks)
+            first_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins += 1
+                        for other in pending:
+                            other.cancel()
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+
+        for attempt in range(retries + 1):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(self.backoff(attempt))
+            try:
+                response = await (hedged_once() if hedged else attempt_once())
+            except retry_errors:
+                if attempt == retries:
+                    raise
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                continue
+            return response
+
+    def stats(self):
+        """Retry, hedge and breaker counters for this worker process"""
+        return {
+            'retries': self.retries,
+            'hedge_delay': self.hedge_delay,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'circuits_opened': self.breaker.opened,
+            'short_circuited': self.breaker.short_circuited,
+            'open_circuits': self.breaker.open_hosts()
+        }
+
+
+def _close_response(future):
+    """Release the connection held by a losing hedge"""
+    if future.exception() is None:
+        future.result().close()
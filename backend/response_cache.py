@@ -0,0 +1,146 @@
+"""
+Response Cache
+Caches upstream responses for interpreted queries with per-entry TTLs.
+The in-process backend is a bounded LRU; the Redis backend lets gunicorn
+workers share hits.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis-backed cache shared by every worker process"""
+
+    def __init__(self, url, prefix='apiflexy:response:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CACHE_BACKEND=redis requires the redis package (pip install redis)')
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(self.prefix + '*'))
+
+
+class ResponseCache:
+    """Caches serialized upstream responses keyed by the full upstream request"""
+
+    def __init__(self, backend, default_ttl=60):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a cache from Flask config values"""
+        if config.get('CACHE_BACKEND', 'memory') == 'redis':
+            backend = RedisCacheBackend(config['CACHE_REDIS_URL'])
+        else:
+            backend = MemoryCacheBackend(config.get('CACHE_MAX_ENTRIES', 1024))
+        return cls(backend, config.get('CACHE_DEFAULT_TTL', 60))
+
+    @staticmethod
+    def auth_identity(headers):
+        """Hash of the request headers, so credentials never appear in cache keys"""
+        return hashlib.sha256(json.dumps(dict(headers or {}), sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(connection_id, method, url, params, headers, auth_identity=None):
+        """Build a cache key; the auth identity only enters the key as a hash"""
+        normalized_params = {key: value for key, value in (params or {}).items() if value is not None}
+        if auth_identity is None:
+            auth_identity = ResponseCache.auth_identity(headers)
+        raw_key = json.dumps(
+            [connection_id, method.upper(), url, normalized_params, auth_identity],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, provider_config):
+        """Get the TTL for a provider, falling back to the default"""
+        if provider_config and 'cache_ttl' in provider_config:
+            return provider_config['cache_ttl']
+        return self.default_ttl
+
+    def get(self, key):
+        """Get a cached response body (JSON text) or None"""
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, ttl):
+        """Store a response body (JSON text); a TTL of 0 disables caching"""
+        if ttl and ttl > 0:
+            self.backend.set(key, value, ttl)
+            self.stores += 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters for this worker process"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,63 @@
+"""
+Response Body Storage
+Compression codecs for response bodies kept in query history.
+zstd is used when the optional zstandard package is installed; zlib otherwise.
+"""
+
+import hashlib
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+def available_encodings():
+    """Get the compression encodings usable in this environment"""
+    encodings = ['identity', 'zlib']
+    if zstandard is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+def resolve_encoding(preferred):
+    """Fall back to zlib when the preferred codec is not installed"""
+    return preferred if preferred in available_encodings() else 'zlib'
+
+
+def body_digest(body):
+    """Content address for a response body (SHA-256 of the full text)"""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def encode_body(body, encoding='zlib', max_bytes=None, level=6):
+    """
+    Compress a response body for storage.
+    Returns (blob, stored_size, truncated); bodies over max_bytes are cut before compressing.
+    """
+    raw = body.encode('utf-8')
+    truncated = bool(max_bytes) and len(raw) > max_bytes
+    if truncated:
+        raw = raw[:max_bytes]
+
+    if encoding == 'zstd':
+        blob = zstandard.ZstdCompressor(level=level).compress(raw)
+    elif encoding == 'zlib':
+        blob = zlib.compress(raw, level)
+    else:
+        blob = raw
+    return blob, len(raw), truncated
+
+
+def decode_body(blob, encoding):
+    """Decompress a stored body back to text"""
+    if encoding == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('Stored body is zstd-compressed but zstandard is not installed')
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    elif encoding == 'zlib':
+        raw = zlib.decompress(blob)
+    else:
+        raw = blob
+    return raw.decode('utf-8', errors='replace')
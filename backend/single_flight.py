@@ -0,0 +1,110 @@
+"""
+Request Coalescing
+Single-flight execution: concurrent callers asking for the same key wait on
+one in-flight call and share its result (or its exception).
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    """One in-flight execution that followers wait on"""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key (threads and event-loop tasks alike)"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a coalescer from Flask config values"""
+        return cls(config.get('COALESCE_REQUESTS', True))
+
+    def do(self, key, fn):
+        """
+        Run fn() unless a call for key is already in flight, in which case wait
+        for it. Returns (result, shared) where shared is True for followers.
+        """
+        if not self.enabled:
+            return fn(), False
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    async def do_async(self, key, coro_fn):
+        """Event-loop variant of do(); coro_fn is awaited by the leader only"""
+        if not self.enabled:
+            return await coro_fn(), False
+
+        future = self._async_calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shield: a follower's cancellation must not cancel the shared call
+            return await asyncio.shield(future), True
+
+        future = self._async_calls[key] = asyncio.get_running_loop().create_future()
+        self.executions += 1
+        try:
+            result = await coro_fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved so an unwatched failure is not logged twice
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._async_calls[key]
+        return result, False
+
+    def stats(self):
+        """Coalescing counters for this worker process"""
+        calls = self.executions + self.coalesced
+        return {
+            'enabled': self.enabled,
+            'calls': calls,
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'coalescing_ratio': round(self.coalesced / calls, 4) if calls else 0.0,
+            'in_flight': len(self._calls) + len(self._async_calls)
+        }
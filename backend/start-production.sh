@@ -27,4 +27,8 @@ with app.app_context():
 
 # Start with Gunicorn for production
 echo "Starting production server on $HOST:$PORT"
+if [ "$SERVER_MODE" = "async" ]; then
+    # Async mode: /api/query runs on an event loop (see asgi.py)
+    exec gunicorn --bind $HOST:$PORT --workers 4 --worker-class uvicorn.workers.UvicornWorker --timeout 120 --keep-alive 2 --max-requests 1000 --max-requests-jitter 100 asgi:app
+fi
 exec gunicorn --bind $HOST:$PORT --workers 4 --timeout 120 --keepalive 2 --max-requests 1000 --max-requests-jitter 100 wsgi:app 
\ No newline at end of file
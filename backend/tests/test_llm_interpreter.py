@@ -0,0 +1,193 @@
+"""
+TieredInterpreter against benchmarks/fake_llm_server.py (an OpenAI-compatible
+chat completions stub) and in-process stub backends
+"""
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from llm_interpreter import OpenAICompatibleBackend, SemanticCache, TieredInterpreter
+from query_processor import AIQueryProcessor
+from resilience import CircuitBreaker
+
+FAKE_SERVER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'benchmarks', 'fake_llm_server.py')
+GENERIC = SimpleNamespace(base_url='https://erp.example.com/api')
+GITHUB = SimpleNamespace(base_url='https://api.github.com')
+
+
+def load_fake_server():
+    spec = importlib.util.spec_from_file_location('fake_llm_server', FAKE_SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def fake_server_module():
+    return load_fake_server()
+
+
+def start(fake_server_module, request, fail_rate=0.0):
+    server = fake_server_module.start_server(fail_rate=fail_rate)
+    request.addfinalizer(server.server_close)
+    request.addfinalizer(server.shutdown)
+    return server
+
+
+@pytest.fixture
+def server(fake_server_module, request):
+    return start(fake_server_module, request)
+
+
+@pytest.fixture
+def failing_server(fake_server_module, request):
+    return start(fake_server_module, request, fail_rate=1.0)
+
+
+def backend_for(server):
+    return OpenAICompatibleBackend(f'http://127.0.0.1:{server.server_port}/v1', api_key='test', timeout=5)
+
+
+def make_interpreter(backend, similarity=0.8, **kwargs):
+    return TieredInterpreter(AIQueryProcessor(memo_size=0), backend=backend,
+                             cache=SemanticCache(similarity=similarity), **kwargs)
+
+
+def rule_based(query, connection):
+    return AIQueryProcessor(memo_size=0).interpret_query(query, connection)
+
+
+class RaisingBackend:
+    name = 'stub'
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.calls = 0
+
+    def interpret(self, user_query, context):
+        self.calls += 1
+        if self.reply is None:
+            raise ConnectionError('model unavailable')
+        return self.reply
+
+
+@pytest.mark.parametrize('query, connection', [
+    ('show my recent commits', GITHUB),
+    ('list all users', GENERIC),
+])
+def test_confident_queries_never_escalate(server, query, connection):
+    interpreter = make_interpreter(backend_for(server))
+
+    assert interpreter.interpret_query(query, connection) == rule_based(query, connection)
+    assert interpreter.escalated == 0
+    assert interpreter.backend_calls == 0
+    assert server.completions == 0
+
+
+def test_low_confidence_query_uses_the_model(server):
+    interpreter = make_interpreter(backend_for(server))
+
+    interpretation = interpreter.interpret_query('how many invoices are overdue', GENERIC)
+
+    assert interpretation == {'endpoint': '/overdue', 'method': 'GET', 'params': {}, 'filters': {}}
+    assert interpreter.backend_calls == server.completions == 1
+
+
+def test_repeat_is_an_exact_cache_hit(server):
+    interpreter = make_interpreter(backend_for(server))
+
+    first = interpreter.interpret_query('how many invoices are overdue', GENERIC)
+    second = interpreter.interpret_query('How many invoices are OVERDUE?', GENERIC)
+
+    assert second == first
+    assert server.completions == 1
+    assert interpreter.cache.exact_hits == 1
+
+
+@pytest.mark.parametrize('paraphrase', ['how many invoces are overdue', 'overdue invoices how many are'])
+def test_near_identical_query_is_a_semantic_cache_hit(server, paraphrase):
+    interpreter = make_interpreter(backend_for(server))
+
+    first = interpreter.interpret_query('how many invoices are overdue', GENERIC)
+    second = interpreter.interpret_query(paraphrase, GENERIC)
+
+    assert second == first
+    assert server.completions == 1
+    assert interpreter.cache.semantic_hits == 1
+
+
+def test_cache_is_scoped_to_the_connection(server):
+    interpreter = make_interpreter(backend_for(server))
+
+    interpreter.interpret_query('how many invoices are overdue', GENERIC)
+    interpreter.interpret_query('how many invoices are overdue', SimpleNamespace(base_url='https://crm.example.com'))
+
+    assert server.completions == 2
+
+
+@pytest.mark.parametrize('first, second, expected_params', [
+    ('top 5 products this month', 'top 7 products this month', {'limit': 7}),
+    ('open support tickets for "acme"', 'open support tickets for "umbrella"', {}),
+])
+def test_slot_mismatch_is_not_served_from_the_cache(server, first, second, expected_params):
+    interpreter = make_interpreter(backend_for(server), similarity=0.5)
+
+    interpreter.interpret_query(first, GENERIC)
+    interpretation = interpreter.interpret_query(second, GENERIC)
+
+    assert interpretation['params'] == expected_params
+    assert server.completions == 2
+    assert interpreter.cache.semantic_hits == 0
+
+
+def test_date_relative_queries_are_never_cached(server):
+    interpreter = make_interpreter(backend_for(server))
+
+    interpreter.interpret_query('failed payments yesterday', GENERIC)
+    interpreter.interpret_query('failed payments yesterday', GENERIC)
+
+    assert server.completions == 2
+    assert interpreter.cache.stats()['entries'] == 0
+
+
+def test_backend_failure_falls_back_to_rules(failing_server):
+    interpreter = make_interpreter(backend_for(failing_server))
+    query = 'how many invoices are overdue'
+
+    assert interpreter.interpret_query(query, GENERIC) == rule_based(query, GENERIC)
+    assert interpreter.backend_failures == 1
+    assert failing_server.failures == 1
+    assert interpreter.cache.stats()['entries'] == 0
+
+
+def test_unusable_reply_falls_back_to_rules():
+    backend = RaisingBackend(reply='{"endpoint": "no-leading-slash"}')
+    interpreter = make_interpreter(backend)
+    query = 'how many invoices are overdue'
+
+    assert interpreter.interpret_query(query, GENERIC) == rule_based(query, GENERIC)
+    assert interpreter.backend_failures == 1
+
+
+def test_open_circuit_skips_the_backend_and_falls_back_to_rules():
+    backend = RaisingBackend()
+    interpreter = make_interpreter(backend, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    queries = ['how many invoices are overdue', 'which servers are unhealthy', 'quarterly revenue by region']
+
+    results = [interpreter.interpret_query(query, GENERIC) for query in queries]
+
+    assert results == [rule_based(query, GENERIC) for query in queries]
+    assert backend.calls == 2
+    assert interpreter.breaker.short_circuited == 1
+    assert interpreter.stats()['circuit_open']
+
+
+def test_disabled_interpreter_is_the_rule_engine():
+    interpreter = TieredInterpreter.from_config({'LLM_INTERPRETER_ENABLED': False}, AIQueryProcessor(memo_size=0))
+    query = 'how many invoices are overdue'
+
+    assert interpreter.interpret_query(query, GENERIC) == rule_based(query, GENERIC)
+    assert interpreter.escalated == 0
@@ -0,0 +1,127 @@
+"""
+Catalog param_rules must reproduce what the provider if/elif chain in
+AIQueryProcessor._add_provider_specific_params produced before it was
+replaced. Expected values below are that chain's output, with the clock
+fixed at FIXED_NOW.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import query_processor
+from api_providers import get_all_providers
+from param_rules import ParamRules, compile_param_rules, get_param_rules
+from query_processor import AIQueryProcessor, tokenize_query
+
+FIXED_NOW = datetime(2024, 5, 17, 12, 0, 0)
+
+# Providers whose rules have no catalog endpoints to attach to are checked
+# against these, as the chain ran for any endpoint key of theirs
+STAND_IN_ENDPOINTS = {'current': '/current.json', 'search': '/search', 'posts': '/posts', 'commits': '/commits'}
+
+# (provider, endpoint key, query, expected endpoint, expected params)
+PRE_REFACTOR_CASES = [
+    ('github', 'commits', 'show commits since today', '/repos/{owner}/{repo}/commits',
+     {'since': '2024-05-17T12:00:00'}),
+    ('github', 'commits', 'commits since yesterday by author octocat', '/repos/{owner}/{repo}/commits',
+     {'since': '2024-05-16T12:00:00', 'author': 'octocat'}),
+    ('github', 'commits', 'commits since last week', '/repos/{owner}/{repo}/commits', {'since': None}),
+    ('github', 'commits', 'commits author', '/repos/{owner}/{repo}/commits', {}),
+    ('github', 'repos', 'repos since today author octocat', '/user/repos', {}),
+    ('wordpress', 'posts', 'search posts for "flask tips"', '/posts', {'search': 'flask tips'}),
+    ('wordpress', 'posts', 'posts in category news', '/posts', {'categories': 'news'}),
+    ('wordpress', 'posts', 'posts category', '/posts', {'categories': None}),
+    ('wordpress', 'posts', 'published posts', '/posts', {'status': 'publish'}),
+    ('wordpress', 'posts', 'search published posts in category travel with "paris"', '/posts',
+     {'search': 'paris', 'categories': 'travel', 'status': 'publish'}),
+    ('wordpress', 'pages', 'published pages', '/pages', {}),
+    ('openweather', 'current', 'weather in paris', '/weather', {'q': 'paris'}),
+    ('openweather', 'current', 'weather forecast for new york', '/weather', {'q': 'new'}),
+    ('openweather', 'current', 'temperature london', '/weather', {'q': 'london'}),
+    ('openweather', 'forecast', 'forecast', '/forecast', {}),
+    ('openweather', 'current', 'current conditions', '/weather', {}),
+    ('weatherapi', 'current', 'weather in berlin', '/current.json', {'q': 'berlin'}),
+    ('weatherapi', 'current', 'forecast in tokyo', '/forecast.json', {'q': 'tokyo'}),
+    ('twitter', 'search', 'search tweets about "python"', '/tweets/search/recent', {'query': 'python'}),
+    ('twitter', 'search', 'search tweets', '/tweets/search/recent', {}),
+    ('twitter', 'tweets', "search 'jazz'", '/tweets', {'query': 'jazz'}),
+    ('spotify', 'search', 'search artist "beatles"', '/search', {'q': 'beatles', 'type': 'artist'}),
+    ('spotify', 'search', 'search album "abbey road"', '/search', {'q': 'abbey road', 'type': 'album'}),
+    ('spotify', 'search', 'search track "yesterday"', '/search', {'q': 'yesterday', 'type': 'track'}),
+    ('spotify', 'search', 'search artist album "x"', '/search', {'q': 'x', 'type': 'artist'}),
+    ('spotify', 'search', 'artist "beatles"', '/search', {}),
+    ('spotify', 'search', 'search ""', '/search', {'q': ''}),
+    ('youtube', 'search', 'search videos "lofi beats"', '/search', {'q': 'lofi beats', 'part': 'snippet'}),
+    ('youtube', 'search', 'search videos', '/search', {'part': 'snippet'}),
+    ('youtube', 'search', 'videos "lofi"', '/search', {}),
+    ('reddit', 'posts', 'posts in subreddit python', '/r/python', {}),
+    ('reddit', 'posts', 'subreddit', '/posts', {}),
+    ('reddit', 'posts', 'top posts', '/posts', {}),
+    ('newsapi', 'search', 'search news "elections"', '/search', {'q': 'elections'}),
+    ('newsapi', 'search', 'news from country gb', '/search', {'country': 'gb'}),
+    ('newsapi', 'search', 'headlines country unitedstates', '/search', {'country': 'un'}),
+    ('newsapi', 'search', 'search news country us "tech"', '/search', {'q': 'tech', 'country': 'us'}),
+]
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FIXED_NOW
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(query_processor, 'datetime', FrozenDatetime)
+
+
+def provider_rules(provider_key):
+    provider_config = get_all_providers()[provider_key]
+    endpoints = provider_config.get('endpoints')
+    if endpoints:
+        return endpoints, get_param_rules().get(provider_key, provider_config)
+    return STAND_IN_ENDPOINTS, ParamRules(STAND_IN_ENDPOINTS, provider_config['param_rules'])
+
+
+@pytest.mark.parametrize(
+    'provider_key, endpoint_key, query, expected_endpoint, expected_params', PRE_REFACTOR_CASES,
+    ids=[f'{case[0]}/{case[1]}: {case[2]}' for case in PRE_REFACTOR_CASES]
+)
+def test_rules_match_pre_refactor_output(provider_key, endpoint_key, query, expected_endpoint, expected_params):
+    endpoints, rules = provider_rules(provider_key)
+    interpretation = {'endpoint': endpoints[endpoint_key], 'method': 'GET', 'params': {}, 'filters': {}}
+
+    rules.apply(interpretation, tokenize_query(query), endpoint_key)
+
+    assert interpretation['endpoint'] == expected_endpoint
+    assert interpretation['params'] == expected_params
+
+
+@pytest.mark.parametrize('provider_key', sorted({case[0] for case in PRE_REFACTOR_CASES}))
+def test_catalog_rules_compile(provider_key):
+    assert compile_param_rules(provider_key, get_all_providers()[provider_key]) is not None
+
+
+@pytest.mark.parametrize('base_url, query, expected_endpoint, expected_params', [
+    ('https://api.github.com', 'show commits since today author octocat', '/repos/{owner}/{repo}/commits',
+     {'since': '2024-05-17T12:00:00', 'author': 'octocat'}),
+    ('https://api.openweathermap.org/data/2.5', 'weather in paris', '/weather', {'q': 'paris'}),
+    ('https://api.twitter.com/2', 'search tweets about "python" 10', '/tweets',
+     {'query': 'python', 'per_page': 10, 'limit': 10}),
+])
+def test_processor_applies_catalog_rules(base_url, query, expected_endpoint, expected_params):
+    interpretation = AIQueryProcessor(memo_size=0).interpret_query(query, SimpleNamespace(base_url=base_url))
+
+    assert interpretation['endpoint'] == expected_endpoint
+    assert interpretation['params'] == expected_params
+
+
+@pytest.mark.parametrize('rules', [
+    [{'param': 'q'}],
+    [{'param': 'q', 'value': 'nonsense'}],
+    [{'param': 'q', 'replace': ['a', 'b'], 'value': 'quoted'}],
+    [{'param': 'q', 'value': 'after:'}],
+])
+def test_invalid_rules_are_ignored(rules):
+    assert compile_param_rules('example', {'endpoints': {'search': '/search'}, 'param_rules': rules}) is None
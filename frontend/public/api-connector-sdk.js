@@ -79,6 +79,43 @@ class APIConnectorAI {
         }
     }
 
+    /**
+     * Run several natural language queries in one request.
+     * items: [{ query, connectionId }]; results come back in the same order.
+     */
+    async queryBatch(items) {
+        try {
+            this.log('Making batch query:', items.length, 'items');
+
+            const response = await fetch(`${this.baseUrl}/api/query/batch`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Authorization': `Bearer ${this.apiKey}`
+                },
+                body: JSON.stringify({
+                    queries: items.map(item => ({
+                        query: item.query,
+                        connection_id: item.connectionId
+                    }))
+                })
+            });
+
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+
+            const data = await response.json();
+            this.emit('batchSuccess', { items, data });
+            return data;
+
+        } catch (error) {
+            this.log('Batch query error:', error);
+            this.emit('queryError', { query: items, error });
+            throw error;
+        }
+    }
+
     /**
      * Get all available API connections
      */
@@ -31,8 +31,10 @@ export const DEFAULT_HEADERS = {
 // API endpoints
 export const API_ENDPOINTS = {
   CONNECTIONS: '/api/connections',
+  CONNECTIONS_HEALTH: '/api/connections/health',
   PROVIDERS: '/api/providers',
   QUERY: '/api/query',
+  QUERY_BATCH: '/api/query/batch',
   HISTORY: '/api/history',
   TEST_CONNECTION: '/api/test-connection',
   PROVIDER_CATEGORIES: '/api/providers/categories',